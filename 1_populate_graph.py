@@ -1,197 +1,499 @@
 # 1_populate_graph_v3.py
-# NOVA VERSÃO: Lê os arquivos CSV localmente com a biblioteca pandas e envia os dados para o Neo4j.
+# NOVA VERSÃO: Lê os arquivos CSV localmente com a biblioteca pandas e envia os dados para o Neo4j
+# em lotes (UNWIND), uma transação por lote em vez de uma por linha.
 # Esta abordagem não requer mover os arquivos para a pasta 'import' do Neo4j.
 
+import contextlib
 import os
 import pandas as pd
-from graph_database import neo4j_connector
+from data_processing import dataset_loader, ingestion_manifest, bulk_import
+from graph_database import neo4j_connector, batch_writer, parallel_loader, db_reset, query_profiler, adaptive_writer, schema
+from utils import metrics
 
 # --- CONFIGURAÇÃO DOS ARQUIVOS ---
 # Caminhos para os arquivos CSV dentro da sua pasta 'data' no projeto
 TWEETS_FILE_PATH = os.path.join('data', 'tweets_neo4j_completos_FINAL.csv')
 FOLLOWERS_FILE_PATH = os.path.join('data', 'seguidores_para_neo4j_simples.csv')
 
+# Linhas lidas de cada CSV por vez; o uso de memória fica limitado a um pedaço.
+CSV_CHUNK_SIZE = 50_000
 
-# Lista de queries para criar as constraints (índices de unicidade)
-# Isso garante a integridade dos dados e otimiza as buscas.
-CONSTRAINTS_QUERIES = [
-    "CREATE CONSTRAINT IF NOT EXISTS FOR (u:Usuario) REQUIRE u.id IS UNIQUE;",
-    "CREATE CONSTRAINT IF NOT EXISTS FOR (t:Tweet) REQUIRE t.id IS UNIQUE;",
-    "CREATE CONSTRAINT IF NOT EXISTS FOR (m:Midia) REQUIRE m.url IS UNIQUE;",
-    "CREATE CONSTRAINT IF NOT EXISTS FOR (h:Hashtag) REQUIRE h.nome IS UNIQUE;",
-    "CREATE CONSTRAINT IF NOT EXISTS FOR (a:Assunto) REQUIRE a.nome IS UNIQUE;",
-]
+# Manifesto local (chave + hash de cada linha já carregada) usado pela carga incremental.
+MANIFEST_PATH = ingestion_manifest.DEFAULT_MANIFEST_PATH
 
-# --- NOVAS QUERIES PARAMETRIZADAS ---
-# Estas queries recebem os dados de cada linha do CSV como um parâmetro ($row)
+# Colunas que identificam uma linha de cada arquivo no manifesto.
+TWEETS_KEY_COLUMNS = ['tweet_id']
+FOLLOWERS_KEY_COLUMNS = ['seguidor_id', 'seguido_id']
+
+
+# --- QUERIES DE NÓS ---
+# Cada nó (Usuario, Tweet, Midia, Hashtag, Assunto) é enviado uma única vez por carga: os valores
+# distintos são calculados localmente (ver _distinct_nodes), e as queries de relação só fazem
+# MATCH nos nós já criados, sem repetir o MERGE (busca no índice + trava) a cada linha.
 
 # CORREÇÃO: A verificação da data agora é mais específica, checando se o texto começa com um ano de 4 dígitos.
-CREATE_USER_TWEET_QUERY = """
-// Cria ou atualiza o usuário
-MERGE (u:Usuario {id: $row.usuario_id})
-  ON CREATE SET u.handle = $row.handle,
-                u.criado_em = CASE WHEN $row.criado_em_usuario IS NOT NULL AND ($row.criado_em_usuario STARTS WITH '20' OR $row.criado_em_usuario STARTS WITH '19') THEN datetime(replace($row.criado_em_usuario, ' ', 'T')) ELSE null END,
-                u.seguidores = toInteger($row.seguidores),
-                u.regiao = $row.regiao,
-                u.influente = toBoolean($row.influente)
-// Cria ou atualiza o tweet
-MERGE (t:Tweet {id: toInteger($row.tweet_id)})
-  ON CREATE SET t.texto = $row.texto,
-                t.criado_em = CASE WHEN $row.criado_em IS NOT NULL AND ($row.criado_em STARTS WITH '20' OR $row.criado_em STARTS WITH '19') THEN datetime(replace($row.criado_em, ' ', 'T')) ELSE null END,
-                t.idioma = $row.idioma,
-                t.likes = toInteger($row.likes)
-// Cria o relacionamento e DEPOIS define as propriedades
+CREATE_USER_QUERY = """
+UNWIND $rows AS row
+MERGE (u:Usuario {id: row.usuario_id})
+  ON CREATE SET u.handle = row.handle,
+                u.criado_em = CASE WHEN row.criado_em_usuario IS NOT NULL AND (row.criado_em_usuario STARTS WITH '20' OR row.criado_em_usuario STARTS WITH '19') THEN datetime(replace(row.criado_em_usuario, ' ', 'T')) ELSE null END,
+                u.seguidores = toInteger(row.seguidores),
+                u.regiao = row.regiao,
+                u.influente = toBoolean(row.influente)
+"""
+
+CREATE_TWEET_QUERY = """
+UNWIND $rows AS row
+MERGE (t:Tweet {id: toInteger(row.tweet_id)})
+  ON CREATE SET t.texto = row.texto,
+                t.criado_em = CASE WHEN row.criado_em IS NOT NULL AND (row.criado_em STARTS WITH '20' OR row.criado_em STARTS WITH '19') THEN datetime(replace(row.criado_em, ' ', 'T')) ELSE null END,
+                t.idioma = row.idioma,
+                t.likes = toInteger(row.likes)
+"""
+
+# Variantes usadas na carga incremental: uma linha alterada precisa atualizar usuário e tweet
+# já existentes, então as propriedades são definidas com SET em vez de ON CREATE SET.
+UPSERT_USER_QUERY = CREATE_USER_QUERY.replace("  ON CREATE SET ", "  SET ")
+UPSERT_TWEET_QUERY = CREATE_TWEET_QUERY.replace("  ON CREATE SET ", "  SET ")
+
+CREATE_MEDIA_QUERY = """
+UNWIND $rows AS row
+MERGE (m:Midia {url: row.midia_url})
+  ON CREATE SET m.tipo = row.midia_tipo,
+                m.tamanho = toInteger(row.tamanho)
+"""
+
+CREATE_HASHTAG_QUERY = """
+UNWIND $rows AS row
+MERGE (:Hashtag {nome: row.nome})
+"""
+
+CREATE_SUBJECT_QUERY = """
+UNWIND $rows AS row
+MERGE (a:Assunto {nome: row.assunto_nome})
+  ON CREATE SET a.tema_pai = row.tema_pai
+"""
+
+# --- QUERIES DE RELAÇÕES EM LOTE (UNWIND) ---
+# Cada query recebe um lote de linhas do CSV como parâmetro ($rows) e processa todas
+# em uma única transação, em vez de uma transação por linha.
+
+# O relacionamento é criado e DEPOIS recebe as propriedades.
+CREATE_POSTED_REL_QUERY = """
+UNWIND $rows AS row
+MATCH (u:Usuario {id: row.usuario_id})
+MATCH (t:Tweet {id: toInteger(row.tweet_id)})
 MERGE (u)-[r:POSTA]->(t)
-SET r.momento = CASE WHEN $row.momento IS NOT NULL AND ($row.momento STARTS WITH '20' OR $row.momento STARTS WITH '19') THEN datetime(replace($row.momento, ' ', 'T')) ELSE null END,
-    r.dispositivo = $row.dispositivo
+SET r.momento = CASE WHEN row.momento IS NOT NULL AND (row.momento STARTS WITH '20' OR row.momento STARTS WITH '19') THEN datetime(replace(row.momento, ' ', 'T')) ELSE null END,
+    r.dispositivo = row.dispositivo
 """
 
 # CORREÇÃO: Verificação de data mais específica.
 CREATE_RETWEET_REL_QUERY = """
-MATCH (u:Usuario {id: $row.usuario_id})
-MATCH (orig:Tweet {id: toInteger($row.retweet_de_id)})
+UNWIND $rows AS row
+MATCH (u:Usuario {id: row.usuario_id})
+MATCH (orig:Tweet {id: toInteger(row.retweet_de_id)})
 // Usa FOREACH e CASE para lidar com retweets com e sem comentário de forma condicional
-FOREACH (_ IN CASE WHEN $row.comentario IS NOT NULL AND $row.comentario <> "" THEN [1] ELSE [] END |
+FOREACH (_ IN CASE WHEN row.comentario IS NOT NULL AND row.comentario <> "" THEN [1] ELSE [] END |
   MERGE (u)-[r:RETWEETA]->(orig)
-  SET r.momento = CASE WHEN $row.momento IS NOT NULL AND ($row.momento STARTS WITH '20' OR $row.momento STARTS WITH '19') THEN datetime(replace($row.momento, ' ', 'T')) ELSE null END,
-      r.dispositivo = $row.dispositivo,
-      r.comentario = $row.comentario
+  SET r.momento = CASE WHEN row.momento IS NOT NULL AND (row.momento STARTS WITH '20' OR row.momento STARTS WITH '19') THEN datetime(replace(row.momento, ' ', 'T')) ELSE null END,
+      r.dispositivo = row.dispositivo,
+      r.comentario = row.comentario
 )
-FOREACH (_ IN CASE WHEN $row.comentario IS NULL OR $row.comentario = "" THEN [1] ELSE [] END |
+FOREACH (_ IN CASE WHEN row.comentario IS NULL OR row.comentario = "" THEN [1] ELSE [] END |
   MERGE (u)-[r:RETWEETA]->(orig)
-  SET r.momento = CASE WHEN $row.momento IS NOT NULL AND ($row.momento STARTS WITH '20' OR $row.momento STARTS WITH '19') THEN datetime(replace($row.momento, ' ', 'T')) ELSE null END,
-      r.dispositivo = $row.dispositivo
+  SET r.momento = CASE WHEN row.momento IS NOT NULL AND (row.momento STARTS WITH '20' OR row.momento STARTS WITH '19') THEN datetime(replace(row.momento, ' ', 'T')) ELSE null END,
+      r.dispositivo = row.dispositivo
 )
 """
 
 CREATE_REPLY_REL_QUERY = """
-MATCH (t:Tweet {id: toInteger($row.tweet_id)})
-MATCH (orig:Tweet {id: toInteger($row.reply_to_id)})
+UNWIND $rows AS row
+MATCH (t:Tweet {id: toInteger(row.tweet_id)})
+MATCH (orig:Tweet {id: toInteger(row.reply_to_id)})
 MERGE (t)-[:REPLY_TO]->(orig)
 """
 
 CREATE_MEDIA_REL_QUERY = """
-MERGE (m:Midia {url: $row.midia_url})
-  ON CREATE SET m.tipo = $row.midia_tipo,
-                m.tamanho = toInteger($row.tamanho)
-WITH m
-MATCH (t:Tweet {id: toInteger($row.tweet_id)})
+UNWIND $rows AS row
+MATCH (t:Tweet {id: toInteger(row.tweet_id)})
+MATCH (m:Midia {url: row.midia_url})
 MERGE (t)-[:POSSUI_MIDIA]->(m)
 """
 
+# As tags já chegam sem espaços nas pontas, sem vazias e sem repetição (ver _hashtag_rows).
 CREATE_HASHTAG_REL_QUERY = """
-UNWIND $tags AS tag
-WITH tag WHERE tag IS NOT NULL AND trim(tag) <> ""
-MERGE (h:Hashtag {nome: trim(tag)})
-WITH h
-MATCH (t:Tweet {id: toInteger($tweet_id)})
+UNWIND $rows AS row
+MATCH (t:Tweet {id: toInteger(row.tweet_id)})
+UNWIND row.tags AS tag
+MATCH (h:Hashtag {nome: tag})
 MERGE (t)-[:POSSUI_HASHTAG]->(h)
 """
 
 CREATE_SUBJECT_REL_QUERY = """
-MERGE (a:Assunto {nome: $row.assunto_nome})
-  ON CREATE SET a.tema_pai = $row.tema_pai
-WITH a
-MATCH (t:Tweet {id: toInteger($row.tweet_id)})
+UNWIND $rows AS row
+MATCH (t:Tweet {id: toInteger(row.tweet_id)})
+MATCH (a:Assunto {nome: row.assunto_nome})
 MERGE (t)-[:SOBRE]->(a)
 """
 
 # CORREÇÃO: Verificação de data mais específica.
 CREATE_FOLLOW_REL_QUERY = """
-MATCH (seguidor:Usuario {id: $row.seguidor_id})
-MATCH (seguido:Usuario {id: $row.seguido_id})
+UNWIND $rows AS row
+MATCH (seguidor:Usuario {id: row.seguidor_id})
+MATCH (seguido:Usuario {id: row.seguido_id})
 MERGE (seguidor)-[r:SEGUE]->(seguido)
-SET r.desde = CASE WHEN $row.desde IS NOT NULL AND ($row.desde STARTS WITH '20' OR $row.desde STARTS WITH '19') THEN datetime(replace($row.desde, ' ', 'T')) ELSE null END
+SET r.desde = CASE WHEN row.desde IS NOT NULL AND (row.desde STARTS WITH '20' OR row.desde STARTS WITH '19') THEN datetime(replace(row.desde, ' ', 'T')) ELSE null END
 """
 
-def run_query(tx, query, params=None):
-    """Função genérica para executar uma query com parâmetros."""
-    tx.run(query, params)
+# Tamanho do lote (linhas por transação) de cada família de query.
+# Pode ser sobrescrito por família ao chamar populate_new_model_graph(batch_sizes={...}).
+BATCH_SIZES = {
+    'usuario': 2000,
+    'tweet': 1000,
+    'posta': 2000,
+    'midia': 5000,
+    'hashtag': 5000,
+    'assunto': 5000,
+    'retweet': 2000,
+    'reply': 2000,
+    'possui_midia': 2000,
+    'possui_hashtag': 1000,
+    'sobre': 2000,
+    'segue': 5000,
+}
+
+# Chave de particionamento de cada família na carga paralela: linhas com a mesma chave vão
+# para o mesmo worker, evitando que transações concorrentes travem o mesmo nó Usuario/Tweet.
+PARTITION_KEYS = {
+    'usuario': 'usuario_id',
+    'tweet': 'tweet_id',
+    'posta': 'usuario_id',
+    'midia': 'midia_url',
+    'hashtag': 'nome',
+    'assunto': 'assunto_nome',
+    'retweet': 'usuario_id',
+    'reply': 'tweet_id',
+    'possui_midia': 'tweet_id',
+    'possui_hashtag': 'tweet_id',
+    'sobre': 'tweet_id',
+    'segue': 'seguidor_id',
+}
+
+# Colunas do CSV enviadas em cada família; evita trafegar a linha inteira em todas as queries.
+FAMILY_COLUMNS = {
+    'usuario': ['usuario_id', 'handle', 'criado_em_usuario', 'seguidores', 'regiao', 'influente'],
+    'tweet': ['tweet_id', 'texto', 'criado_em', 'idioma', 'likes'],
+    'posta': ['usuario_id', 'tweet_id', 'momento', 'dispositivo'],
+    'midia': ['midia_url', 'midia_tipo', 'tamanho'],
+    'assunto': ['assunto_nome', 'tema_pai'],
+    'retweet': ['usuario_id', 'retweet_de_id', 'comentario', 'momento', 'dispositivo'],
+    'reply': ['tweet_id', 'reply_to_id'],
+    'possui_midia': ['tweet_id', 'midia_url'],
+    'sobre': ['tweet_id', 'assunto_nome'],
+    'segue': ['seguidor_id', 'seguido_id', 'desde'],
+}
+
+# Nós com valores repetidos em muitas linhas: os já enviados na carga atual não são reenviados.
+DEDUPLICATED_NODES = ('usuario', 'midia', 'hashtag', 'assunto')
+
+def run_query(tx, query, params=None, family='query'):
+    """Função genérica para executar uma query com parâmetros (via query_profiler, para o profiling opcional)."""
+    query_profiler.run(tx, query, family, params)
+
+def _family_rows(df, family):
+    """Seleciona apenas as colunas da família e converte o DataFrame em lista de dicionários."""
+    return df[FAMILY_COLUMNS[family]].to_dict('records')
+
+def new_seen_nodes():
+    """
+    Chaves (hashes de 64 bits) dos nós já enviados na carga, por família de nó. Passado a
+    build_node_family_rows()/build_relationship_family_rows(), evita reenviar em um pedaço
+    um usuário, mídia, hashtag ou assunto que já foi criado em um pedaço anterior.
+    """
+    return {family: bulk_import.KeySet() for family in DEDUPLICATED_NODES}
+
+def _distinct_nodes(df, key, family=None, seen=None, keep='first'):
+    """
+    Uma linha por valor de `key` no pedaço. A primeira ocorrência é a que o ON CREATE SET
+    usaria; no upsert (SET), vale a última. Com `seen`, descarta também os valores já enviados.
+    """
+    df = df.drop_duplicates(key, keep=keep)
+    if seen is not None and family in seen:
+        df = df[seen[family].add_new(bulk_import.hash_columns(df[key]))]
+    return df
+
+def _hashtag_rows(df_tweets):
+    """
+    Tags de cada tweet (separadas por ';'), sem espaços nas pontas, sem vazias e sem repetição.
+    Retorna um DataFrame com uma linha por par (tweet_id, nome).
+    """
+    with_hashtags = df_tweets[df_tweets['hashtags_extraidas'] != '']
+    tags = with_hashtags['hashtags_extraidas'].str.split(';').explode().str.strip()
+    pairs = pd.DataFrame({'tweet_id': with_hashtags['tweet_id'].loc[tags.index], 'nome': tags})
+    return pairs[pairs['nome'].notna() & (pairs['nome'] != '')].drop_duplicates()
+
+def build_node_family_rows(df_tweets, upsert=False, seen=None):
+    """
+    Linhas das famílias que criam os nós Usuario e Tweet (cada um uma vez só) e a relação POSTA.
+    Com `upsert`, as propriedades de nós já existentes também são atualizadas (e o usuário
+    é sempre reenviado, com a última versão do pedaço).
+    """
+    if upsert:
+        users = _distinct_nodes(df_tweets, 'usuario_id', keep='last')
+        tweets = _distinct_nodes(df_tweets, 'tweet_id', keep='last')
+    else:
+        users = _distinct_nodes(df_tweets, 'usuario_id', 'usuario', seen)
+        tweets = _distinct_nodes(df_tweets, 'tweet_id')
+    return [
+        ('usuario', UPSERT_USER_QUERY if upsert else CREATE_USER_QUERY, _family_rows(users, 'usuario')),
+        ('tweet', UPSERT_TWEET_QUERY if upsert else CREATE_TWEET_QUERY, _family_rows(tweets, 'tweet')),
+        ('posta', CREATE_POSTED_REL_QUERY, _family_rows(df_tweets, 'posta')),
+    ]
+
+def build_relationship_family_rows(df_tweets, seen=None):
+    """
+    Separa as linhas do CSV de tweets nas famílias de relação, já filtradas
+    (mesmas condições que antes eram testadas linha a linha). Os nós Midia, Hashtag e
+    Assunto distintos vêm antes, cada um uma vez só, e as relações apenas os encontram.
+    """
+    retweets = df_tweets[(df_tweets['tipo_interacao'] == 'RETWEETA') & (df_tweets['retweet_de_id'] != '')]
+    replies = df_tweets[df_tweets['reply_to_id'] != '']
+    media = df_tweets[df_tweets['midia_url'] != '']
+    subjects = df_tweets[df_tweets['assunto_nome'] != '']
+    tags = _hashtag_rows(df_tweets)
+    hashtags = [{'tweet_id': tweet_id, 'tags': list(names)}
+                for tweet_id, names in tags.groupby('tweet_id', sort=False)['nome']]
+    new_media = _distinct_nodes(media, 'midia_url', 'midia', seen)
+    new_hashtags = _distinct_nodes(tags, 'nome', 'hashtag', seen)
+    new_subjects = _distinct_nodes(subjects, 'assunto_nome', 'assunto', seen)
+
+    return [
+        ('midia', CREATE_MEDIA_QUERY, _family_rows(new_media, 'midia')),
+        ('hashtag', CREATE_HASHTAG_QUERY, new_hashtags[['nome']].to_dict('records')),
+        ('assunto', CREATE_SUBJECT_QUERY, _family_rows(new_subjects, 'assunto')),
+        ('retweet', CREATE_RETWEET_REL_QUERY, _family_rows(retweets, 'retweet')),
+        ('reply', CREATE_REPLY_REL_QUERY, _family_rows(replies, 'reply')),
+        ('possui_midia', CREATE_MEDIA_REL_QUERY, _family_rows(media, 'possui_midia')),
+        ('possui_hashtag', CREATE_HASHTAG_REL_QUERY, hashtags),
+        ('sobre', CREATE_SUBJECT_REL_QUERY, _family_rows(subjects, 'sobre')),
+    ]
+
+def _write_families(driver, session, families, sizes, workers, stats, writers=None):
+    """
+    Envia as famílias em lotes, uma após a outra. Com um worker, usa a sessão atual;
+    com mais, cada família é particionada por PARTITION_KEYS e escrita em paralelo.
+
+    Com `writers` (dicionário, preenchido aqui na primeira vez que cada família aparece),
+    cada família usa um adaptive_writer.AdaptiveWriter: `sizes` vira o tamanho inicial do
+    lote, que depois acompanha a latência do servidor, e linhas que falham sozinhas vão para
+    data/dead_letter/<família>.jsonl em vez de interromper a carga.
+    """
+    for family, query, rows in families:
+        writer = None
+        if writers is not None:
+            writer = writers.get(family)
+            if writer is None:
+                writer = writers[family] = adaptive_writer.unwind_writer(family, query, sizes[family])
+        if workers <= 1:
+            if writer is not None:
+                writer.write(session, rows, stats=stats)
+            else:
+                batch_writer.write_in_batches(session, query, rows, sizes[family], family, stats)
+        else:
+            parallel_loader.write_family_in_parallel(driver, query, rows, PARTITION_KEYS[family],
+                                                     sizes[family], workers, family, stats, writer)
+
+def _read_csv_chunks(file_path, chunksize, engine):
+    """
+    Lê um CSV de entrada em pedaços, com todas as colunas como texto e vazios como ''.
+    O tempo de leitura e as linhas lidas entram nas métricas (estágio 'leitura_csv').
+    """
+    chunks = dataset_loader.iter_csv_chunks(file_path, chunksize=chunksize, dtype=str, fillna='', engine=engine)
+    while True:
+        with metrics.timer('pipeline_stage_seconds_total', stage='leitura_csv'):
+            chunk = next(chunks, None)
+        if chunk is None:
+            return
+        metrics.increment('pipeline_rows_total', len(chunk), stage='leitura_csv')
+        yield chunk
+
+def _write_step(step, driver, session, families, sizes, workers, stats, rows, writers=None):
+    """_write_families() medido nas métricas: `rows` linhas do CSV e o tempo de escrita do passo `step`."""
+    with metrics.timer('pipeline_stage_seconds_total', stage=step):
+        _write_families(driver, session, families, sizes, workers, stats, writers)
+    metrics.increment('pipeline_rows_total', rows, stage=step)
 
-def populate_new_model_graph():
+def _select_delta(manifest, source, df, key_columns, incremental):
+    """
+    Calcula chave e hash de cada linha do pedaço. Na carga incremental, mantém só as
+    linhas novas ou alteradas segundo o manifesto; na completa, mantém todas.
+    Retorna (linhas a enviar, chaves, hashes) já filtrados.
+    """
+    keys = ingestion_manifest.row_keys(df, key_columns)
+    hashes = ingestion_manifest.content_hashes(df)
+    if incremental:
+        mask = manifest.changed_mask(source, keys, hashes)
+        df, keys, hashes = df[mask], keys[mask], hashes[mask]
+    return df, keys, hashes
+
+def populate_new_model_graph(batch_sizes=None, workers=1, chunksize=CSV_CHUNK_SIZE, csv_engine=None,
+                             incremental=False, manifest_path=MANIFEST_PATH,
+                             fast_reset=False, delete_batch_size=db_reset.DEFAULT_DELETE_BATCH_SIZE,
+                             adaptive_batches=False, drop_schema=False):
     """
     Orquestra a carga de dados lendo os CSVs localmente e enviando os dados para o Neo4j.
+    Cada família de query é enviada em lotes `UNWIND $rows`; `batch_sizes` permite
+    sobrescrever o tamanho do lote de qualquer família definida em BATCH_SIZES.
+    Com `workers` > 1, cada família é particionada por PARTITION_KEYS e escrita em paralelo.
+
+    Os CSVs são lidos em pedaços de `chunksize` linhas (memória constante). O arquivo de
+    tweets é percorrido duas vezes: primeiro os nós, depois as relações, para que uma
+    relação sempre encontre os tweets que aparecem mais adiante no arquivo.
+
+    Com `incremental`, o banco não é apagado: apenas as linhas novas ou alteradas desde a
+    última carga (segundo o manifesto em `manifest_path`) são enviadas, como upserts.
+    A carga completa recria o manifesto, servindo de base para as cargas incrementais.
+
+    A carga completa começa limpando o banco em lotes de `delete_batch_size`; com
+    `fast_reset`, tenta antes recriar o banco inteiro (Neo4j Enterprise). Constraints e
+    índices são mantidos entre as cargas, a menos que `drop_schema` seja pedido.
+
+    Com `adaptive_batches`, os tamanhos de BATCH_SIZES são só o ponto de partida: cada família
+    ajusta o lote pela latência das transações, repete erros transitórios com espera aleatória
+    e isola as linhas ruins em data/dead_letter/ (ver graph_database/adaptive_writer.py).
     """
-    print("--- FASE 1: INICIANDO CARGA COM O NOVO MODELO DE GRAFO (LEITURA LOCAL) ---")
+    sizes = {**BATCH_SIZES, **(batch_sizes or {})}
+    mode = "INCREMENTAL" if incremental else "COMPLETA"
+
+    print(f"--- FASE 1: INICIANDO CARGA {mode} COM O NOVO MODELO DE GRAFO (LEITURA LOCAL) ---")
     driver = neo4j_connector.connect_db()
     if not driver:
         return
 
-    # Limpeza do banco de dados
-    print("Limpando o banco de dados...")
-    with driver.session() as session:
-        session.run("MATCH (n) DETACH DELETE n")
-        for constraint in session.run("SHOW CONSTRAINTS"):
-            try:
-                session.run(f"DROP CONSTRAINT {constraint['name']}")
-            except:
-                pass # Ignora erros se a constraint não existir mais
-    print("Banco de dados limpo.")
-
-    with driver.session() as session:
-        # 1. Criar Constraints
-        print("\nPasso 1: Criando constraints...")
-        for constraint in CONSTRAINTS_QUERIES:
-            session.execute_write(run_query, constraint)
-        print("Constraints criadas com sucesso.")
-
-        # 2. Ler o arquivo de tweets
-        print(f"\nPasso 2: Lendo arquivo de tweets de '{TWEETS_FILE_PATH}'...")
+    manifest = ingestion_manifest.IngestionManifest(manifest_path)
+    if not incremental:
+        db_reset.reset_database(driver, batch_size=delete_batch_size, fast=fast_reset, drop_constraints=drop_schema)
+        manifest.clear()
+
+    # 1. Aplicar o schema (constraints e índices) e esperar os índices antes de carregar
+    # As constraints e os índices vêm de graph_database/schema.py; só o que falta é criado.
+    print("\nPasso 1: Aplicando constraints e índices...")
+    schema.ensure_schema(driver)
+
+    stats = {}
+    seen = new_seen_nodes()
+    writers = {} if adaptive_batches else None
+    with manifest, driver.session() as session:
+
+        # 2. Ler o arquivo de tweets e criar usuários e tweets
+        print(f"\nPasso 2: Lendo tweets de '{TWEETS_FILE_PATH}' e criando usuários e tweets...")
         try:
-            df_tweets = pd.read_csv(TWEETS_FILE_PATH, dtype=str).fillna('')
-            print(f"{len(df_tweets)} linhas carregadas do CSV de tweets.")
+            total_rows = 0
+            sent_rows = 0
+            for df_tweets in _read_csv_chunks(TWEETS_FILE_PATH, chunksize, csv_engine):
+                delta, _, _ = _select_delta(manifest, TWEETS_FILE_PATH, df_tweets, TWEETS_KEY_COLUMNS, incremental)
+                _write_step('nos', driver, session, build_node_family_rows(delta, incremental, seen), sizes, workers,
+                            stats, len(delta), writers)
+                total_rows += len(df_tweets)
+                sent_rows += len(delta)
+                print(f"  {total_rows} linhas de tweets lidas, {sent_rows} enviadas...")
         except FileNotFoundError:
             print(f"ERRO: Arquivo não encontrado em '{TWEETS_FILE_PATH}'. Verifique o caminho.")
             neo4j_connector.close_db(driver)
             return
 
-        # 3. Processar cada linha do CSV de tweets
-        print("\nPasso 3: Processando tweets, usuários, mídias, hashtags e assuntos...")
-        for index, row in df_tweets.iterrows():
-            row_dict = row.to_dict()
-            
-            # Cria Usuário, Tweet e relação POSTA
-            session.execute_write(run_query, CREATE_USER_TWEET_QUERY, params={'row': row_dict})
-            
-            # Cria relação de Retweet
-            if row['tipo_interacao'] == 'RETWEETA' and row['retweet_de_id']:
-                session.execute_write(run_query, CREATE_RETWEET_REL_QUERY, params={'row': row_dict})
-
-            # Cria relação de Reply
-            if row['reply_to_id']:
-                session.execute_write(run_query, CREATE_REPLY_REL_QUERY, params={'row': row_dict})
-
-            # Cria Mídia e relação
-            if row['midia_url']:
-                session.execute_write(run_query, CREATE_MEDIA_REL_QUERY, params={'row': row_dict})
-
-            # Cria Hashtags e relações
-            if row['hashtags_extraidas']:
-                tags = row['hashtags_extraidas'].split(';')
-                session.execute_write(run_query, CREATE_HASHTAG_REL_QUERY, params={'tags': tags, 'tweet_id': row['tweet_id']})
-            
-            # Cria Assunto e relação
-            if row['assunto_nome']:
-                session.execute_write(run_query, CREATE_SUBJECT_REL_QUERY, params={'row': row_dict})
-
-            if (index + 1) % 500 == 0:
-                print(f"  {index + 1}/{len(df_tweets)} tweets processados...")
+        # 3. Reler o arquivo de tweets e criar as relações
+        # O manifesto só é atualizado aqui, depois que nós e relações do pedaço foram escritos.
+        print("\nPasso 3: Processando retweets, replies, mídias, hashtags e assuntos em lotes...")
+        total_rows = 0
+        for df_tweets in _read_csv_chunks(TWEETS_FILE_PATH, chunksize, csv_engine):
+            delta, keys, hashes = _select_delta(manifest, TWEETS_FILE_PATH, df_tweets, TWEETS_KEY_COLUMNS, incremental)
+            _write_step('relacoes', driver, session, build_relationship_family_rows(delta, seen), sizes, workers,
+                        stats, len(delta), writers)
+            manifest.record(TWEETS_FILE_PATH, keys, hashes)
+            manifest.commit()
+            total_rows += len(df_tweets)
+            print(f"  {total_rows} linhas de tweets processadas...")
         print("Processamento de tweets concluído.")
 
         # 4. Ler e processar o arquivo de seguidores
         print(f"\nPasso 4: Lendo e processando seguidores de '{FOLLOWERS_FILE_PATH}'...")
         try:
-            df_followers = pd.read_csv(FOLLOWERS_FILE_PATH, dtype=str).fillna('')
-            print(f"{len(df_followers)} relações de seguidores para criar.")
-            for index, row in df_followers.iterrows():
-                session.execute_write(run_query, CREATE_FOLLOW_REL_QUERY, params={'row': row.to_dict()})
+            total_rows = 0
+            sent_rows = 0
+            for df_followers in _read_csv_chunks(FOLLOWERS_FILE_PATH, chunksize, csv_engine):
+                delta, keys, hashes = _select_delta(manifest, FOLLOWERS_FILE_PATH, df_followers,
+                                                    FOLLOWERS_KEY_COLUMNS, incremental)
+                _write_step('seguidores', driver, session, [('segue', CREATE_FOLLOW_REL_QUERY, _family_rows(delta, 'segue'))],
+                            sizes, workers, stats, len(delta), writers)
+                manifest.record(FOLLOWERS_FILE_PATH, keys, hashes)
+                manifest.commit()
+                total_rows += len(df_followers)
+                sent_rows += len(delta)
+            print(f"{total_rows} relações de seguidores lidas, {sent_rows} enviadas.")
             print("Processamento de seguidores concluído.")
         except FileNotFoundError:
             print(f"AVISO: Arquivo de seguidores não encontrado em '{FOLLOWERS_FILE_PATH}'. Pulando esta etapa.")
 
-    print("\n--- CARGA COMPLETA COM O NOVO MODELO CONCLUÍDA ---")
+    batch_writer.print_throughput_report(stats)
+    print(f"\n--- CARGA {mode} COM O NOVO MODELO CONCLUÍDA ---")
     neo4j_connector.close_db(driver)
 
+def export_bulk_import_files(output_dir=bulk_import.DEFAULT_OUTPUT_DIR, workers=None,
+                             chunksize=bulk_import.DEFAULT_CHUNK_SIZE, csv_engine=None):
+    """
+    Alternativa a populate_new_model_graph() para a primeira carga de bases muito grandes:
+    em vez de enviar MERGEs ao banco, converte os mesmos CSVs nos arquivos do importador
+    offline (neo4j-admin database import full), com o mesmo modelo de grafo.
+    As constraints e os índices não fazem parte da importação e são criados depois, com o banco
+    no ar, por `python -m graph_database.schema --apply`.
+    """
+    print("--- GERANDO ARQUIVOS PARA O IMPORTADOR OFFLINE DO NEO4J ---")
+    try:
+        report = bulk_import.generate_import_files(TWEETS_FILE_PATH, FOLLOWERS_FILE_PATH, output_dir, workers,
+                                                   chunksize, csv_engine)
+    except FileNotFoundError:
+        print(f"ERRO: Arquivo não encontrado em '{TWEETS_FILE_PATH}'. Verifique o caminho.")
+        return None
+    bulk_import.print_report(report)
+    print("\nDepois da importação, inicie o Neo4j e crie as constraints e índices com:")
+    print("  python -m graph_database.schema --apply")
+    return report
+
 if __name__ == '__main__':
-    # Certifique-se de ter o pandas instalado: pip install pandas
-    populate_new_model_graph()
+    # Certifique-se de ter o pandas instalado: pip install pandas (pyarrow é opcional)
+    import argparse
+    parser = argparse.ArgumentParser(description="Carga dos CSVs de tweets e seguidores no Neo4j.")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Número de sessões paralelas por família de query (padrão: 1, carga sequencial). "
+                             "Com --bulk-import-dir, processos de conversão (padrão: um por CPU).")
+    parser.add_argument('--chunksize', type=int, default=CSV_CHUNK_SIZE,
+                        help=f"Linhas lidas do CSV por pedaço (padrão: {CSV_CHUNK_SIZE}).")
+    parser.add_argument('--csv-engine', choices=['c', 'pyarrow'], default=None,
+                        help="Parser de CSV; 'pyarrow' é mais rápido se o pacote estiver instalado.")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Não apaga o banco; envia apenas linhas novas ou alteradas desde a última carga.")
+    parser.add_argument('--fast-reset', action='store_true',
+                        help="Na carga completa, tenta recriar o banco (CREATE OR REPLACE DATABASE) em vez de apagá-lo em lotes.")
+    parser.add_argument('--drop-schema', action='store_true',
+                        help="Na carga completa, remove também as constraints (recriadas a partir de graph_database/schema.py).")
+    parser.add_argument('--delete-batch-size', type=int, default=db_reset.DEFAULT_DELETE_BATCH_SIZE,
+                        help=f"Itens apagados por transação na limpeza (padrão: {db_reset.DEFAULT_DELETE_BATCH_SIZE}).")
+    parser.add_argument('--adaptive-batches', action='store_true',
+                        help="Ajusta o tamanho dos lotes pela latência e isola linhas com erro em data/dead_letter/.")
+    parser.add_argument('--bulk-import-dir', default=None,
+                        help="Não acessa o banco: gera nesta pasta os arquivos do neo4j-admin import (primeira carga).")
+    metrics.add_arguments(parser)
+    query_profiler.add_arguments(parser)
+    args = parser.parse_args()
+    with metrics.reporter_from_args(args, name='1_populate_graph'), \
+            (query_profiler.profiler_from_args(args) or contextlib.nullcontext()):
+        if args.bulk_import_dir:
+            export_bulk_import_files(args.bulk_import_dir, workers=args.workers, csv_engine=args.csv_engine,
+                                     chunksize=args.chunksize)
+        else:
+            populate_new_model_graph(workers=args.workers or 1, chunksize=args.chunksize, csv_engine=args.csv_engine,
+                                     incremental=args.incremental, fast_reset=args.fast_reset,
+                                     delete_batch_size=args.delete_batch_size,
+                                     adaptive_batches=args.adaptive_batches, drop_schema=args.drop_schema)
@@ -1,8 +1,55 @@
 # 2_analyze_and_update_sentiments_v2.py
 # VERSÃO ATUALIZADA para funcionar com o novo modelo de grafo.
 
-from graph_database import neo4j_connector
+import contextlib
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from graph_database import neo4j_connector, query_profiler, adaptive_writer
 from sentiment_analysis import analyzer as sentiment_analyzer
+from sentiment_analysis.sentiment_cache import SentimentCache
+from utils import metrics
+
+# --- BACKFILL POR SHARDS ---
+# Tamanho (em IDs) de cada shard do backfill e número de shards processados em paralelo.
+BACKFILL_SHARD_SIZE = 50_000
+BACKFILL_SHARD_WORKERS = 4
+# Tweets lidos por página (paginação por chave: t.id > último id lido).
+BACKFILL_PAGE_SIZE = 2_000
+# Arquivo com o plano do backfill e os shards já concluídos.
+BACKFILL_CHECKPOINT_PATH = os.path.join('data', '.sentiment_backfill_checkpoint.json')
+
+FETCH_MISSING_ID_BOUNDS_QUERY = """
+MATCH (t:Tweet)
+WHERE t.sentimentLabel IS NULL
+RETURN min(t.id) AS min_id, max(t.id) AS max_id, count(t) AS total
+"""
+
+FETCH_MISSING_PAGE_QUERY = """
+MATCH (t:Tweet)
+WHERE t.id > $after_id AND t.id <= $end_id AND t.sentimentLabel IS NULL
+RETURN t.id AS tweetId, t.texto AS text
+ORDER BY t.id
+LIMIT $limit
+"""
+
+FETCH_PAGE_QUERY = """
+MATCH (t:Tweet)
+WHERE t.id > $after_id AND t.id <= $end_id
+RETURN t.id AS tweetId, t.texto AS text
+ORDER BY t.id
+LIMIT $limit
+"""
+
+# --- MODO EM PIPELINE ---
+# Páginas em trânsito entre cada par de estágios (leitura -> análise -> escrita).
+# Limita a memória: um estágio rápido espera quando a fila do próximo está cheia.
+PIPELINE_QUEUE_DEPTH = 4
+PIPELINE_PAGE_SIZE = 2_000
 
 def fetch_tweets_by_id_range(driver, start_id, end_id):
     """
@@ -21,29 +68,94 @@ def fetch_tweets_by_id_range(driver, start_id, end_id):
     RETURN t.id AS tweetId, t.texto AS text
     """
     
-    with driver.session() as session:
-        result = session.run(query, start_id=start_id, end_id=end_id)
-        return result.data()
+    with driver.session() as session, metrics.timer('pipeline_stage_seconds_total', stage='leitura'):
+        tweets = session.run(query, start_id=start_id, end_id=end_id).data()
+    metrics.increment('pipeline_rows_total', len(tweets), stage='leitura')
+    return tweets
+
+# Número de atualizações de sentimento enviadas por transação.
+SENTIMENT_WRITE_BATCH_SIZE = 500
+
+UPDATE_SENTIMENT_QUERY = """
+UNWIND $rows AS row
+MATCH (t:Tweet {id: row.id})
+SET t.sentimentLabel = row.label,
+    t.sentimentScore = row.score
+"""
+
+# Variante que grava também o detalhamento do VADER, na mesma ida ao banco.
+UPDATE_SENTIMENT_WITH_BREAKDOWN_QUERY = """
+UNWIND $rows AS row
+MATCH (t:Tweet {id: row.id})
+SET t.sentimentLabel = row.label,
+    t.sentimentScore = row.score,
+    t.sentimentPositive = row.positive,
+    t.sentimentNegative = row.negative,
+    t.sentimentNeutral = row.neutral
+"""
+
+def build_sentiment_row(tweet_id, sentiment_data, include_breakdown=False):
+    """
+    Converte o resultado do analisador na linha `{id, label, score}` enviada ao banco.
+    Textos vazios vêm do analisador só com 'score' (sem 'score_compound').
+    """
+    row = {
+        'id': tweet_id,
+        'label': sentiment_data['label'],
+        'score': sentiment_data.get('score_compound', sentiment_data.get('score', 0.0)),
+    }
+    if include_breakdown:
+        row['positive'] = sentiment_data.get('score_positive', 0.0)
+        row['negative'] = sentiment_data.get('score_negative', 0.0)
+        row['neutral'] = sentiment_data.get('score_neutral', 0.0)
+    return row
+
+def _sentiment_query(include_breakdown):
+    return UPDATE_SENTIMENT_WITH_BREAKDOWN_QUERY if include_breakdown else UPDATE_SENTIMENT_QUERY
+
+def update_tweet_sentiments_in_db(tx, rows, include_breakdown=False):
+    """
+    Atualiza um lote de nós Tweet com as propriedades de sentimento (`UNWIND $rows`).
+    """
+    query_profiler.run(tx, _sentiment_query(include_breakdown), 'sentimento', rows=rows)
 
-def update_tweet_sentiment_in_db(tx, tweet_id, sentiment_data):
+def update_tweet_sentiment_in_db(tx, tweet_id, sentiment_data, include_breakdown=False):
     """
-    Atualiza um nó Tweet com as propriedades de sentimento.
+    Atualiza um único nó Tweet com as propriedades de sentimento.
     """
     # MUDANÇA PRINCIPAL:
     # - O MATCH agora é em 't.id' em vez de 't.tweetId'.
-    query = """
-    MATCH (t:Tweet {id: $tweetId})
-    SET t.sentimentLabel = $label,
-        t.sentimentScore = $score
+    update_tweet_sentiments_in_db(tx, [build_sentiment_row(tweet_id, sentiment_data, include_breakdown)],
+                                  include_breakdown)
+
+# Escritor compartilhado (inclusive entre os shards do backfill) da família 'sentimento':
+# o lote começa em SENTIMENT_WRITE_BATCH_SIZE e se ajusta pela latência; erros transitórios
+# são repetidos com espera aleatória e lotes com erro são divididos até isolar os tweets
+# problemáticos, que vão para data/dead_letter/sentimento.jsonl.
+SENTIMENT_WRITER = adaptive_writer.AdaptiveWriter(
+    'sentimento', update_tweet_sentiments_in_db,
+    sizer=adaptive_writer.BatchSizer(initial=SENTIMENT_WRITE_BATCH_SIZE))
+
+def flush_sentiment_updates(session, rows, include_breakdown=False):
     """
-    tx.run(query, 
-           tweetId=tweet_id, 
-           label=sentiment_data['label'], 
-           score=sentiment_data['score_compound'])
+    Grava um lote de linhas de sentimento com SENTIMENT_WRITER (em uma ou mais transações).
+    Retorna (linhas gravadas, linhas com erro enviadas ao dead letter).
+    """
+    if not rows:
+        return 0, 0
+    metrics.increment('pipeline_rows_total', len(rows), stage='escrita')
+    with metrics.timer('pipeline_stage_seconds_total', stage='escrita'):
+        return SENTIMENT_WRITER.write(session, rows, include_breakdown)
 
-def analyze_and_update_sentiments_by_range(start_id, end_id):
+def analyze_and_update_sentiments_by_range(start_id, end_id, batch_size=SENTIMENT_WRITE_BATCH_SIZE,
+                                           include_breakdown=False, scoring_workers=None, use_cache=True):
     """
     Orquestra o processo de enriquecimento para um intervalo específico de IDs.
+    Os textos são analisados em paralelo por `scoring_workers` processos (padrão: um por
+    núcleo). As atualizações são gravadas em lotes de `batch_size`; com
+    `include_breakdown`, grava também os scores positivo, negativo e neutro do VADER.
+    Com `use_cache`, textos repetidos (ex: retweets) e já analisados em execuções
+    anteriores são lidos do cache local em vez de reanalisados.
     """
     print(f"\n--- FASE 2: ANÁLISE DE SENTIMENTOS PARA TWEETS NO INTERVALO DE ID {start_id} a {end_id} ---")
 
@@ -61,28 +173,404 @@ def analyze_and_update_sentiments_by_range(start_id, end_id):
     total_in_batch = len(tweets_to_process)
     print(f"\n{total_in_batch} tweets encontrados. Iniciando análise e atualização...")
 
-    for i, tweet in enumerate(tweets_to_process):
-        # Os nomes das chaves retornadas pela query mudaram para 'tweetId' e 'text'
-        tweet_id = tweet['tweetId']
-        tweet_text = tweet['text']
+    # Os nomes das chaves retornadas pela query mudaram para 'tweetId' e 'text'
+    cache = SentimentCache() if use_cache else None
+    with sentiment_analyzer.SentimentScoringPool(workers=scoring_workers, cache=cache) as scoring_pool:
+        sentiment_results = scoring_pool.analyze(tweet['text'] for tweet in tweets_to_process)
+    if cache is not None:
+        cache.print_report()
+        cache.close()
+
+    pending = []
+    written = 0
+    failed = 0
+    with driver.session() as session:
+        for i, (tweet, sentiment_result) in enumerate(zip(tweets_to_process, sentiment_results)):
+            pending.append(build_sentiment_row(tweet['tweetId'], sentiment_result, include_breakdown))
+
+            if len(pending) >= batch_size or (i + 1) == total_in_batch:
+                batch_written, batch_failed = flush_sentiment_updates(session, pending, include_breakdown)
+                written += batch_written
+                failed += batch_failed
+                pending = []
+                print(f"  {i + 1}/{total_in_batch} tweets do lote processados ({written} atualizados, {failed} com erro)...")
+    
+    print(f"\n--- ANÁLISE POR INTERVALO CONCLUÍDA ---")
+    neo4j_connector.close_db(driver)
+
+def fetch_missing_id_bounds(driver):
+    """Retorna (menor id, maior id, total) dos tweets que ainda não têm sentimento."""
+    with driver.session() as session:
+        record = session.run(FETCH_MISSING_ID_BOUNDS_QUERY).single()
+    return record['min_id'], record['max_id'], record['total']
+
+def split_id_range(min_id, max_id, shard_size):
+    """Divide o intervalo [min_id, max_id] em shards contíguos (início, fim) de até `shard_size` IDs."""
+    return [(start, min(start + shard_size - 1, max_id)) for start in range(min_id, max_id + 1, shard_size)]
+
+def iter_tweet_pages(session, start_id, end_id, page_size=BACKFILL_PAGE_SIZE, only_missing=True):
+    """
+    Percorre os tweets de [start_id, end_id] (por padrão, só os sem sentimento) em páginas
+    de `page_size`, usando paginação por chave (o id do último tweet lido), sem carregar
+    o intervalo inteiro.
+    """
+    query = FETCH_MISSING_PAGE_QUERY if only_missing else FETCH_PAGE_QUERY
+    after_id = start_id - 1
+    while True:
+        start = time.perf_counter()
+        page = session.run(query, after_id=after_id, end_id=end_id, limit=page_size).data()
+        elapsed = time.perf_counter() - start
+        metrics.observe('neo4j_transaction_seconds', elapsed, family='leitura_pagina')
+        metrics.increment('pipeline_stage_seconds_total', elapsed, stage='leitura')
+        metrics.increment('pipeline_rows_total', len(page), stage='leitura')
+        if not page:
+            return
+        yield page
+        if len(page) < page_size:
+            return
+        after_id = page[-1]['tweetId']
+
+class ShardCheckpoint:
+    """
+    Checkpoint do backfill em JSON: o plano (limites e tamanho dos shards) e os shards
+    concluídos. Cada shard concluído é gravado imediatamente (escrita atômica), então uma
+    execução interrompida retoma a partir dos shards que faltam.
+    Faixas de IDs fora dos limites originais (ex: tweets carregados depois do plano) entram
+    como extensões do plano (extend()), sem mudar os limites dos shards já planejados.
+    """
+
+    def __init__(self, path=BACKFILL_CHECKPOINT_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self.plan = None
+        self.completed = set()
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+            self.plan = data['plan']
+            self.completed = {tuple(shard) for shard in data['completed']}
+
+    def start(self, min_id, max_id, shard_size):
+        """Define um novo plano, descartando o progresso anterior."""
+        with self._lock:
+            self.plan = {'min_id': min_id, 'max_id': max_id, 'shard_size': shard_size}
+            self.completed = set()
+            self._save()
+
+    def shards(self):
+        ranges = [(self.plan['min_id'], self.plan['max_id'])] + [tuple(r) for r in self.plan.get('extensions', [])]
+        return [shard for start, end in ranges for shard in split_id_range(start, end, self.plan['shard_size'])]
+
+    def bounds(self):
+        """(menor id, maior id) cobertos pelo plano, incluindo as extensões."""
+        ranges = [(self.plan['min_id'], self.plan['max_id'])] + [tuple(r) for r in self.plan.get('extensions', [])]
+        return min(start for start, _ in ranges), max(end for _, end in ranges)
+
+    def extend(self, min_id, max_id):
+        """
+        Acrescenta ao plano as faixas de [min_id, max_id] que ele ainda não cobre.
+        Retorna a lista de faixas (início, fim) acrescentadas.
+        """
+        low, high = self.bounds()
+        added = []
+        if min_id < low:
+            added.append((min_id, low - 1))
+        if max_id > high:
+            added.append((high + 1, max_id))
+        if added:
+            with self._lock:
+                self.plan.setdefault('extensions', []).extend([list(r) for r in added])
+                self._save()
+        return added
+
+    def pending_shards(self):
+        return [shard for shard in self.shards() if shard not in self.completed]
+
+    def mark_done(self, shard):
+        with self._lock:
+            self.completed.add(tuple(shard))
+            self._save()
 
-        sentiment_result = sentiment_analyzer.analyze_sentiment_of_tweet(tweet_text)
+    def clear(self):
+        with self._lock:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            self.plan = None
+            self.completed = set()
 
+    def _save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'plan': self.plan, 'completed': sorted(self.completed)}, f)
+        os.replace(tmp_path, self.path)
+
+def _backfill_shard(driver, shard, scoring_pool, batch_size, include_breakdown):
+    """Analisa e grava todos os tweets sem sentimento de um shard. Retorna (gravados, com erro)."""
+    start_id, end_id = shard
+    written = 0
+    failed = 0
+    with driver.session() as session:
+        for page in iter_tweet_pages(session, start_id, end_id):
+            results = scoring_pool.analyze(tweet['text'] for tweet in page)
+            rows = [build_sentiment_row(tweet['tweetId'], result, include_breakdown)
+                    for tweet, result in zip(page, results)]
+            for start in range(0, len(rows), batch_size):
+                batch_written, batch_failed = flush_sentiment_updates(session, rows[start:start + batch_size],
+                                                                      include_breakdown)
+                written += batch_written
+                failed += batch_failed
+    return written, failed
+
+def backfill_all_sentiments(shard_size=BACKFILL_SHARD_SIZE, shard_workers=BACKFILL_SHARD_WORKERS,
+                            batch_size=SENTIMENT_WRITE_BATCH_SIZE, include_breakdown=False,
+                            scoring_workers=None, use_cache=True, checkpoint_path=BACKFILL_CHECKPOINT_PATH,
+                            restart=False):
+    """
+    Analisa todos os tweets do banco que ainda não têm sentimento.
+    O intervalo de IDs é descoberto no banco e dividido em shards de `shard_size` IDs,
+    processados por `shard_workers` threads (a análise em si usa o pool de processos).
+    Cada shard concluído vai para o checkpoint; se houver um checkpoint, a execução
+    retoma os shards pendentes (use `restart` para descartá-lo e replanejar). Ao retomar, os
+    limites atuais são comparados com os do plano e os IDs novos entram como shards a mais.
+    Shards com tweets que falharam não são marcados como concluídos e são refeitos na
+    próxima execução.
+    """
+    print("\n--- FASE 2: BACKFILL DE SENTIMENTOS POR SHARDS ---")
+    driver = neo4j_connector.connect_db()
+    if not driver:
+        return
+
+    checkpoint = ShardCheckpoint(checkpoint_path)
+    if restart:
+        checkpoint.clear()
+    min_id, max_id, total = fetch_missing_id_bounds(driver)
+    if not total:
+        print("Todos os tweets já têm sentimento. Nada a fazer.")
+        checkpoint.clear()
+        neo4j_connector.close_db(driver)
+        return
+    print(f"{total} tweets sem sentimento, IDs de {min_id} a {max_id}.")
+    if checkpoint.plan is None:
+        checkpoint.start(min_id, max_id, shard_size)
+    else:
+        low, high = checkpoint.bounds()
+        print(f"Retomando backfill a partir do checkpoint '{checkpoint_path}' (plano: IDs de {low} a {high}).")
+        # Tweets carregados depois do plano (ou abaixo dele) entram como shards novos.
+        for start, end in checkpoint.extend(min_id, max_id):
+            print(f"AVISO: Há tweets sem sentimento fora do plano salvo; IDs de {start} a {end} "
+                  f"acrescentados como shards novos.")
+
+    shards = checkpoint.pending_shards()
+    total_shards = len(checkpoint.shards())
+    print(f"{len(shards)} de {total_shards} shards pendentes, {shard_workers} em paralelo.")
+
+    cache = SentimentCache() if use_cache else None
+    written = 0
+    failed = 0
+    completed = total_shards - len(shards)
+    with sentiment_analyzer.SentimentScoringPool(workers=scoring_workers, cache=cache) as scoring_pool, \
+            ThreadPoolExecutor(max_workers=shard_workers) as executor:
+        futures = {executor.submit(_backfill_shard, driver, shard, scoring_pool, batch_size, include_breakdown): shard
+                   for shard in shards}
+        for future, shard in futures.items():
+            try:
+                shard_written, shard_failed = future.result()
+            except Exception as e:
+                print(f"ERRO no shard {shard[0]}..{shard[1]}: {e}. Ele será refeito na próxima execução.")
+                continue
+            written += shard_written
+            failed += shard_failed
+            if not shard_failed:
+                checkpoint.mark_done(shard)
+            completed += 1
+            print(f"  Shard {shard[0]}..{shard[1]} concluído ({completed}/{total_shards}): "
+                  f"{shard_written} tweets atualizados, {shard_failed} com erro.")
+
+    if cache is not None:
+        cache.print_report()
+        cache.close()
+    pending = checkpoint.pending_shards()
+    if not pending:
+        checkpoint.clear()
+    else:
+        # Shards com linhas que falharam (ou que falharam inteiros) não são marcados como concluídos.
+        print(f"AVISO: {len(pending)} shards continuam pendentes (com tweets que falharam) e serão refeitos "
+              f"na próxima execução. O checkpoint '{checkpoint_path}' foi mantido; use --restart para replanejar.")
+    print(f"\n--- BACKFILL CONCLUÍDO: {written} tweets atualizados, {failed} com erro ---")
+    neo4j_connector.close_db(driver)
+
+class _PipelineStopped(Exception):
+    """Sinaliza a um estágio que outro estágio falhou e o pipeline está parando."""
+
+def _pipeline_put(stage_queue, item, stop):
+    """Coloca um item na fila, desistindo se o pipeline for interrompido enquanto ela está cheia."""
+    while not stop.is_set():
+        try:
+            stage_queue.put(item, timeout=0.1)
+            return
+        except queue.Full:
+            continue
+    raise _PipelineStopped()
+
+def _pipeline_get(stage_queue, stop):
+    """Retira um item da fila, desistindo se o pipeline for interrompido enquanto ela está vazia."""
+    while not stop.is_set():
+        try:
+            return stage_queue.get(timeout=0.1)
+        except queue.Empty:
+            continue
+    raise _PipelineStopped()
+
+def analyze_and_update_sentiments_pipelined(start_id, end_id, only_missing=False, page_size=PIPELINE_PAGE_SIZE,
+                                            queue_depth=PIPELINE_QUEUE_DEPTH, batch_size=SENTIMENT_WRITE_BATCH_SIZE,
+                                            include_breakdown=False, scoring_workers=None, use_cache=True):
+    """
+    Versão em pipeline de analyze_and_update_sentiments_by_range(): leitura paginada,
+    análise e escrita em lotes rodam ao mesmo tempo, ligadas por filas de `queue_depth`
+    páginas. Enquanto o VADER analisa uma página, a próxima já está sendo lida e a
+    anterior gravada, então o tempo total se aproxima do estágio mais lento.
+    A memória fica limitada a cerca de (2 * queue_depth + 3) páginas de `page_size`.
+    """
+    print(f"\n--- FASE 2 (PIPELINE): ANÁLISE DE SENTIMENTOS PARA TWEETS NO INTERVALO DE ID {start_id} a {end_id} ---")
+
+    driver = neo4j_connector.connect_db()
+    if not driver:
+        return
+
+    done = object() # Marca de fim de fluxo entre os estágios
+    fetched_pages = queue.Queue(maxsize=queue_depth)
+    scored_pages = queue.Queue(maxsize=queue_depth)
+    stop = threading.Event()
+    errors = []
+    busy = {'leitura': 0.0, 'análise': 0.0, 'escrita': 0.0}
+
+    def fetch_stage():
         try:
             with driver.session() as session:
-                session.execute_write(update_tweet_sentiment_in_db, tweet_id, sentiment_result)
-            if (i + 1) % 50 == 0 or (i + 1) == total_in_batch:
-                print(f"  {i + 1}/{total_in_batch} tweets do lote atualizados...")
+                pages = iter_tweet_pages(session, start_id, end_id, page_size, only_missing)
+                while True:
+                    started = time.perf_counter()
+                    page = next(pages, None)
+                    busy['leitura'] += time.perf_counter() - started
+                    if page is None:
+                        break
+                    _pipeline_put(fetched_pages, page, stop)
+            _pipeline_put(fetched_pages, done, stop)
+        except _PipelineStopped:
+            pass
         except Exception as e:
-            print(f"ERRO ao atualizar tweet ID {tweet_id}: {e}")
-    
-    print(f"\n--- ANÁLISE POR INTERVALO CONCLUÍDA ---")
+            errors.append(('leitura', e))
+            stop.set()
+
+    def score_stage(scoring_pool):
+        try:
+            while True:
+                page = _pipeline_get(fetched_pages, stop)
+                if page is done:
+                    break
+                started = time.perf_counter()
+                results = scoring_pool.analyze(tweet['text'] for tweet in page)
+                rows = [build_sentiment_row(tweet['tweetId'], result, include_breakdown)
+                        for tweet, result in zip(page, results)]
+                busy['análise'] += time.perf_counter() - started
+                _pipeline_put(scored_pages, rows, stop)
+            _pipeline_put(scored_pages, done, stop)
+        except _PipelineStopped:
+            pass
+        except Exception as e:
+            errors.append(('análise', e))
+            stop.set()
+
+    cache = SentimentCache() if use_cache else None
+    written = 0
+    failed = 0
+    wall_start = time.perf_counter()
+    with sentiment_analyzer.SentimentScoringPool(workers=scoring_workers, cache=cache) as scoring_pool:
+        stages = [threading.Thread(target=fetch_stage, name='pipeline-leitura'),
+                  threading.Thread(target=score_stage, args=(scoring_pool,), name='pipeline-analise')]
+        for stage in stages:
+            stage.start()
+
+        # A escrita roda na thread principal.
+        try:
+            with driver.session() as session:
+                while True:
+                    rows = _pipeline_get(scored_pages, stop)
+                    if rows is done:
+                        break
+                    started = time.perf_counter()
+                    for start in range(0, len(rows), batch_size):
+                        batch_written, batch_failed = flush_sentiment_updates(session, rows[start:start + batch_size],
+                                                                              include_breakdown)
+                        written += batch_written
+                        failed += batch_failed
+                    busy['escrita'] += time.perf_counter() - started
+                    print(f"  {written} tweets atualizados, {failed} com erro...")
+        except _PipelineStopped:
+            pass
+        except BaseException as e:
+            stop.set()
+            if not isinstance(e, Exception):
+                raise
+            errors.append(('escrita', e))
+        finally:
+            for stage in stages:
+                stage.join()
+
+    if cache is not None:
+        cache.print_report()
+        cache.close()
+    for stage_name, error in errors:
+        print(f"ERRO no estágio de {stage_name}: {error}")
+
+    wall = time.perf_counter() - wall_start
+    print(f"Tempo total: {wall:.1f}s | " + " | ".join(f"{name}: {seconds:.1f}s" for name, seconds in busy.items()))
+    print(f"\n--- ANÁLISE EM PIPELINE CONCLUÍDA: {written} tweets atualizados, {failed} com erro ---")
     neo4j_connector.close_db(driver)
 
 if __name__ == '__main__':
-    # --- DEFINA AQUI O SEU INTERVALO DE IDs ---
-    id_inicial = 509002
-    id_final = 509401
+    import argparse
+    parser = argparse.ArgumentParser(description="Análise de sentimentos dos tweets já carregados no Neo4j.")
+    # --- INTERVALO PADRÃO DE IDs (modo por intervalo) ---
+    parser.add_argument('--start-id', type=int, default=509002)
+    parser.add_argument('--end-id', type=int, default=509401)
     # ----------------------------------------
-    
-    analyze_and_update_sentiments_by_range(id_inicial, id_final)
+    parser.add_argument('--backfill', action='store_true',
+                        help="Analisa todos os tweets sem sentimento, por shards, com checkpoint. Ao retomar, "
+                             "tweets sem sentimento fora dos IDs do plano salvo (ex: carregados depois) entram "
+                             "como shards novos; shards com tweets que falharam continuam pendentes e são "
+                             "refeitos a cada execução, mantendo o checkpoint até passarem.")
+    parser.add_argument('--pipeline', action='store_true',
+                        help="No modo por intervalo, sobrepõe leitura, análise e escrita (filas limitadas).")
+    parser.add_argument('--only-missing', action='store_true',
+                        help="No modo em pipeline, analisa apenas tweets ainda sem sentimento.")
+    parser.add_argument('--restart', action='store_true',
+                        help="No backfill, descarta o checkpoint existente (shards concluídos e pendentes) "
+                             "e replaneja os shards a partir dos tweets sem sentimento.")
+    parser.add_argument('--shard-size', type=int, default=BACKFILL_SHARD_SIZE)
+    parser.add_argument('--shard-workers', type=int, default=BACKFILL_SHARD_WORKERS)
+    parser.add_argument('--scoring-workers', type=int, default=None,
+                        help="Processos de análise (padrão: um por núcleo).")
+    parser.add_argument('--breakdown', action='store_true',
+                        help="Grava também os scores positivo, negativo e neutro.")
+    parser.add_argument('--no-cache', action='store_true', help="Não usa o cache de sentimentos.")
+    metrics.add_arguments(parser)
+    query_profiler.add_arguments(parser)
+    args = parser.parse_args()
+
+    with metrics.reporter_from_args(args, name='2_analyze_and_update_sentiments'), \
+            (query_profiler.profiler_from_args(args) or contextlib.nullcontext()):
+        if args.backfill:
+            backfill_all_sentiments(shard_size=args.shard_size, shard_workers=args.shard_workers,
+                                    include_breakdown=args.breakdown, scoring_workers=args.scoring_workers,
+                                    use_cache=not args.no_cache, restart=args.restart)
+        elif args.pipeline:
+            analyze_and_update_sentiments_pipelined(args.start_id, args.end_id, only_missing=args.only_missing,
+                                                    include_breakdown=args.breakdown, scoring_workers=args.scoring_workers,
+                                                    use_cache=not args.no_cache)
+        else:
+            analyze_and_update_sentiments_by_range(args.start_id, args.end_id, include_breakdown=args.breakdown,
+                                                   scoring_workers=args.scoring_workers, use_cache=not args.no_cache)
@@ -1,7 +1,9 @@
 # analise_tweets_neo4j/config/settings.py
+# As configurações são carregadas sob demanda: importar este módulo não lê o .env nem imprime
+# nada. Na primeira leitura de um atributo (ex: settings.NEO4J_URI) o .env é carregado uma
+# única vez e os valores ficam guardados para as próximas leituras.
 
 import os
-from dotenv import load_dotenv
 
 # Encontra o diretório raiz do projeto para carregar o .env corretamente
 # __file__ é o caminho para config/settings.py
@@ -10,62 +12,69 @@ from dotenv import load_dotenv
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DOTENV_PATH = os.path.join(PROJECT_ROOT, '.env')
 
-if os.path.exists(DOTENV_PATH):
-    load_dotenv(DOTENV_PATH)
-else:
-    print(f"AVISO: Arquivo .env não encontrado em {DOTENV_PATH}. Usando variáveis de ambiente do sistema se disponíveis.")
+_values = None
 
-# Credenciais do Neo4j
-NEO4J_URI = os.getenv("NEO4J_URI")
-NEO4J_USER = os.getenv("NEO4J_USER")
-NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD")
 
-# Caminho para o dataset
-DATASET_FILE_PATH = os.getenv("DATASET_FILE_PATH")
+def _load():
+    """Carrega o .env (se existir) e lê as variáveis de ambiente, uma vez por processo."""
+    global _values
+    if _values is not None:
+        return _values
 
-# Validação simples (opcional, mas recomendado)
-if not all([NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD]):
-    print("ALERTA: Credenciais do Neo4j não configuradas completamente. Verifique seu arquivo .env ou variáveis de ambiente.")
+    if os.path.exists(DOTENV_PATH):
+        from dotenv import load_dotenv
+        load_dotenv(DOTENV_PATH)
 
-if not DATASET_FILE_PATH:
-    print("ALERTA: Caminho do dataset (DATASET_FILE_PATH) não configurado. Verifique seu arquivo .env ou variáveis de ambiente.")
-else:
-    # Constrói o caminho absoluto para o dataset a partir da raiz do projeto
-    # Isso torna o caminho mais robusto, não importa de onde os scripts são chamados.
-    ABSOLUTE_DATASET_FILE_PATH = os.path.join(PROJECT_ROOT, DATASET_FILE_PATH)
-    if not os.path.exists(ABSOLUTE_DATASET_FILE_PATH):
-        print(f"ALERTA: Arquivo do dataset não encontrado em {ABSOLUTE_DATASET_FILE_PATH} (configurado como {DATASET_FILE_PATH}).")
+    dataset_file_path = os.getenv("DATASET_FILE_PATH")
+    _values = {
+        # Credenciais do Neo4j
+        'NEO4J_URI': os.getenv("NEO4J_URI"),
+        'NEO4J_USER': os.getenv("NEO4J_USER"),
+        'NEO4J_PASSWORD': os.getenv("NEO4J_PASSWORD"),
 
-# Para testar se as configurações estão sendo carregadas (opcional)
-# print(f"Neo4j URI: {NEO4J_URI}")
-# print(f"Dataset Path: {DATASET_FILE_PATH}")
-# print(f"Absolute Dataset Path: {ABSOLUTE_DATASET_FILE_PATH if 'ABSOLUTE_DATASET_FILE_PATH' in locals() else 'Não definido'}")
+        # Caminho para o dataset (o absoluto é construído a partir da raiz do projeto, de modo
+        # que funciona não importa de onde os scripts são chamados)
+        'DATASET_FILE_PATH': dataset_file_path,
+        'ABSOLUTE_DATASET_FILE_PATH': os.path.join(PROJECT_ROOT, dataset_file_path) if dataset_file_path else None,
+
+        # Pool de conexões do driver (compartilhado pelo conector síncrono e pelo assíncrono)
+        'NEO4J_DATABASE': os.getenv("NEO4J_DATABASE") or None, # None = banco padrão do servidor
+        'NEO4J_MAX_POOL_SIZE': int(os.getenv("NEO4J_MAX_POOL_SIZE", "100")),
+        'NEO4J_ACQUISITION_TIMEOUT': float(os.getenv("NEO4J_ACQUISITION_TIMEOUT", "60")), # segundos
+        'NEO4J_MAX_CONNECTION_LIFETIME': float(os.getenv("NEO4J_MAX_CONNECTION_LIFETIME", "3600")), # segundos
+        'NEO4J_FETCH_SIZE': int(os.getenv("NEO4J_FETCH_SIZE", "1000")), # registros buscados por ida ao servidor
+    }
+    return _values
 
-# Encontra o diretório raiz do projeto para carregar o .env corretamente
-PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-DOTENV_PATH = os.path.join(PROJECT_ROOT, '.env')
 
-print(f"DEBUG [settings.py]: Tentando carregar .env de: {DOTENV_PATH}")
+def __getattr__(name):
+    values = _load()
+    if name in values:
+        return values[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-if os.path.exists(DOTENV_PATH):
-    load_dotenv(DOTENV_PATH)
-    print(f"DEBUG [settings.py]: .env carregado.")
-else:
-    print(f"AVISO [settings.py]: Arquivo .env não encontrado em {DOTENV_PATH}.")
 
-NEO4J_URI = os.getenv("NEO4J_URI")
-NEO4J_USER = os.getenv("NEO4J_USER")
-NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD")
-DATASET_FILE_PATH = os.getenv("DATASET_FILE_PATH")
+def validate():
+    """
+    Verifica as configurações e imprime um ALERTA para cada problema encontrado.
+    Retorna True se estiver tudo certo.
+    """
+    values = _load()
+    ok = True
+    if not os.path.exists(DOTENV_PATH):
+        print(f"AVISO [settings.py]: Arquivo .env não encontrado em {DOTENV_PATH}. Usando variáveis de ambiente do sistema se disponíveis.")
+    if not all([values['NEO4J_URI'], values['NEO4J_USER'], values['NEO4J_PASSWORD']]):
+        print("ALERTA [settings.py]: Credenciais do Neo4j não configuradas completamente. Verifique seu arquivo .env ou variáveis de ambiente.")
+        ok = False
+    if not values['DATASET_FILE_PATH']:
+        print("ALERTA [settings.py]: Caminho do dataset (DATASET_FILE_PATH) não configurado. Verifique seu arquivo .env ou variáveis de ambiente.")
+        ok = False
+    elif not os.path.exists(values['ABSOLUTE_DATASET_FILE_PATH']):
+        print(f"ALERTA [settings.py]: Arquivo do dataset não encontrado em {values['ABSOLUTE_DATASET_FILE_PATH']} (configurado como {values['DATASET_FILE_PATH']}).")
+        ok = False
+    return ok
 
 
-# Validação simples 
-if not all([NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD]):
-    print("ALERTA [settings.py]: Credenciais do Neo4j não configuradas completamente.")
-ABSOLUTE_DATASET_FILE_PATH = None # Inicializa para evitar erro se DATASET_FILE_PATH for None
-if DATASET_FILE_PATH:
-    ABSOLUTE_DATASET_FILE_PATH = os.path.join(PROJECT_ROOT, DATASET_FILE_PATH)
-    if not os.path.exists(ABSOLUTE_DATASET_FILE_PATH):
-        print(f"ALERTA [settings.py]: Arquivo do dataset não encontrado em {ABSOLUTE_DATASET_FILE_PATH} (configurado como {DATASET_FILE_PATH}).")
-else:
-    print("ALERTA [settings.py]: Caminho do dataset (DATASET_FILE_PATH) não configurado.")
\ No newline at end of file
+if __name__ == '__main__':
+    if validate():
+        print("INFO: Configurações OK.")
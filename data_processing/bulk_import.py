@@ -0,0 +1,412 @@
+# analise_tweets_neo4j/data_processing/bulk_import.py
+# Gera os arquivos do importador offline do Neo4j (neo4j-admin database import full) a partir
+# dos CSVs de tweets e seguidores, para a primeira carga de bases muito grandes, em que MERGE
+# transacional levaria dias. O resultado reproduz o grafo de 1_populate_graph.py:
+# - cabeçalhos tipados (id:ID(Usuario), seguidores:long, criado_em:datetime, :START_ID(Tweet)...);
+# - IDs sem repetição: vale a primeira ocorrência de cada nó (como o ON CREATE SET da carga) e
+#   de cada par de uma relação;
+# - datas já convertidas para ISO 8601 em UTC, com a mesma regra da carga (só textos que
+#   começam com '19' ou '20'); inteiros e booleanos como toInteger()/toBoolean();
+# - relações cujo nó de origem ou destino não existe (ex: retweet de um tweet fora da base,
+#   seguidor que nunca tuitou) são descartadas, como o MATCH da carga faria.
+#
+# A leitura é em streaming (pedaços de `chunksize` linhas) e a conversão dos pedaços roda em
+# paralelo em processos; a deduplicação usa hashes de 64 bits em vetores ordenados do NumPy
+# (8 bytes por chave). Retweets e replies apontam para tweets que podem aparecer mais adiante
+# no arquivo, então ficam num arquivo temporário até todos os tweets terem sido vistos.
+
+import os
+import pickle
+import shlex
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from data_processing import dataset_loader
+from utils import metrics
+
+DEFAULT_OUTPUT_DIR = os.path.join('data', 'bulk_import')
+DEFAULT_CHUNK_SIZE = 200_000
+DEFAULT_DATABASE = 'neo4j'
+
+# Arquivo, rótulo e cabeçalho (em ordem) de cada tipo de nó. O tweet guarda o ID do importador
+# (texto) numa coluna sem nome e o `id` numa coluna :long, para ficar inteiro como no toInteger().
+NODE_FILES = {
+    'usuarios': ('Usuario', ['id:ID(Usuario)', 'handle', 'criado_em:datetime', 'seguidores:long', 'regiao',
+                             'influente:boolean']),
+    'tweets': ('Tweet', [':ID(Tweet)', 'id:long', 'texto', 'criado_em:datetime', 'idioma', 'likes:long']),
+    'midias': ('Midia', ['url:ID(Midia)', 'tipo', 'tamanho:long']),
+    'hashtags': ('Hashtag', ['nome:ID(Hashtag)']),
+    'assuntos': ('Assunto', ['nome:ID(Assunto)', 'tema_pai']),
+}
+
+RELATIONSHIP_FILES = {
+    'posta': ('POSTA', [':START_ID(Usuario)', ':END_ID(Tweet)', 'momento:datetime', 'dispositivo']),
+    'retweeta': ('RETWEETA', [':START_ID(Usuario)', ':END_ID(Tweet)', 'momento:datetime', 'dispositivo',
+                              'comentario']),
+    'reply_to': ('REPLY_TO', [':START_ID(Tweet)', ':END_ID(Tweet)']),
+    'possui_midia': ('POSSUI_MIDIA', [':START_ID(Tweet)', ':END_ID(Midia)']),
+    'possui_hashtag': ('POSSUI_HASHTAG', [':START_ID(Tweet)', ':END_ID(Hashtag)']),
+    'sobre': ('SOBRE', [':START_ID(Tweet)', ':END_ID(Assunto)']),
+    'segue': ('SEGUE', [':START_ID(Usuario)', ':END_ID(Usuario)', 'desde:datetime']),
+}
+
+# Relações que apontam para um tweet qualquer da base: só podem ser filtradas no fim.
+DEFERRED = ('retweeta', 'reply_to')
+
+
+# --- Conversões vetorizadas (mesma semântica das funções do Cypher usadas na carga) ---
+
+def _to_integer(values):
+    """toInteger(): inteiros exatos, decimais truncados; texto que não é número vira nulo."""
+    values = values.str.strip()
+    result = pd.Series(pd.NA, index=values.index, dtype='Int64')
+    integers = values.str.fullmatch(r'[+-]?\d{1,18}')
+    result[integers] = values[integers].astype('int64')
+    rest = ~integers & (values != '')
+    if rest.any():
+        floats = pd.to_numeric(values[rest], errors='coerce')
+        floats = floats[np.isfinite(floats) & (floats.abs() < 2 ** 63)]
+        result[floats.index] = np.trunc(floats).astype('int64')
+    return result
+
+
+def _to_boolean(values):
+    """toBoolean(): 'true'/'false' em qualquer caixa; o resto fica vazio (nulo no importador)."""
+    values = values.str.strip().str.lower()
+    return values.where(values.isin(['true', 'false']), '')
+
+
+def _to_datetime(values):
+    """
+    datetime(replace(x, ' ', 'T')) para textos que começam com '19' ou '20', em ISO 8601 UTC
+    (sem fuso vale UTC, como no Neo4j). Datas inválidas ficam vazias em vez de derrubar a carga.
+    """
+    result = pd.Series('', index=values.index, dtype=object)
+    candidates = values.str.startswith(('19', '20'))
+    if candidates.any():
+        # Datas se repetem muito (dias, momentos): converte só os valores distintos.
+        unique = pd.unique(values[candidates])
+        parsed = pd.to_datetime(pd.Series(unique).str.replace(' ', 'T', regex=False), format='ISO8601',
+                                errors='coerce', utc=True).dt.tz_localize(None).to_numpy('datetime64[us]')
+        unit = 's' if (parsed.astype('int64') % 1_000_000 == 0).all() else 'us'
+        text = np.char.add(np.datetime_as_string(parsed, unit=unit), 'Z')
+        text[np.isnat(parsed)] = ''
+        result[candidates] = pd.Series(text, index=unique).reindex(values[candidates]).to_numpy()
+    return result
+
+
+def hash_columns(*columns):
+    """Hash de 64 bits (estável entre processos) de uma coluna ou de um par de colunas."""
+    frame = pd.DataFrame({str(i): column.reset_index(drop=True) for i, column in enumerate(columns)})
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy()
+
+
+def _tweet_keys(tweet_ids):
+    # O próprio ID inteiro é a chave do tweet: sem colisões e sem custo de hash.
+    return tweet_ids.to_numpy('int64').view('uint64')
+
+
+def _frame(name, columns, key, end=None):
+    """DataFrame de um arquivo de saída: colunas na ordem do cabeçalho, mais a chave (e o destino)."""
+    header = {**NODE_FILES, **RELATIONSHIP_FILES}[name][1]
+    frame = pd.DataFrame({field: column.reset_index(drop=True) for field, column in zip(header, columns)})
+    frame['_key'] = key
+    if end is not None:
+        frame['_end'] = end
+    return frame
+
+
+def _has_line_breaks(*columns):
+    return any(column.str.contains('[\r\n]', regex=True).any() for column in columns)
+
+
+def _transform_tweet_chunk(df):
+    """
+    Converte um pedaço do CSV de tweets nas linhas candidatas de cada arquivo (ainda com
+    repetições). Roda nos processos de trabalho. Retorna (frames, linhas descartadas, multilinha).
+    """
+    tweet_ids = _to_integer(df['tweet_id'])
+    valid = tweet_ids.notna()
+    df, tweet_ids = df[valid], tweet_ids[valid]
+    tweet_keys = _tweet_keys(tweet_ids)
+    momento = _to_datetime(df['momento'])
+    has_user = (df['usuario_id'] != '').to_numpy()
+    user, tid = df['usuario_id'][has_user], tweet_ids[has_user]
+
+    frames = {
+        'usuarios': _frame('usuarios', [user, df['handle'][has_user], _to_datetime(df['criado_em_usuario'][has_user]),
+                                        _to_integer(df['seguidores'][has_user]), df['regiao'][has_user],
+                                        _to_boolean(df['influente'][has_user])], hash_columns(user)),
+        'tweets': _frame('tweets', [tweet_ids, tweet_ids, df['texto'], _to_datetime(df['criado_em']), df['idioma'],
+                                    _to_integer(df['likes'])], tweet_keys),
+        'posta': _frame('posta', [user, tid, momento[has_user], df['dispositivo'][has_user]],
+                        hash_columns(user, tid)),
+    }
+
+    retweets = df['retweet_de_id'].where(has_user & (df['tipo_interacao'] == 'RETWEETA'), '')
+    orig = _to_integer(retweets)
+    rt = orig.notna().to_numpy()
+    frames['retweeta'] = _frame('retweeta', [df['usuario_id'][rt], orig[rt], momento[rt], df['dispositivo'][rt],
+                                             df['comentario'][rt]],
+                                hash_columns(df['usuario_id'][rt], orig[rt]), _tweet_keys(orig[rt]))
+
+    replies = _to_integer(df['reply_to_id'])
+    rp = replies.notna().to_numpy()
+    frames['reply_to'] = _frame('reply_to', [tweet_ids[rp], replies[rp]], hash_columns(tweet_ids[rp], replies[rp]),
+                                _tweet_keys(replies[rp]))
+
+    md = (df['midia_url'] != '').to_numpy()
+    url = df['midia_url'][md]
+    frames['midias'] = _frame('midias', [url, df['midia_tipo'][md], _to_integer(df['tamanho'][md])], hash_columns(url))
+    frames['possui_midia'] = _frame('possui_midia', [tweet_ids[md], url], hash_columns(tweet_ids[md], url))
+
+    # Uma linha por (tweet, hashtag), com as tags separadas por ';' e sem espaços nas pontas.
+    tags = df['hashtags_extraidas'].str.split(';').explode().str.strip()
+    tags = tags[tags.notna() & (tags != '')]
+    tag_tweets = tweet_ids.loc[tags.index]
+    frames['hashtags'] = _frame('hashtags', [tags], hash_columns(tags))
+    frames['possui_hashtag'] = _frame('possui_hashtag', [tag_tweets, tags], hash_columns(tag_tweets, tags))
+
+    sb = (df['assunto_nome'] != '').to_numpy()
+    subject = df['assunto_nome'][sb]
+    frames['assuntos'] = _frame('assuntos', [subject, df['tema_pai'][sb]], hash_columns(subject))
+    frames['sobre'] = _frame('sobre', [tweet_ids[sb], subject], hash_columns(tweet_ids[sb], subject))
+
+    multiline = _has_line_breaks(df['texto'], df['comentario'])
+    return frames, int((~valid).sum()), multiline
+
+
+def _transform_follower_chunk(df):
+    """Converte um pedaço do CSV de seguidores nas linhas candidatas de SEGUE."""
+    follower, followed = df['seguidor_id'], df['seguido_id']
+    frame = _frame('segue', [follower, followed, _to_datetime(df['desde'])], hash_columns(follower, followed))
+    frame['_start'] = hash_columns(follower)
+    frame['_end'] = hash_columns(followed)
+    return {'segue': frame}, 0, False
+
+
+# --- Deduplicação ---
+
+class KeySet:
+    """
+    Conjunto de chaves uint64 guardado em vetores ordenados do NumPy: um principal e alguns
+    recentes, fundidos quando crescem (custo amortizado baixo e ~8 bytes por chave, bem menos
+    que um set do Python). As buscas são por busca binária em cada vetor.
+    """
+
+    MAX_RUNS = 16
+
+    def __init__(self):
+        self._runs = [np.empty(0, dtype=np.uint64)]
+
+    def __len__(self):
+        return sum(len(run) for run in self._runs)
+
+    def contains(self, keys):
+        """Máscara das chaves que já estão no conjunto."""
+        found = np.zeros(len(keys), dtype=bool)
+        for run in self._runs:
+            if len(run):
+                positions = np.minimum(np.searchsorted(run, keys), len(run) - 1)
+                found |= run[positions] == keys
+        return found
+
+    def add_new(self, keys):
+        """
+        Adiciona as chaves e retorna a máscara das que entraram agora: a primeira ocorrência
+        de cada chave que ainda não estava no conjunto (inclusive entre repetidas no próprio vetor).
+        """
+        new = np.zeros(len(keys), dtype=bool)
+        new[np.unique(keys, return_index=True)[1]] = True
+        new &= ~self.contains(keys)
+        if new.any():
+            self._runs.append(np.sort(keys[new]))
+            main = len(self._runs[0])
+            recent = len(self) - main
+            if len(self._runs) > self.MAX_RUNS or recent > max(main // 4, 1 << 20):
+                self._runs = [np.sort(np.concatenate(self._runs))]
+        return new
+
+
+# --- Saída ---
+
+class _CsvOutput:
+    """Arquivo de saída com o cabeçalho tipado na primeira linha; acumula o número de linhas."""
+
+    def __init__(self, path, header):
+        self.path = path
+        self.rows = 0
+        self._file = open(path, 'w', encoding='utf-8', newline='')
+        self._file.write(','.join(header) + '\n')
+
+    def write(self, frame):
+        if len(frame):
+            frame.to_csv(self._file, header=False, index=False, lineterminator='\n')
+            self.rows += len(frame)
+
+    def close(self):
+        self._file.close()
+
+
+def _transformed(chunks, transform, workers):
+    """
+    Aplica `transform` aos pedaços em `workers` processos, entregando os resultados na ordem
+    de leitura (a primeira ocorrência de cada ID é a mesma da execução sequencial). No máximo
+    2 pedaços por worker ficam em memória ao mesmo tempo.
+    """
+    if workers <= 1:
+        for chunk in chunks:
+            yield transform(chunk)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(transform, chunk))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def import_command(output_dir, paths, database=DEFAULT_DATABASE, multiline=False):
+    """Monta a linha de comando do neo4j-admin para importar os arquivos gerados."""
+    parts = [f"neo4j-admin database import full {shlex.quote(database)} --overwrite-destination"]
+    if multiline:
+        parts.append('--multiline-fields=true')
+    for name, (label, _) in NODE_FILES.items():
+        parts.append(f"--nodes={label}={shlex.quote(os.path.abspath(paths[name]))}")
+    for name, (rel_type, _) in RELATIONSHIP_FILES.items():
+        parts.append(f"--relationships={rel_type}={shlex.quote(os.path.abspath(paths[name]))}")
+    return ' \\\n  '.join(parts)
+
+
+def generate_import_files(tweets_path, followers_path, output_dir=DEFAULT_OUTPUT_DIR, workers=None,
+                          chunksize=DEFAULT_CHUNK_SIZE, csv_engine=None, database=DEFAULT_DATABASE):
+    """
+    Converte os CSVs de tweets e seguidores nos arquivos de nós e relações do importador
+    offline, em `output_dir`, e grava ali o comando de importação (import.sh).
+    `workers` processos convertem os pedaços em paralelo (padrão: um por CPU).
+    Retorna um relatório com as linhas escritas, repetidas e descartadas por arquivo.
+    """
+    workers = workers or os.cpu_count() or 1
+    os.makedirs(output_dir, exist_ok=True)
+    paths = {name: os.path.join(output_dir, f"{name}.csv") for name in [*NODE_FILES, *RELATIONSHIP_FILES]}
+    outputs = {name: _CsvOutput(path, {**NODE_FILES, **RELATIONSHIP_FILES}[name][1]) for name, path in paths.items()}
+    keysets = {name: KeySet() for name in paths}
+    spill_paths = {name: os.path.join(output_dir, f".{name}.pendentes.pickle") for name in DEFERRED}
+    report = {'duplicadas': dict.fromkeys(paths, 0), 'sem_no': dict.fromkeys(paths, 0),
+              'linhas_invalidas': 0, 'multilinha': False}
+    start = time.perf_counter()
+
+    def consume(results):
+        for frames, invalid, multiline in results:
+            report['linhas_invalidas'] += invalid
+            report['multilinha'] = report['multilinha'] or multiline
+            for name, frame in frames.items():
+                if name in spills:
+                    pickle.dump(frame, spills[name], protocol=pickle.HIGHEST_PROTOCOL)
+                    continue
+                if name == 'segue':
+                    exists = (keysets['usuarios'].contains(frame.pop('_start').to_numpy())
+                              & keysets['usuarios'].contains(frame.pop('_end').to_numpy()))
+                    report['sem_no'][name] += int((~exists).sum())
+                    frame = frame[exists]
+                _write_new(name, frame)
+
+    def _write_new(name, frame):
+        new = keysets[name].add_new(frame.pop('_key').to_numpy())
+        report['duplicadas'][name] += int((~new).sum())
+        outputs[name].write(frame[new])
+
+    try:
+        print(f"INFO: Convertendo '{tweets_path}' com {workers} processo(s)...")
+        spills = {name: open(path, 'wb') for name, path in spill_paths.items()}
+        try:
+            consume(_transformed(_counted_chunks(tweets_path, chunksize, csv_engine), _transform_tweet_chunk, workers))
+        finally:
+            for spill in spills.values():
+                spill.close()
+        spills = {}
+
+        # Todos os tweets já são conhecidos: filtra retweets e replies para tweets inexistentes.
+        for name, path in spill_paths.items():
+            with open(path, 'rb') as spill:
+                while True:
+                    try:
+                        frame = pickle.load(spill)
+                    except EOFError:
+                        break
+                    exists = keysets['tweets'].contains(frame.pop('_end').to_numpy())
+                    report['sem_no'][name] += int((~exists).sum())
+                    _write_new(name, frame[exists])
+
+        try:
+            print(f"INFO: Convertendo '{followers_path}'...")
+            consume(_transformed(_counted_chunks(followers_path, chunksize, csv_engine), _transform_follower_chunk,
+                                 workers))
+        except FileNotFoundError:
+            print(f"AVISO: Arquivo de seguidores não encontrado em '{followers_path}'. SEGUE ficará vazio.")
+    finally:
+        for output in outputs.values():
+            output.close()
+        for path in spill_paths.values():
+            if os.path.exists(path):
+                os.remove(path)
+
+    command = import_command(output_dir, paths, database, report['multilinha'])
+    script_path = os.path.join(output_dir, 'import.sh')
+    with open(script_path, 'w', encoding='utf-8') as f:
+        f.write("#!/bin/sh\n# Rode com o Neo4j parado: o banco de destino é recriado do zero.\n")
+        f.write(command + "\n")
+    os.chmod(script_path, 0o755)
+
+    report.update({
+        'seconds': round(time.perf_counter() - start, 2),
+        'linhas': {name: output.rows for name, output in outputs.items()},
+        'arquivos': paths,
+        'script': script_path,
+        'comando': command,
+    })
+    return report
+
+
+def _counted_chunks(path, chunksize, csv_engine):
+    for chunk in dataset_loader.iter_csv_chunks(path, chunksize=chunksize, dtype=str, fillna='', engine=csv_engine):
+        metrics.increment('pipeline_rows_total', len(chunk), stage='bulk_import')
+        yield chunk
+
+
+def print_report(report):
+    """Imprime as linhas escritas, repetidas e descartadas de cada arquivo e o comando de importação."""
+    print(f"\nArquivos para o importador offline gerados em {report['seconds']}s:")
+    for name, rows in report['linhas'].items():
+        line = f"  {name:<16} {rows:>12} linhas"
+        if report['duplicadas'][name]:
+            line += f" | {report['duplicadas'][name]} repetidas"
+        if report['sem_no'][name]:
+            line += f" | {report['sem_no'][name]} sem nó de origem/destino"
+        print(line)
+    if report['linhas_invalidas']:
+        print(f"AVISO: {report['linhas_invalidas']} linhas de tweets sem tweet_id numérico foram ignoradas.")
+    print(f"\nPara importar (com o Neo4j parado), rode {report['script']}:\n{report['comando']}")
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description="Gera os arquivos do neo4j-admin import a partir dos CSVs.")
+    parser.add_argument('--tweets', required=True, help="CSV de tweets.")
+    parser.add_argument('--followers', required=True, help="CSV de seguidores.")
+    parser.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR,
+                        help=f"Pasta dos arquivos gerados (padrão: {DEFAULT_OUTPUT_DIR}).")
+    parser.add_argument('--workers', type=int, default=None, help="Processos de conversão (padrão: um por CPU).")
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"Linhas lidas por pedaço (padrão: {DEFAULT_CHUNK_SIZE}).")
+    parser.add_argument('--csv-engine', choices=['c', 'pyarrow'], default=None)
+    parser.add_argument('--database', default=DEFAULT_DATABASE, help="Banco de destino do import.")
+    args = parser.parse_args()
+    print_report(generate_import_files(args.tweets, args.followers, args.output_dir, args.workers, args.chunksize,
+                                       args.csv_engine, args.database))
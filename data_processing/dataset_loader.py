@@ -4,6 +4,119 @@ import pandas as pd
 from config import settings # Importa as configurações (que incluem o caminho absoluto)
 import os
 
+# Número padrão de linhas por pedaço na leitura em streaming.
+DEFAULT_CHUNK_SIZE = 50_000
+
+# Codificações tentadas, em ordem, na leitura dos CSVs.
+ENCODINGS = ('utf-8', 'latin1')
+
+def _read_chunks_pandas(file_path, encoding, chunksize, dtype):
+    """Lê o CSV em pedaços com o parser C do pandas."""
+    with pd.read_csv(file_path, encoding=encoding, chunksize=chunksize, dtype=dtype, low_memory=False) as reader:
+        for chunk in reader:
+            yield chunk
+
+def _read_chunks_pyarrow(file_path, encoding, chunksize, dtype):
+    """
+    Lê o CSV em blocos com o leitor em streaming do pyarrow (multithread) e reagrupa
+    os blocos em DataFrames de `chunksize` linhas.
+    """
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+
+    convert_options = None
+    if dtype is str:
+        # Equivalente a dtype=str do pandas: todas as colunas como texto; campos vazios viram nulos.
+        columns = pd.read_csv(file_path, encoding=encoding, nrows=0).columns
+        convert_options = pa_csv.ConvertOptions(column_types={column: pa.string() for column in columns},
+                                                strings_can_be_null=True)
+    try:
+        reader = pa_csv.open_csv(file_path, read_options=pa_csv.ReadOptions(encoding=encoding),
+                                 convert_options=convert_options)
+        pending = []
+        pending_rows = 0
+        for record_batch in reader:
+            pending.append(record_batch)
+            pending_rows += record_batch.num_rows
+            while pending_rows >= chunksize:
+                table = pa.Table.from_batches(pending)
+                yield table.slice(0, chunksize).to_pandas()
+                rest = table.slice(chunksize)
+                pending = rest.to_batches()
+                pending_rows = rest.num_rows
+        if pending_rows:
+            yield pa.Table.from_batches(pending).to_pandas()
+    except pa.ArrowInvalid as e:
+        # O pyarrow valida UTF-8 ao converter texto; tratamos como falha de decodificação
+        # para que o fallback de codificação funcione igual ao do pandas.
+        if 'utf8' in str(e).lower():
+            raise UnicodeDecodeError(encoding, b'', 0, 1, str(e))
+        raise
+
+def _resolve_engine(engine):
+    """Retorna o leitor de pedaços para o engine pedido, caindo para o pandas se o pyarrow não existir."""
+    if engine == 'pyarrow':
+        try:
+            import pyarrow.csv # noqa: F401
+            return _read_chunks_pyarrow
+        except ImportError:
+            print("AVISO: pyarrow não está instalado. Usando o parser padrão do pandas.")
+    elif engine not in (None, 'c'):
+        raise ValueError(f"Engine de leitura desconhecido: {engine}")
+    return _read_chunks_pandas
+
+def iter_csv_chunks(file_path, chunksize=DEFAULT_CHUNK_SIZE, as_records=False, dtype=None, fillna=None, engine=None):
+    """
+    Lê um CSV em pedaços de no máximo `chunksize` linhas, mantendo apenas um pedaço em memória.
+
+    - as_records: se True, cada pedaço é entregue como lista de dicionários; senão, como DataFrame.
+    - dtype / fillna: repassados ao pandas (ex: dtype=str, fillna='' como em 1_populate_graph.py).
+      Sem dtype, os tipos são inferidos por pedaço e podem variar entre pedaços.
+    - engine: None/'c' (pandas) ou 'pyarrow' (mais rápido, opcional). A inferência de tipos
+      difere entre os engines; com dtype=str o resultado é o mesmo.
+
+    Tenta UTF-8 e, se a decodificação falhar, recomeça com latin1 descartando as linhas
+    que já foram entregues, de modo que nenhuma linha é repetida.
+    Levanta FileNotFoundError se o arquivo não existir.
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(file_path)
+    read_chunks = _resolve_engine(engine)
+
+    rows_emitted = 0
+    for encoding in ENCODINGS:
+        rows_to_skip = rows_emitted
+        try:
+            for chunk in read_chunks(file_path, encoding, chunksize, dtype):
+                if rows_to_skip:
+                    skipped = min(rows_to_skip, len(chunk))
+                    chunk = chunk.iloc[skipped:]
+                    rows_to_skip -= skipped
+                    if chunk.empty:
+                        continue
+                if fillna is not None:
+                    chunk = chunk.fillna(fillna)
+                rows_emitted += len(chunk)
+                yield chunk.to_dict('records') if as_records else chunk
+            return
+        except UnicodeDecodeError:
+            if encoding == ENCODINGS[-1]:
+                raise
+            print(f"AVISO: Falha ao decodificar {file_path} com {encoding} após {rows_emitted} linhas. "
+                  f"Tentando com {ENCODINGS[ENCODINGS.index(encoding) + 1]}...")
+
+def iter_tweets_from_file(chunksize=DEFAULT_CHUNK_SIZE, engine=None):
+    """
+    Versão em streaming de load_tweets_from_file(): entrega os registros do dataset
+    configurado em lotes de dicionários, sem carregar o arquivo inteiro em memória.
+    """
+    full_dataset_path = settings.ABSOLUTE_DATASET_FILE_PATH
+    if not full_dataset_path or not os.path.exists(full_dataset_path):
+        print(f"ERRO: Arquivo do dataset não encontrado ou caminho não configurado. Verificado: '{full_dataset_path}'")
+        return
+    print(f"INFO: Lendo dataset em pedaços de {chunksize} linhas: {full_dataset_path}")
+    yield from iter_csv_chunks(full_dataset_path, chunksize=chunksize, as_records=True, engine=engine)
+
 def load_tweets_from_file():
     """
     Carrega tweets de um arquivo de dataset (ex: CSV) especificado nas configurações.
@@ -45,9 +158,8 @@ def load_tweets_from_file():
     
     # Retorna uma lista de dicionários, onde cada dicionário representa uma linha do CSV
     # Isso facilita o processamento iterativo posterior
-    # Se o dataset for MUITO grande, considere processar em chunks ou retornar o DataFrame
-    # e iterar com df.iterrows() ou df.itertuples() no main.py
-    # Por agora, converter para dicts é bom para datasets de tamanho moderado.
+    # Para datasets MUITO grandes, use iter_tweets_from_file() / iter_csv_chunks(),
+    # que entregam o arquivo em pedaços com uso de memória constante.
     if df.empty:
         print("AVISO: O dataset carregado está vazio.")
         return []
@@ -0,0 +1,272 @@
+# analise_tweets_neo4j/data_processing/feed_tailer.py
+# Leitura contínua de um feed de tweets: arquivos CSV/JSONL que chegam em um diretório ao
+# longo do dia, ou um arquivo que só cresce (append-only). Cada arquivo é lido a partir do
+# byte em que a leitura anterior parou, só até o fim do último registro completo, e as
+# posições ficam em um SQLite local (OffsetStore).
+#
+# A posição só é gravada (commit) depois que os registros lidos até ela chegaram ao grafo.
+# Uma queda entre a escrita e o commit faz o último lote ser relido, e como as escritas são
+# MERGE pela chave, reenviá-lo não altera o grafo: cada linha do feed tem efeito uma única vez.
+#
+# No CSV, um registro termina numa quebra de linha fora de aspas, então textos com quebras de
+# linha entre aspas (comuns nos tweets) não são cortados ao meio. Aspas e quebras de linha
+# são bytes ASCII, que nunca aparecem dentro de um caractere UTF-8 multibyte, por isso as
+# fronteiras são procuradas direto nos bytes e as posições são offsets em bytes.
+
+import csv
+import fnmatch
+import io
+import json
+import os
+import sqlite3
+import time
+
+from data_processing import dataset_loader
+
+DEFAULT_OFFSETS_PATH = os.path.join('data', '.stream_offsets.sqlite')
+
+# Arquivos considerados ao observar um diretório.
+DEFAULT_PATTERNS = ('*.csv', '*.jsonl')
+
+# Bytes lidos por arquivo a cada leitura (dobra enquanto um único registro não couber).
+DEFAULT_READ_BYTES = 1024 * 1024
+
+# Um último registro sem quebra de linha só é aceito quando o arquivo está parado há este
+# tempo (s): antes disso, ele pode estar no meio da escrita.
+DEFAULT_SETTLE_SECONDS = 10.0
+
+UTF8_BOM = b'\xef\xbb\xbf'
+
+
+class OffsetStore:
+    """
+    Posições de leitura persistidas em SQLite: por arquivo, o inode, o offset (em bytes)
+    até onde os registros já foram gravados no grafo e o cabeçalho, no caso do CSV.
+    """
+
+    def __init__(self, path=DEFAULT_OFFSETS_PATH):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS offsets ("
+            "  source TEXT PRIMARY KEY,"
+            "  inode INTEGER NOT NULL,"
+            "  byte_offset INTEGER NOT NULL,"
+            "  header TEXT"
+            ")"
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def get(self, source):
+        """(inode, offset, cabeçalho) registrados para o arquivo, ou None."""
+        row = self._conn.execute("SELECT inode, byte_offset, header FROM offsets WHERE source = ?",
+                                 (source,)).fetchone()
+        if row is None:
+            return None
+        return row[0], row[1], json.loads(row[2]) if row[2] else None
+
+    def save(self, positions):
+        """Grava as posições {arquivo: (inode, offset, cabeçalho)} em uma única transação."""
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO offsets (source, inode, byte_offset, header) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (source) DO UPDATE SET inode = excluded.inode, "
+                "byte_offset = excluded.byte_offset, header = excluded.header",
+                ((source, inode, offset, json.dumps(header) if header else None)
+                 for source, (inode, offset, header) in positions.items()),
+            )
+
+    def close(self):
+        self._conn.close()
+
+
+def _decode(data):
+    for encoding in dataset_loader.ENCODINGS:
+        try:
+            return data.decode(encoding)
+        except UnicodeDecodeError:
+            if encoding == dataset_loader.ENCODINGS[-1]:
+                raise
+
+
+def _record_ends(block, is_csv, limit):
+    """
+    Offsets (relativos a `block`) do fim de cada registro completo, até `limit` registros.
+    No CSV, uma quebra de linha só fecha o registro se o número de aspas até ali for par.
+    """
+    ends = []
+    quotes = 0
+    position = 0
+    while len(ends) < limit:
+        newline = block.find(b'\n', position)
+        if newline < 0:
+            break
+        if is_csv:
+            quotes += block.count(b'"', position, newline)
+        position = newline + 1
+        if quotes % 2 == 0:
+            ends.append(position)
+    return ends
+
+
+def _is_complete_tail(data, is_csv):
+    """Um último registro sem quebra de linha parece completo? (aspas fechadas / JSON válido)"""
+    if is_csv:
+        return data.count(b'"') % 2 == 0
+    try:
+        json.loads(_decode(data))
+    except ValueError:
+        return False
+    return True
+
+
+def _parse_csv(data, header):
+    """Registros (dicionários) de um trecho de CSV; campos vazios viram None, como NaN no pandas."""
+    records = []
+    for values in csv.reader(io.StringIO(_decode(data), newline='')):
+        if not values:
+            continue
+        records.append({column: (value if value != '' else None) for column, value in zip(header, values)})
+    return records
+
+
+def _parse_jsonl(data, source):
+    records = []
+    for line in _decode(data).splitlines():
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            print(f"AVISO: Linha JSON inválida em '{source}' ignorada: {e}")
+            continue
+        if isinstance(record, dict):
+            records.append(record)
+        else:
+            print(f"AVISO: Linha JSON de '{source}' não é um objeto; ignorada.")
+    return records
+
+
+class FeedTailer:
+    """
+    Lê os registros novos de um conjunto de fontes: diretórios (os arquivos que casam com
+    `patterns`, do mais antigo para o mais novo) e/ou arquivos avulsos.
+
+    read() avança as posições apenas em memória; commit() as grava no OffsetStore. Quem
+    usa o tailer deve chamar commit() só depois de gravar no grafo tudo o que foi lido.
+    Arquivos substituídos (outro inode) ou truncados são relidos do início.
+    """
+
+    def __init__(self, sources, store, patterns=DEFAULT_PATTERNS, read_bytes=DEFAULT_READ_BYTES,
+                 settle_seconds=DEFAULT_SETTLE_SECONDS):
+        self.sources = [os.path.abspath(source) for source in sources]
+        self.store = store
+        self.patterns = patterns
+        self.read_bytes = read_bytes
+        self.settle_seconds = settle_seconds
+        self._positions = {}   # arquivo -> (inode, offset, cabeçalho) após a última leitura
+        self._uncommitted = set()
+
+    def files(self):
+        """Arquivos observados, em ordem de chegada (data de modificação, depois nome)."""
+        found = []
+        for source in self.sources:
+            if os.path.isdir(source):
+                for name in os.listdir(source):
+                    path = os.path.join(source, name)
+                    if os.path.isfile(path) and any(fnmatch.fnmatch(name, pattern) for pattern in self.patterns):
+                        found.append(path)
+            elif os.path.isfile(source):
+                found.append(source)
+        stamps = {}
+        for path in found:
+            try:
+                stamps[path] = os.stat(path).st_mtime
+            except FileNotFoundError:
+                continue
+        return sorted(stamps, key=lambda path: (stamps[path], path))
+
+    @property
+    def has_uncommitted(self):
+        return bool(self._uncommitted)
+
+    def _position(self, path, stat):
+        position = self._positions.get(path)
+        if position is None:
+            position = self.store.get(path) or (stat.st_ino, 0, None)
+        inode, offset, header = position
+        if inode != stat.st_ino or stat.st_size < offset:
+            print(f"AVISO: '{path}' foi substituído ou truncado. Relendo do início.")
+            return stat.st_ino, 0, None
+        return position
+
+    def read(self, max_records):
+        """
+        Até `max_records` registros novos (dicionários coluna -> valor), na ordem dos arquivos.
+        Retorna uma lista vazia se não houver registros completos novos.
+        """
+        records = []
+        for path in self.files():
+            if len(records) >= max_records:
+                break
+            try:
+                records.extend(self._read_file(path, max_records - len(records)))
+            except FileNotFoundError:
+                continue
+        return records
+
+    def _read_file(self, path, limit):
+        stat = os.stat(path)
+        inode, offset, header = self._position(path, stat)
+        if offset >= stat.st_size:
+            return []
+        is_csv = not path.endswith(('.jsonl', '.json'))
+        settled = time.time() - stat.st_mtime >= self.settle_seconds
+
+        size = self.read_bytes
+        with open(path, 'rb') as f:
+            while True:
+                f.seek(offset)
+                block = f.read(size)
+                at_eof = offset + len(block) >= stat.st_size
+                skip = len(UTF8_BOM) if offset == 0 and block.startswith(UTF8_BOM) else 0
+                body = block[skip:]
+                # O cabeçalho do CSV conta como um registro a mais na primeira leitura.
+                needs_header = is_csv and header is None
+                ends = _record_ends(body, is_csv, limit + needs_header)
+                tail_start = ends[-1] if ends else 0
+                if (at_eof and settled and len(ends) < limit + needs_header and tail_start < len(body)
+                        and _is_complete_tail(body[tail_start:], is_csv)):
+                    ends.append(len(body))
+                if ends or at_eof:
+                    break
+                size *= 2
+
+        if not ends:
+            return []
+        start = 0
+        if needs_header:
+            header = next(csv.reader(io.StringIO(_decode(body[:ends[0]]), newline='')), None) or []
+            start = ends[0]
+        data = body[start:ends[-1]]
+        new_offset = offset + skip + ends[-1]
+        self._positions[path] = (inode, new_offset, header)
+        self._uncommitted.add(path)
+        if not data:
+            return []
+        return _parse_csv(data, header) if is_csv else _parse_jsonl(data, path)
+
+    def commit(self):
+        """Grava no OffsetStore as posições de tudo o que foi lido até agora."""
+        if not self._uncommitted:
+            return
+        self.store.save({path: self._positions[path] for path in self._uncommitted})
+        self._uncommitted.clear()
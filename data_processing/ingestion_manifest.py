@@ -0,0 +1,101 @@
+# analise_tweets_neo4j/data_processing/ingestion_manifest.py
+# Manifesto local da carga incremental: guarda, por arquivo de origem, a chave de cada linha
+# já enviada ao Neo4j e o hash do seu conteúdo. Assim uma nova execução envia apenas as
+# linhas novas ou alteradas, em vez de apagar e recarregar o banco inteiro.
+
+import os
+import sqlite3
+
+import pandas as pd
+
+DEFAULT_MANIFEST_PATH = os.path.join('data', '.ingestion_manifest.sqlite')
+
+
+def row_keys(df, key_columns):
+    """Monta a chave de cada linha a partir de uma ou mais colunas (ex: seguidor_id|seguido_id)."""
+    keys = df[key_columns[0]].astype(str)
+    for column in key_columns[1:]:
+        keys = keys + '|' + df[column].astype(str)
+    return keys
+
+
+def content_hashes(df):
+    """
+    Hash (inteiro de 64 bits) do conteúdo de cada linha, calculado de forma vetorizada.
+    O hash do pandas usa uma chave fixa, então é estável entre execuções.
+    """
+    return pd.util.hash_pandas_object(df, index=False).astype('int64')
+
+
+class IngestionManifest:
+    """
+    Manifesto persistido em SQLite (um arquivo local, sem servidor).
+    Uso típico por pedaço do CSV: `changed_mask()` para filtrar, escrever no banco,
+    e só então `record()` + `commit()`, de modo que uma falha no meio da carga faz a
+    próxima execução reenviar as linhas que não chegaram ao grafo.
+    """
+
+    def __init__(self, path=DEFAULT_MANIFEST_PATH):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS manifest ("
+            "  source TEXT NOT NULL,"
+            "  row_key TEXT NOT NULL,"
+            "  content_hash INTEGER NOT NULL,"
+            "  PRIMARY KEY (source, row_key)"
+            ") WITHOUT ROWID"
+        )
+        self._conn.execute("CREATE TEMP TABLE IF NOT EXISTS chunk_keys (row_key TEXT PRIMARY KEY)")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def changed_mask(self, source, keys, hashes):
+        """
+        Retorna uma Series booleana (alinhada a `keys`) que é True para as linhas novas
+        ou cujo hash difere do registrado no manifesto.
+        """
+        self._conn.execute("DELETE FROM chunk_keys")
+        self._conn.executemany("INSERT OR IGNORE INTO chunk_keys VALUES (?)", ((key,) for key in keys))
+        known = dict(self._conn.execute(
+            "SELECT c.row_key, m.content_hash FROM chunk_keys c "
+            "JOIN manifest m ON m.source = ? AND m.row_key = c.row_key",
+            (source,),
+        ))
+        # Comparação em Python: um map() do pandas com chaves ausentes viraria float e
+        # perderia precisão em hashes de 64 bits.
+        return pd.Series([known.get(key) != content_hash for key, content_hash in zip(keys, hashes)],
+                         index=keys.index, dtype=bool)
+
+    def record(self, source, keys, hashes):
+        """Registra (ou atualiza) as linhas enviadas. Só vale após commit()."""
+        self._conn.executemany(
+            "INSERT INTO manifest (source, row_key, content_hash) VALUES (?, ?, ?) "
+            "ON CONFLICT (source, row_key) DO UPDATE SET content_hash = excluded.content_hash",
+            ((source, key, content_hash) for key, content_hash in zip(keys.tolist(), hashes.tolist())),
+        )
+
+    def commit(self):
+        self._conn.commit()
+
+    def clear(self, source=None):
+        """Esquece todas as linhas (ou só as de `source`), ex: antes de uma carga completa."""
+        if source is None:
+            self._conn.execute("DELETE FROM manifest")
+        else:
+            self._conn.execute("DELETE FROM manifest WHERE source = ?", (source,))
+        self._conn.commit()
+
+    def count(self, source):
+        """Número de linhas registradas para uma origem."""
+        return self._conn.execute("SELECT count(*) FROM manifest WHERE source = ?", (source,)).fetchone()[0]
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,148 @@
+# analise_tweets_neo4j/data_processing/mention_resolver.py
+# Resolve @menções para IDs de usuário no cliente. O índice handle -> usuario_id é montado a
+# partir da coluna `handle` do dataset (numa passada prévia só pelas duas colunas, ou à medida
+# que os tweets são carregados), e cada menção extraída por extract_mentions_from_text vira
+# uma consulta O(1) num dicionário. Assim a escrita das menções só usa o userId (índice
+# único) em vez de MERGE por username, que não tem índice e varre todos os :User.
+#
+# Handles são comparados sem '@' e sem diferenciar maiúsculas (como no Twitter). Menções a
+# handles fora do índice ficam sem 'id': o graph_builder procura então um autor já gravado
+# com o mesmo handle normalizado (User.usernameKey) e, só se não houver, cria o nó "só menção"
+# do handle (ver mention_only_id). Um handle com mais de um ID resolve para o menor deles,
+# aqui e no grafo, para que os dois caminhos liguem a menção ao mesmo usuário.
+
+import sys
+
+import pandas as pd
+
+from data_processing import dataset_loader
+
+# Prefixo do userId dos usuários que só aparecem mencionados.
+MENTION_ONLY_PREFIX = 'mencao:'
+
+
+def normalize_handle(handle):
+    """Forma usada no índice: sem '@' e sem espaços nas pontas, em minúsculas."""
+    return str(handle).strip().lstrip('@').lower()
+
+
+def mention_only_id(username):
+    """userId estável de um handle que não pertence a nenhum usuário conhecido."""
+    return MENTION_ONLY_PREFIX + normalize_handle(username)
+
+
+class MentionResolver:
+    """
+    Índice em memória handle -> usuario_id. Se um handle aparece com mais de um ID, vale o
+    menor (independe da ordem de leitura e coincide com o min() da query de menções); esses
+    handles ficam em `ambiguous` para o relatório. As strings são internadas, então IDs
+    repetidos em milhares de linhas ocupam memória uma vez só.
+    """
+
+    def __init__(self):
+        self._ids = {}
+        self.ambiguous = {}   # handle -> conjunto de IDs, só para handles com mais de um ID
+        self.resolved = 0
+        self.unresolved = 0
+        self.ambiguous_mentions = 0
+
+    def __len__(self):
+        return len(self._ids)
+
+    def add(self, handle, user_id):
+        """Registra um par (handle, usuario_id); valores vazios são ignorados."""
+        if handle is None or user_id is None or pd.isna(handle) or pd.isna(user_id):
+            return
+        key = normalize_handle(handle)
+        if not key or not str(user_id):
+            return
+        user_id = str(user_id)
+        current = self._ids.get(key)
+        if current is None:
+            self._ids[sys.intern(key)] = sys.intern(user_id)
+        elif current != user_id:
+            self.ambiguous.setdefault(key, {current}).add(user_id)
+            if user_id < current:
+                self._ids[key] = sys.intern(user_id)
+
+    def add_columns(self, handles, user_ids):
+        """Registra os pares de duas colunas (ex: df['handle'], df['usuario_id']), um por usuário distinto."""
+        pairs = pd.DataFrame({'handle': handles, 'id': user_ids}).dropna().drop_duplicates()
+        for handle, user_id in zip(pairs['handle'], pairs['id']):
+            self.add(handle, user_id)
+
+    def add_tweet(self, tweet_data):
+        """Registra o autor de um tweet mapeado (author_username -> author_id)."""
+        self.add(tweet_data.get('author_username'), tweet_data.get('author_id'))
+
+    def resolve(self, username):
+        """usuario_id do handle mencionado, ou None se ele não está no índice."""
+        return self._ids.get(normalize_handle(username))
+
+    def resolve_mentions(self, tweet_data):
+        """
+        Preenche o 'id' de cada menção do tweet mapeado com o usuario_id do handle, ou None
+        quando o handle não está no índice (a busca continua no grafo, pelo username).
+        Retorna o próprio tweet_data.
+        """
+        for mention in tweet_data.get('mentions') or []:
+            if not mention.get('username'):
+                continue
+            user_id = self.resolve(mention['username'])
+            if user_id is None:
+                self.unresolved += 1
+                mention['id'] = None
+            else:
+                self.resolved += 1
+                if normalize_handle(mention['username']) in self.ambiguous:
+                    self.ambiguous_mentions += 1
+                mention['id'] = user_id
+        return tweet_data
+
+    @property
+    def conflicts(self):
+        """Número de handles com mais de um ID."""
+        return len(self.ambiguous)
+
+    def print_report(self, examples=5):
+        total = self.resolved + self.unresolved
+        rate = 100 * self.resolved / total if total else 0.0
+        print(f"INFO: Menções: {len(self)} handles no índice | {self.resolved}/{total} resolvidas "
+              f"({rate:.1f}%) | {self.unresolved} sem ID no cliente | {self.conflicts} handles com mais de um ID")
+        if self.ambiguous:
+            sample = ', '.join(f"@{handle} ({', '.join(sorted(ids))})"
+                               for handle, ids in sorted(self.ambiguous.items())[:examples])
+            print(f"AVISO: {self.ambiguous_mentions} menções a handles com mais de um ID foram ligadas ao "
+                  f"menor deles. Exemplos: {sample}")
+
+
+def from_csv(file_path, chunksize=dataset_loader.DEFAULT_CHUNK_SIZE, engine=None):
+    """
+    Monta o índice a partir das colunas `handle` e `usuario_id` do CSV de tweets, lendo em
+    pedaços. Com o índice completo antes da carga, menções a usuários que só tuitam mais
+    adiante no arquivo também são resolvidas.
+    """
+    resolver = MentionResolver()
+    for chunk in dataset_loader.iter_csv_chunks(file_path, chunksize=chunksize, dtype=str, engine=engine):
+        resolver.add_columns(chunk['handle'], chunk['usuario_id'])
+    return resolver
+
+
+# Autores já gravados pelo graph_builder (os nós "só menção" não entram no índice).
+KNOWN_USERS_QUERY = """
+MATCH (u:User)
+WHERE u.isMentionOnly IS NULL AND u.username IS NOT NULL
+RETURN u.username AS username, u.userId AS userId
+"""
+
+
+def from_graph(session):
+    """
+    Monta o índice a partir dos :User já gravados no banco. Útil para processos que ficam
+    rodando (ex: stream_ingest.py): depois de reiniciados, as menções a autores vistos antes
+    continuam sendo resolvidas para o mesmo userId.
+    """
+    resolver = MentionResolver()
+    for record in session.run(KNOWN_USERS_QUERY):
+        resolver.add(record['username'], record['userId'])
+    return resolver
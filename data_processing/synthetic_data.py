@@ -0,0 +1,369 @@
+# analise_tweets_neo4j/data_processing/synthetic_data.py
+# Gera CSVs sintéticos com exatamente o mesmo esquema dos arquivos reais do projeto
+# (tweets_neo4j_completos_FINAL.csv e seguidores_para_neo4j_simples.csv), em escalas de
+# 10 mil a 10 milhões de tweets, para medir como a carga e o enriquecimento escalam.
+#
+# A distribuição imita a de redes sociais reais, e não uma distribuição uniforme:
+# - poucos usuários postam muito (atividade com cauda longa);
+# - o número de seguidores segue uma lei de potência, e os usuários populares recebem a maior
+#   parte das arestas SEGUE;
+# - as hashtags seguem uma distribuição de Zipf (algumas muito frequentes, cauda longa de raras);
+# - retweets preferem tweets já muito retweetados, e um retweet pode apontar para outro retweet,
+#   formando cadeias.
+#
+# Os arquivos são gerados em pedaços, então a memória não cresce com o número de linhas
+# (exceto por alguns vetores de um número por usuário/tweet).
+
+import os
+import time
+import numpy as np
+import pandas as pd
+
+# Escalas prontas (número de tweets).
+SCALES = {
+    '10k': 10_000,
+    '100k': 100_000,
+    '1m': 1_000_000,
+    '10m': 10_000_000,
+}
+
+DEFAULT_OUTPUT_DIR = os.path.join('data', 'synthetic')
+DEFAULT_CHUNK_SIZE = 100_000
+
+# Proporções medidas nos arquivos reais (9,4 mil tweets, 6,1 mil usuários, 17 mil arestas).
+USERS_PER_TWEET = 0.65
+FOLLOWS_PER_TWEET = 1.85
+RETWEET_FRACTION = 0.25
+REPLY_FRACTION = 0.19
+MEDIA_FRACTION = 0.27
+# Fração dos retweets que copiam o alvo de um retweet anterior (ligação preferencial).
+RETWEET_COPY_PROBABILITY = 0.7
+RETWEET_BLOCK_SIZE = 1_000
+
+FIRST_TWEET_ID = 500_000
+
+TWEET_COLUMNS = ['tweet_id', 'texto', 'criado_em', 'idioma', 'likes', 'usuario_id', 'handle',
+                 'criado_em_usuario', 'seguidores', 'regiao', 'influente', 'tipo_interacao', 'momento',
+                 'dispositivo', 'comentario', 'retweet_de_id', 'reply_to_id', 'midia_url', 'midia_tipo',
+                 'tamanho', 'hashtags_extraidas', 'posicoes', 'assunto_nome', 'tema_pai']
+FOLLOWER_COLUMNS = ['seguidor_id', 'seguido_id', 'desde']
+
+REGIONS = ['AF', 'BR', 'US', 'EU', 'AS']
+DEVICES = ['Web', 'Android', 'TweetDeck', 'iPhone', 'Mobile']
+DEVICE_WEIGHTS = [0.26, 0.25, 0.24, 0.23, 0.02]
+MEDIA_TYPES = ['gif', 'video', 'image']
+SUBJECTS = [
+    ('Análise de Sentimento', 'Linguagem'),
+    ('Inteligência Artificial', 'Tecnologia'),
+    ('Modelagem de Dados', 'Engenharia'),
+    ('Redes Sociais', 'Comunicação'),
+    ('Plataformas Digitais', 'Internet'),
+    ('Taxação', 'Política'),
+    ('Legalização', 'Social'),
+]
+SUBJECT_WEIGHTS = [0.196, 0.193, 0.193, 0.189, 0.187, 0.021, 0.021]
+# As hashtags mais frequentes do dataset real; a cauda longa é gerada (#Tag1, #Tag2, ...).
+CORE_HASHTAGS = ['#ML', '#Tech', '#AI', '#Neo4j', '#NLP', '#Graph', '#BigData']
+
+# Vocabulário dos textos: palavras neutras misturadas com palavras do léxico do VADER
+# (positivas, negativas, intensificadores e negações), para exercitar todas as regras da análise.
+NEUTRAL_WORDS = (
+    "the a an of to in on for with about from this that these people data graph network model "
+    "users today report news team project study time year week city government market health "
+    "public policy workers students platform company research results analysis update system "
+    "is are was were will would can could should just now still also more most many new"
+).split()
+SENTIMENT_WORDS = (
+    "good great love happy excellent amazing best awesome nice wonderful hope support win "
+    "bad terrible hate sad worst awful angry problem crisis fail wrong fear struggling absurd"
+).split()
+MODIFIER_WORDS = "very really extremely not never don't isn't but kind of".split()
+EMPHASIS_WORDS = ["GREAT", "LOVE", "BAD", "WORST", "AMAZING", "HATE"]
+VOCABULARY = NEUTRAL_WORDS + SENTIMENT_WORDS + MODIFIER_WORDS + EMPHASIS_WORDS
+VOCABULARY_WEIGHTS = ([6.0] * len(NEUTRAL_WORDS) + [2.0] * len(SENTIMENT_WORDS)
+                      + [1.5] * len(MODIFIER_WORDS) + [0.3] * len(EMPHASIS_WORDS))
+
+TEXT_MIN_WORDS = 6
+TEXT_MAX_WORDS = 30
+MENTION_FRACTION = 0.03
+URL_FRACTION = 0.06
+
+
+def zipf_weights(count, exponent):
+    """Pesos normalizados proporcionais a 1 / posição^exponent (posição 1 = mais frequente)."""
+    weights = 1.0 / np.arange(1, count + 1, dtype=np.float64) ** exponent
+    return weights / weights.sum()
+
+
+def _sampler(weights, rng):
+    """Retorna uma função size -> índices sorteados com os pesos dados (busca binária na acumulada)."""
+    cdf = np.cumsum(weights)
+    cdf /= cdf[-1]
+    return lambda size: np.minimum(np.searchsorted(cdf, rng.random(size), side='right'), len(cdf) - 1)
+
+
+def _dates(rng, size, start, end):
+    """Datas (texto AAAA-MM-DD) sorteadas uniformemente entre `start` e `end`."""
+    start = np.datetime64(start, 'D')
+    days = (np.datetime64(end, 'D') - start).astype(np.int64)
+    return (start + rng.integers(0, days, size)).astype(str).astype(object)
+
+
+class _Users:
+    """Atributos fixos de cada usuário, sorteados uma vez para que se repitam em todos os seus tweets."""
+
+    def __init__(self, count, rng):
+        self.count = count
+        # Ordem aleatória para que o usuário mais ativo não seja sempre user_0.
+        activity_rank = rng.permutation(count)
+        self.pick_author = _sampler(zipf_weights(count, 0.8)[activity_rank], rng)
+        # Seguidores com cauda pesada (Pareto); a popularidade no grafo SEGUE é proporcional a ela.
+        self.followers = np.minimum((rng.pareto(1.2, count) + 1) * 2_000, 15_000_000).astype(np.int64)
+        self.pick_followed = _sampler(self.followers.astype(np.float64), rng)
+        self.created = _dates(rng, count, '2015-01-01', '2024-01-01')
+        self.region = rng.integers(0, len(REGIONS), count)
+        self.influential = rng.random(count) < 0.77
+
+    def ids(self, indexes):
+        return np.char.add('user_', indexes.astype(str)).astype(object)
+
+
+class _HashtagPool:
+    """Hashtags com frequência de Zipf: as do dataset real no topo e uma cauda longa gerada."""
+
+    def __init__(self, tweets, rng):
+        tail = max(100, int(np.sqrt(tweets)))
+        self.tags = np.array(CORE_HASHTAGS + [f"#Tag{k}" for k in range(1, tail + 1)], dtype=object)
+        self.pick = _sampler(zipf_weights(len(self.tags), 1.1), rng)
+
+    def sample(self, rng, size):
+        """Texto de hashtags_extraidas de cada linha: 0 (4%), 1 (70%) ou 2 (26%) tags separadas por ';'."""
+        counts = rng.choice(3, size, p=[0.04, 0.70, 0.26])
+        first = self.tags[self.pick(size)]
+        second = self.tags[self.pick(size)]
+        values = np.full(size, '', dtype=object)
+        values[counts == 1] = first[counts == 1]
+        two = (counts == 2) & (first != second)
+        values[two] = first[two] + ';' + second[two]
+        values[(counts == 2) & ~two] = first[(counts == 2) & ~two]
+        return values
+
+
+def _texts(rng, size, vocabulary, pick_word, user_ids):
+    """Textos sintéticos em inglês com pontuação, ênfase, menções e URLs ocasionais."""
+    lengths = rng.integers(TEXT_MIN_WORDS, TEXT_MAX_WORDS + 1, size)
+    words = vocabulary[pick_word(size * TEXT_MAX_WORDS)].reshape(size, TEXT_MAX_WORDS)
+    endings = rng.choice(np.array(['.', '!', '!!!', '?', ''], dtype=object), size, p=[0.5, 0.2, 0.05, 0.1, 0.15])
+    mentions = rng.random(size) < MENTION_FRACTION
+    urls = rng.random(size) < URL_FRACTION
+    mention_targets = user_ids[rng.integers(0, len(user_ids), size)]
+    texts = []
+    for i in range(size):
+        text = " ".join(words[i, :lengths[i]].tolist())
+        text = text[0].upper() + text[1:] + endings[i]
+        if mentions[i]:
+            text = f"@{mention_targets[i]} {text}"
+        if urls[i]:
+            text = f"{text} https://t.co/{rng.integers(1 << 40):x}"
+        texts.append(text)
+    return np.array(texts, dtype=object)
+
+
+def _uuids(rng, size):
+    """UUIDs (formato 8-4-4-4-12) tirados do gerador aleatório, para que a saída seja reproduzível."""
+    raw = rng.bytes(16 * size).hex()
+    return np.array([f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:32]}"
+                     for h in (raw[k:k + 32] for k in range(0, len(raw), 32))], dtype=object)
+
+
+class SyntheticDataset:
+    """
+    Estado da geração: usuários, hashtags e o alvo de cada retweet já gerado (necessário para
+    a ligação preferencial). `tweets` linhas são geradas em pedaços por iter_tweet_chunks().
+    """
+
+    def __init__(self, tweets, users=None, follows=None, seed=42):
+        self.tweets = tweets
+        self.follows = follows if follows is not None else int(tweets * FOLLOWS_PER_TWEET)
+        self.rng = np.random.default_rng(seed)
+        self.users = _Users(users or max(100, int(tweets * USERS_PER_TWEET)), self.rng)
+        self.hashtags = _HashtagPool(tweets, self.rng)
+        self.vocabulary = np.array(VOCABULARY, dtype=object)
+        self.pick_word = _sampler(np.array(VOCABULARY_WEIGHTS), self.rng)
+        # Alvos (índices dos tweets) dos retweets já gerados, na ordem em que foram gerados.
+        self.retweet_targets = np.empty(tweets, dtype=np.int32 if tweets < 2**31 else np.int64)
+        self.retweet_count = 0
+
+    def _retweet_targets(self, index, is_retweet):
+        """
+        Alvo de cada retweet: um tweet anterior qualquer (que pode ser outro retweet, formando
+        cadeias) ou, com RETWEET_COPY_PROBABILITY, o alvo de um retweet anterior sorteado ao acaso.
+        Um tweet é copiado com chance proporcional aos retweets que já tem, o que concentra os
+        retweets em poucos tweets (ligação preferencial). Os alvos são sorteados em blocos de
+        RETWEET_BLOCK_SIZE linhas para que um bloco já enxergue os retweets dos anteriores.
+        """
+        rng = self.rng
+        target = (rng.random(len(index)) * index).astype(np.int64)
+        copy = rng.random(len(index)) < RETWEET_COPY_PROBABILITY
+        for start in range(0, len(index), RETWEET_BLOCK_SIZE):
+            block = slice(start, start + RETWEET_BLOCK_SIZE)
+            if self.retweet_count:
+                block_copy = copy[block]
+                copied = self.retweet_targets[rng.integers(0, self.retweet_count, int(block_copy.sum()))]
+                target[block][block_copy] = copied
+            new_targets = target[block][is_retweet[block]]
+            self.retweet_targets[self.retweet_count:self.retweet_count + len(new_targets)] = new_targets
+            self.retweet_count += len(new_targets)
+        return target
+
+    def _tweet_chunk(self, start, size):
+        rng = self.rng
+        users = self.users
+        index = np.arange(start, start + size)
+        authors = users.pick_author(size)
+        author_ids = users.ids(authors)
+        texts = _texts(rng, size, self.vocabulary, self.pick_word, author_ids)
+        created = _dates(rng, size, '2024-01-01', '2025-01-01')
+
+        is_retweet = (rng.random(size) < RETWEET_FRACTION) & (index > 0)
+        target = self._retweet_targets(index, is_retweet)
+
+        is_reply = ~is_retweet & (index > 0) & (rng.random(size) < REPLY_FRACTION / (1 - RETWEET_FRACTION))
+        reply_target = (rng.random(size) * index).astype(np.int64)
+
+        has_comment = is_retweet & (rng.random(size) < 0.97)
+        comments = np.full(size, '', dtype=object)
+        comments[has_comment] = [text if len(text) <= 50 else text[:50] + "..." for text in texts[has_comment]]
+
+        has_media = rng.random(size) < MEDIA_FRACTION
+        media_urls = np.full(size, '', dtype=object)
+        media_urls[has_media] = 'https://midia.fake/' + _uuids(rng, int(has_media.sum()))
+        media_types = np.full(size, '', dtype=object)
+        media_types[has_media] = np.array(MEDIA_TYPES, dtype=object)[rng.integers(0, len(MEDIA_TYPES), has_media.sum())]
+        sizes = np.full(size, '', dtype=object)
+        sizes[has_media] = rng.integers(10_000, 3_000_000, has_media.sum())
+
+        hashtags = self.hashtags.sample(rng, size)
+        subjects = rng.choice(len(SUBJECTS), size, p=SUBJECT_WEIGHTS)
+        empty = np.full(size, '', dtype=object)
+
+        return pd.DataFrame({
+            'tweet_id': FIRST_TWEET_ID + index,
+            'texto': texts,
+            'criado_em': created,
+            'idioma': 'en',
+            'likes': rng.integers(0, 5_000, size),
+            'usuario_id': author_ids,
+            'handle': '@' + author_ids,
+            'criado_em_usuario': users.created[authors],
+            'seguidores': users.followers[authors],
+            'regiao': np.array(REGIONS, dtype=object)[users.region[authors]],
+            'influente': np.where(users.influential[authors], 'TRUE', 'FALSE'),
+            'tipo_interacao': np.where(is_retweet, 'RETWEETA', 'POSTA'),
+            'momento': created,
+            'dispositivo': rng.choice(np.array(DEVICES, dtype=object), size, p=DEVICE_WEIGHTS),
+            'comentario': comments,
+            'retweet_de_id': np.where(is_retweet, (FIRST_TWEET_ID + target).astype(str).astype(object), empty),
+            'reply_to_id': np.where(is_reply, (FIRST_TWEET_ID + reply_target).astype(str).astype(object), empty),
+            'midia_url': media_urls,
+            'midia_tipo': media_types,
+            'tamanho': sizes,
+            'hashtags_extraidas': hashtags,
+            'posicoes': np.where(hashtags != '', '1;2;3', ''),
+            'assunto_nome': np.array([name for name, _ in SUBJECTS], dtype=object)[subjects],
+            'tema_pai': np.array([parent for _, parent in SUBJECTS], dtype=object)[subjects],
+        }, columns=TWEET_COLUMNS)
+
+    def iter_tweet_chunks(self, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Gera os tweets em DataFrames de até `chunk_size` linhas, na ordem dos IDs."""
+        for start in range(0, self.tweets, chunk_size):
+            yield self._tweet_chunk(start, min(chunk_size, self.tweets - start))
+
+    def iter_follower_chunks(self, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Gera as arestas SEGUE em pedaços. O seguidor é sorteado uniformemente e o seguido
+        proporcionalmente ao número de seguidores, então os usuários populares concentram as
+        arestas. Laços e pares repetidos dentro do pedaço são descartados (entre pedaços, um
+        par repetido é inofensivo: a carga usa MERGE).
+        """
+        rng = self.rng
+        users = self.users
+        for start in range(0, self.follows, chunk_size):
+            size = min(chunk_size, self.follows - start)
+            follower = rng.integers(0, users.count, size)
+            followed = users.pick_followed(size)
+            chunk = pd.DataFrame({'seguidor': follower, 'seguido': followed})
+            chunk = chunk[chunk['seguidor'] != chunk['seguido']].drop_duplicates()
+            yield pd.DataFrame({
+                'seguidor_id': users.ids(chunk['seguidor'].to_numpy()),
+                'seguido_id': users.ids(chunk['seguido'].to_numpy()),
+                'desde': _dates(rng, len(chunk), '2020-01-01', '2025-01-01'),
+            }, columns=FOLLOWER_COLUMNS)
+
+
+def _write_chunks(chunks, path):
+    """Grava os pedaços em um único CSV (cabeçalho só no primeiro) e retorna o número de linhas."""
+    rows = 0
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8', newline='') as file:
+        for chunk in chunks:
+            chunk.to_csv(file, index=False, header=rows == 0)
+            rows += len(chunk)
+    os.replace(tmp_path, path) # um arquivo interrompido no meio nunca fica com o nome final
+    return rows
+
+
+def dataset_paths(label, output_dir=DEFAULT_OUTPUT_DIR):
+    """Caminhos (tweets, seguidores) do dataset sintético de rótulo `label` (ex: '100k')."""
+    return (os.path.join(output_dir, f"tweets_{label}.csv"),
+            os.path.join(output_dir, f"seguidores_{label}.csv"))
+
+
+def generate_dataset(tweets, output_dir=DEFAULT_OUTPUT_DIR, label=None, users=None, follows=None,
+                     seed=42, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Gera os CSVs de tweets e de seguidores com `tweets` linhas (usuários e arestas
+    proporcionais, se não informados) e retorna os caminhos (tweets, seguidores).
+    A mesma semente e o mesmo `chunk_size` produzem sempre os mesmos arquivos.
+    """
+    label = label or str(tweets)
+    tweets_path, followers_path = dataset_paths(label, output_dir)
+    os.makedirs(output_dir, exist_ok=True)
+    dataset = SyntheticDataset(tweets, users=users, follows=follows, seed=seed)
+
+    start = time.perf_counter()
+    print(f"INFO: Gerando {tweets} tweets de {dataset.users.count} usuários em '{tweets_path}'...")
+    _write_chunks(dataset.iter_tweet_chunks(chunk_size), tweets_path)
+    print(f"INFO: Gerando até {dataset.follows} relações de seguidores em '{followers_path}'...")
+    follower_rows = _write_chunks(dataset.iter_follower_chunks(chunk_size), followers_path)
+    print(f"INFO: Dataset sintético '{label}' gerado em {time.perf_counter() - start:.1f}s "
+          f"({tweets} tweets, {follower_rows} relações de seguidores).")
+    return tweets_path, followers_path
+
+
+def parse_scale(value):
+    """Converte '100k', '1m', '10m' ou um número ('250000') para o número de tweets."""
+    value = str(value).strip().lower()
+    if value in SCALES:
+        return SCALES[value]
+    multiplier = {'k': 1_000, 'm': 1_000_000}.get(value[-1:], 1)
+    number = value[:-1] if multiplier > 1 else value
+    try:
+        return int(float(number) * multiplier)
+    except ValueError:
+        raise ValueError(f"Escala inválida: {value!r} (use por exemplo 10k, 100k, 1m, 10m ou um número)")
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description="Gera CSVs sintéticos de tweets e seguidores no esquema do projeto.")
+    parser.add_argument('scale', help="Número de tweets: 10k, 100k, 1m, 10m ou um número.")
+    parser.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR, help=f"Pasta de saída (padrão: {DEFAULT_OUTPUT_DIR}).")
+    parser.add_argument('--users', type=int, default=None, help="Número de usuários (padrão: 0,65 por tweet).")
+    parser.add_argument('--follows', type=int, default=None, help="Número de arestas SEGUE (padrão: 1,85 por tweet).")
+    parser.add_argument('--seed', type=int, default=42, help="Semente do gerador aleatório (padrão: 42).")
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"Linhas geradas por pedaço (padrão: {DEFAULT_CHUNK_SIZE}).")
+    args = parser.parse_args()
+    generate_dataset(parse_scale(args.scale), output_dir=args.output_dir, label=args.scale.lower(),
+                     users=args.users, follows=args.follows, seed=args.seed, chunk_size=args.chunksize)
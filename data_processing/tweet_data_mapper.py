@@ -1,9 +1,15 @@
 # analise_tweets_neo4j/data_processing/tweet_data_mapper.py
 
-import re
+import time
+import warnings
 from datetime import datetime
+import numpy as np
 import pandas as pd
 
+from sentiment_analysis.preprocessor import normalize_text, normalize_texts
+
+TRUE_STRINGS = ['true', '1', 't', 'y', 'yes', 'verdadeiro']
+
 def parse_hashtags_from_string(hashtags_string):
     """
     Converte uma string de hashtags (ex: "#tag1 #tag2") em uma lista.
@@ -15,12 +21,13 @@ def parse_hashtags_from_string(hashtags_string):
 
 def extract_mentions_from_text(text):
     """
-    Extrai @menções do texto do tweet usando regex.
+    Extrai @menções do texto do tweet (na ordem em que aparecem, sem repetição).
     """
-    if not isinstance(text, str):
-        return []
-    # Regex melhorada para lidar com @ user e @user
-    return list(set(re.findall(r"@\s?([a-zA-Z0-9_À-ÖØ-öø-ÿ]+)", text)))
+    return normalize_text(text)[1]
+
+def _mentions_field(usernames):
+    """Lista de menções no formato do campo 'mentions'."""
+    return [{"username": username, "id": None} for username in usernames]
 
 def safe_int_conversion(value, default=0):
     if pd.isna(value):
@@ -34,7 +41,7 @@ def safe_bool_conversion(value):
     if isinstance(value, bool):
         return value
     if isinstance(value, str):
-        return value.lower() in ['true', '1', 't', 'y', 'yes', 'verdadeiro']
+        return value.lower() in TRUE_STRINGS
     return False
 
 def parse_datetime_string(date_string):
@@ -60,7 +67,9 @@ def map_dataset_row_to_tweet_data(row_dict):
     if pd.isna(user_id):
         return None
 
-    text_mentions_usernames = extract_mentions_from_text(tweet_text)
+    # Uma única passada pelo texto fornece as menções e as hashtags escritas no texto
+    _, text_mentions_usernames, text_hashtags = normalize_text(tweet_text)
+    hashtags_string = row_dict.get('hashtags_extraidas')
 
     parsed_tweet = {
         "tweet_id": str(row_dict.get('tweet_id')),
@@ -84,8 +93,9 @@ def map_dataset_row_to_tweet_data(row_dict):
         "reply_count": 0, # Coluna não existe no novo dataset
         "quote_count": 0, # Coluna não existe no novo dataset
         
-        "hashtags": parse_hashtags_from_string(row_dict.get('hashtags_extraidas')),
-        "mentions": [{"username": mention_username, "id": None} for mention_username in text_mentions_usernames],
+        # A coluna de hashtags tem prioridade; sem ela, usamos as hashtags do próprio texto
+        "hashtags": parse_hashtags_from_string(hashtags_string) if isinstance(hashtags_string, str) else text_hashtags,
+        "mentions": _mentions_field(text_mentions_usernames),
         
         "is_retweet": str(row_dict.get('tipo_interacao', '')).upper() == 'RETWEETA',
         "retweet_of_id": row_dict.get('retweet_de_id'), # Novo campo
@@ -93,6 +103,159 @@ def map_dataset_row_to_tweet_data(row_dict):
     }
     return parsed_tweet
 
+# --- Versão colunar (um pedaço inteiro do DataFrame de uma vez) ---
+# Cada coluna é convertida com operações vetorizadas do pandas/NumPy. Valores fora do caso
+# comum (colunas com tipos misturados, datas fora do ISO 8601, números que o pandas não
+# reconhece) caem nas funções por valor acima, então o resultado é idêntico ao de
+# map_dataset_row_to_tweet_data.
+
+def _column(df, name, default=None):
+    """Valores da coluna como array de objetos Python (ou `default` se a coluna não existir)."""
+    if name in df.columns:
+        return df[name].to_numpy(dtype=object)
+    return np.full(len(df), default, dtype=object)
+
+def _is_string_column(values):
+    """True se todos os valores presentes são strings (o caso de um CSV lido com dtype=str)."""
+    return pd.api.types.infer_dtype(values, skipna=True) in ('string', 'empty')
+
+def _str_column(values):
+    """Equivale a str(valor) em cada posição (NaN vira 'nan', None vira 'None')."""
+    return values.astype(str)
+
+def _int_column(values, default=0):
+    """Versão colunar de safe_int_conversion."""
+    numbers = pd.to_numeric(pd.Series(values, dtype=object), errors='coerce').to_numpy(dtype='float64')
+    result = np.full(len(values), default, dtype=object)
+    valid = np.isfinite(numbers) & (np.abs(numbers) < 2 ** 63)
+    result[valid] = np.trunc(numbers[valid]).astype('int64').tolist()
+    # Valores presentes que o pandas não converteu (ex: ' 12 ', '1_000', inf) seguem a regra por valor.
+    for i in np.flatnonzero(~valid & pd.notna(values)):
+        result[i] = safe_int_conversion(values[i], default)
+    return result
+
+def _bool_column(values):
+    """Versão colunar de safe_bool_conversion."""
+    if _is_string_column(values):
+        return pd.Series(values, dtype=object).str.lower().isin(TRUE_STRINGS).to_numpy()
+    return np.array([safe_bool_conversion(value) for value in values], dtype=bool)
+
+def _parse_unique_datetimes(uniques):
+    """Converte os valores distintos de uma coluna de datas, com parsing ISO 8601 vetorizado."""
+    parsed = [None] * len(uniques)
+    positions = [i for i, value in enumerate(uniques) if isinstance(value, str) and value]
+    stamps = [pd.NaT] * len(positions)
+    if positions:
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter('error')
+                stamps = pd.to_datetime(pd.Index([uniques[i] for i in positions], dtype=object),
+                                        format='ISO8601', errors='coerce')
+        except (ValueError, TypeError, Warning):
+            pass # ex: fusos horários misturados; cada valor é convertido individualmente abaixo
+    for i, stamp in zip(positions, stamps):
+        parsed[i] = parse_datetime_string(uniques[i]) if stamp is pd.NaT else stamp.isoformat()
+    for i, value in enumerate(uniques):
+        if not isinstance(value, str):
+            parsed[i] = parse_datetime_string(value)
+    return parsed
+
+def _datetime_column(values):
+    """
+    Versão colunar de parse_datetime_string. As datas se repetem muito entre tweets,
+    então cada valor distinto é convertido uma única vez.
+    """
+    codes, uniques = pd.factorize(values)
+    lookup = np.array(_parse_unique_datetimes(list(uniques)) + [None], dtype=object)
+    return lookup[codes] # código -1 (valor ausente) aponta para o None no fim
+
+def _hashtags_column(values, text_hashtags):
+    """Versão colunar de parse_hashtags_from_string (com as hashtags do texto onde a coluna falta)."""
+    if _is_string_column(values):
+        split = pd.Series(values, dtype=object).str.replace('#', '', regex=False).str.split()
+        return [tags if isinstance(tags, list) else fallback for tags, fallback in zip(split.tolist(), text_hashtags)]
+    return [parse_hashtags_from_string(value) if isinstance(value, str) else fallback
+            for value, fallback in zip(values, text_hashtags)]
+
+def _valid_rows_mask(df):
+    """Linhas com texto não vazio e usuario_id presente (as demais o mapeador por linha descarta)."""
+    texts = _column(df, 'texto')
+    if _is_string_column(texts):
+        has_text = pd.Series(texts, dtype=object).str.strip().fillna('').to_numpy() != ''
+    else:
+        has_text = np.array([not pd.isna(text) and bool(str(text).strip()) for text in texts], dtype=bool)
+    return has_text & pd.notna(_column(df, 'usuario_id'))
+
+def map_dataframe(df):
+    """
+    Mapeia um DataFrame (ex: um pedaço do CSV) para a estrutura padronizada, coluna a coluna.
+    Retorna a mesma lista que [map_dataset_row_to_tweet_data(r) for r in df.to_dict('records')]
+    sem as linhas descartadas (None).
+    """
+    df = df[_valid_rows_mask(df)]
+    count = len(df)
+    texts = _column(df, 'texto')
+    zeros = [0] * count
+    nones = [None] * count
+    _, mentions, text_hashtags = normalize_texts(texts)
+
+    columns = {
+        "tweet_id": _str_column(_column(df, 'tweet_id')).tolist(),
+        "text": texts.tolist(),
+        "created_at": _datetime_column(_column(df, 'criado_em')).tolist(),
+        "source": _column(df, 'dispositivo').tolist(),
+        "lang": _column(df, 'idioma').tolist(),
+
+        "author_id": _str_column(_column(df, 'usuario_id')).tolist(),
+        "author_username": np.char.lstrip(_str_column(_column(df, 'handle', '')), '@').tolist(),
+        "author_location": _column(df, 'regiao').tolist(),
+        "author_description": nones,
+        "author_created_at": _datetime_column(_column(df, 'criado_em_usuario')).tolist(),
+        "author_followers_count": _int_column(_column(df, 'seguidores')).tolist(),
+        "author_friends_count": zeros,
+        "author_favourites_count": zeros,
+        "author_is_verified": _bool_column(_column(df, 'influente')).tolist(),
+
+        "retweet_count": zeros,
+        "like_count": _int_column(_column(df, 'likes')).tolist(),
+        "reply_count": zeros,
+        "quote_count": zeros,
+
+        "hashtags": _hashtags_column(_column(df, 'hashtags_extraidas'), text_hashtags),
+        "mentions": [_mentions_field(usernames) for usernames in mentions],
+
+        "is_retweet": (np.char.upper(_str_column(_column(df, 'tipo_interacao', ''))) == 'RETWEETA').tolist(),
+        "retweet_of_id": _column(df, 'retweet_de_id').tolist(),
+        "reply_to_id": _column(df, 'reply_to_id').tolist(),
+    }
+    names = list(columns)
+    return [dict(zip(names, values)) for values in zip(*columns.values())]
+
+def _same_value(a, b):
+    if isinstance(a, float) and isinstance(b, float) and a != a and b != b:
+        return True # NaN == NaN
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(_same_value(x, y) for x, y in zip(a, b))
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(_same_value(a[k], b[k]) for k in a)
+    return type(a) is type(b) and a == b
+
+def benchmark_mappers(df):
+    """
+    Mapeia `df` com o mapeador por linha e com map_dataframe, confere que os resultados
+    são idênticos e retorna os tempos: {'rows', 'per_row_seconds', 'dataframe_seconds', 'identical'}.
+    """
+    start = time.perf_counter()
+    per_row = [tweet for tweet in map(map_dataset_row_to_tweet_data, df.to_dict('records')) if tweet]
+    per_row_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    columnar = map_dataframe(df)
+    dataframe_seconds = time.perf_counter() - start
+
+    return {'rows': len(df), 'per_row_seconds': per_row_seconds, 'dataframe_seconds': dataframe_seconds,
+            'identical': _same_value(per_row, columnar)}
+
 # No final de tweet_data_mapper.py
 if __name__ == '__main__':
     print("--- Testando o novo tweet_data_mapper.py ---")
@@ -123,4 +286,14 @@ if __name__ == '__main__':
         # Imprime o dicionário formatado
         print(json.dumps(mapped_data, indent=2, ensure_ascii=False))
     else:
-        print("ERRO: O mapeamento da linha de exemplo falhou.")
\ No newline at end of file
+        print("ERRO: O mapeamento da linha de exemplo falhou.")
+    # Compara o mapeador por linha com o colunar no dataset configurado
+    import os
+    dataset_path = os.getenv("DATASET_FILE_PATH", "data/tweets_neo4j_completos_FINAL.csv")
+    if os.path.exists(dataset_path):
+        print(f"\n--- Benchmark do mapeamento em {dataset_path} ---")
+        result = benchmark_mappers(pd.read_csv(dataset_path, dtype=str))
+        print(f"{result['rows']} linhas: por linha {result['per_row_seconds']:.2f}s, "
+              f"colunar {result['dataframe_seconds']:.2f}s "
+              f"({result['per_row_seconds'] / max(result['dataframe_seconds'], 1e-9):.1f}x). "
+              f"Resultados idênticos: {result['identical']}")
@@ -0,0 +1,252 @@
+# analise_tweets_neo4j/graph_database/adaptive_writer.py
+# Executor de escritas em lote que se adapta ao servidor:
+# - o tamanho do lote acompanha a latência observada das transações (cresce enquanto elas
+#   ficam bem abaixo de `target_seconds`, encolhe quando passam) e cai pela metade, com teto
+#   mais baixo, quando o servidor recusa o lote por falta de memória;
+# - erros transitórios (deadlock, líder trocando, servidor indisponível) são repetidos com
+#   espera exponencial e jitter, para que workers em conflito não tentem de novo juntos;
+# - um lote que falha por causa do conteúdo (ex: tipo inválido em uma linha) é dividido ao
+#   meio até isolar as linhas ruins, que vão para um arquivo de dead letter (JSON Lines); as
+#   demais seguem sendo gravadas normalmente. Erros que atingem o lote inteiro (autenticação,
+#   permissão, sintaxe) são levantados sem dividir.
+# As transações são explícitas (sem o retry automático do execute_write), como em parallel_loader.
+
+import json
+import os
+import random
+import threading
+import time
+
+from neo4j import exceptions
+
+from graph_database import batch_writer
+from utils import metrics
+
+DEFAULT_TARGET_SECONDS = 1.0
+DEFAULT_MIN_BATCH_SIZE = 10
+DEFAULT_MAX_BATCH_SIZE = 20_000
+# Fator de crescimento do lote quando as transações estão rápidas.
+GROWTH_FACTOR = 1.25
+
+MAX_RETRIES = 5
+BACKOFF_BASE_SECONDS = 0.2
+BACKOFF_MAX_SECONDS = 10.0
+
+DEFAULT_DEAD_LETTER_DIR = os.path.join('data', 'dead_letter')
+
+
+def is_memory_error(error):
+    """Erro de memória do servidor (ex: Neo.TransientError.General.MemoryPoolOutOfMemoryError) ou do cliente."""
+    return isinstance(error, MemoryError) or 'Memory' in (getattr(error, 'code', None) or '')
+
+
+def is_transient(error):
+    """Erros que podem passar sozinhos: vale repetir o mesmo lote."""
+    if isinstance(error, (exceptions.TransientError, exceptions.ServiceUnavailable, exceptions.SessionExpired)):
+        return True
+    is_retryable = getattr(error, 'is_retryable', None)
+    return bool(is_retryable and is_retryable())
+
+
+# Erros que dependem do conteúdo das linhas (ex: MERGE com chave nula, tipo inválido, violação
+# de unicidade): só nesses casos vale dividir o lote para isolar as linhas ruins. Os demais
+# (autenticação, permissão, banco inexistente, sintaxe da query) atingem o lote inteiro.
+ROW_ERROR_PREFIXES = ('Neo.ClientError.Statement.', 'Neo.ClientError.Schema.ConstraintValidationFailed')
+BATCH_ERROR_CODES = ('Neo.ClientError.Statement.SyntaxError', 'Neo.ClientError.Statement.ParameterMissing')
+
+
+# Uma divisão com pelo menos este número de linhas em que todas falharam sozinhas indica um
+# problema do lote inteiro (ex: a query não serve para nenhuma linha): a escrita é interrompida.
+ALL_FAILED_ABORT_ROWS = 8
+
+
+def is_row_error(error):
+    """Erro causado por alguma linha do lote (e não pela query, conexão ou permissão)."""
+    code = getattr(error, 'code', None) or ''
+    return code.startswith(ROW_ERROR_PREFIXES) and code not in BATCH_ERROR_CODES
+
+
+def backoff_seconds(attempt, rng=random):
+    """Espera antes da tentativa `attempt` (0, 1, ...): exponencial, com teto e jitter de ±50%."""
+    return min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt) * rng.uniform(0.5, 1.5)
+
+
+class BatchSizer:
+    """
+    Tamanho de lote adaptativo de uma família de query, compartilhável entre threads.
+    Cresce GROWTH_FACTOR quando a transação leva menos da metade de `target_seconds`,
+    encolhe na proporção do excesso quando passa da meta, e nunca sai de [min_size, max_size].
+    Um erro de memória corta o lote pela metade e baixa o teto para esse novo tamanho.
+    """
+
+    def __init__(self, initial=batch_writer.DEFAULT_BATCH_SIZE, min_size=DEFAULT_MIN_BATCH_SIZE,
+                 max_size=DEFAULT_MAX_BATCH_SIZE, target_seconds=DEFAULT_TARGET_SECONDS):
+        self.min_size = max(1, min_size)
+        self.max_size = max(self.min_size, max_size)
+        self.target_seconds = target_seconds
+        self._size = min(max(initial, self.min_size), self.max_size)
+        self._lock = threading.Lock()
+
+    @property
+    def size(self):
+        return self._size
+
+    def record(self, rows, seconds):
+        """Ajusta o tamanho a partir de uma transação de `rows` linhas que levou `seconds`."""
+        with self._lock:
+            # Lotes menores que o atual (ex: o fim de um pedaço) não dizem nada sobre o tamanho atual.
+            if rows < self._size:
+                return
+            if seconds < self.target_seconds / 2:
+                size = self._size * GROWTH_FACTOR
+            elif seconds > self.target_seconds:
+                size = self._size * max(0.5, self.target_seconds / seconds)
+            else:
+                return
+            self._size = int(min(max(size, self.min_size), self.max_size))
+
+    def on_memory_error(self, rows):
+        """O servidor não aguentou `rows` linhas: metade disso passa a ser o tamanho e o teto."""
+        with self._lock:
+            self._size = max(self.min_size, min(self._size, rows // 2))
+            self.max_size = max(self.min_size, self._size)
+
+
+class DeadLetterFile:
+    """Arquivo JSON Lines com as linhas que falharam sozinhas (uma por linha, com o erro)."""
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def write(self, family, row, error):
+        entry = {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'family': family,
+            'error_code': getattr(error, 'code', None) or type(error).__name__,
+            'error': str(error),
+            'row': row,
+        }
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+            self.count += 1
+
+
+def dead_letter_for(family, output_dir=DEFAULT_DEAD_LETTER_DIR):
+    """DeadLetterFile padrão de uma família: data/dead_letter/<família>.jsonl."""
+    return DeadLetterFile(os.path.join(output_dir, f"{family}.jsonl"))
+
+
+class AdaptiveWriter:
+    """
+    Grava linhas com `write_function(tx, lote, *args)` em lotes de tamanho adaptativo.
+    Uma instância por família de query; pode ser usada por várias threads, cada uma com
+    sua sessão (o tamanho aprendido e o dead letter são compartilhados).
+    """
+
+    def __init__(self, family, write_function, sizer=None, dead_letter=None, rng=None, sleep=time.sleep):
+        self.family = family
+        self.write_function = write_function
+        self.sizer = sizer or BatchSizer()
+        self.dead_letter = dead_letter or dead_letter_for(family)
+        self._rng = rng or random.Random()
+        self._sleep = sleep
+        self._last_error = None
+
+    def write(self, session, rows, *args, stats=None):
+        """
+        Grava todas as `rows` na sessão, lendo o tamanho do lote atual antes de cada lote.
+        Levanta a exceção se um erro transitório persistir após MAX_RETRIES tentativas, se o
+        erro não depender das linhas (ver is_row_error) ou se todas as linhas de um lote de pelo
+        menos ALL_FAILED_ABORT_ROWS linhas falharem.
+        Acumula linhas, lotes, segundos, retentativas e linhas no dead letter em
+        `stats[família]` (formato de batch_writer). Retorna (linhas gravadas, linhas no dead letter).
+        """
+        if stats is None:
+            stats = {}
+        family_stats = stats.setdefault(self.family, {'rows': 0, 'batches': 0, 'seconds': 0.0})
+        for key in ('retries', 'dead_letter'):
+            family_stats.setdefault(key, 0)
+
+        rows = list(rows)
+        written = 0
+        dead = 0
+        position = 0
+        while position < len(rows):
+            batch = rows[position:position + self.sizer.size]
+            position += len(batch)
+            batch_written, batch_dead = self._write_batch(session, batch, args, family_stats)
+            written += batch_written
+            dead += batch_dead
+            # Se todas as linhas de um lote falharam sozinhas, o problema não é de algumas linhas.
+            if len(batch) >= ALL_FAILED_ABORT_ROWS and batch_dead == len(batch):
+                self._abort(len(batch))
+        return written, dead
+
+    def _write_batch(self, session, batch, args, family_stats):
+        attempt = 0
+        while True:
+            start = time.perf_counter()
+            try:
+                with session.begin_transaction() as tx:
+                    self.write_function(tx, batch, *args)
+                    tx.commit()
+            except Exception as e:
+                if is_memory_error(e) and len(batch) > 1:
+                    self.sizer.on_memory_error(len(batch))
+                    print(f"AVISO: Falta de memória no servidor com lote de {len(batch)} linhas ({self.family}). "
+                          f"Reduzindo o lote para {self.sizer.size}.")
+                    return self._split(session, batch, args, family_stats)
+                if is_transient(e) and attempt < MAX_RETRIES:
+                    wait = backoff_seconds(attempt, self._rng)
+                    metrics.increment('neo4j_retries_total', family=self.family)
+                    family_stats['retries'] += 1
+                    print(f"AVISO: Erro transitório em lote de {len(batch)} linhas ({getattr(e, 'code', e)}). "
+                          f"Nova tentativa em {wait:.2f}s...")
+                    self._sleep(wait)
+                    attempt += 1
+                    continue
+                if is_transient(e) or not is_row_error(e):
+                    metrics.increment('neo4j_failures_total', family=self.family)
+                    raise
+                if len(batch) == 1:
+                    self._last_error = e
+                    self.dead_letter.write(self.family, batch[0], e)
+                    family_stats['dead_letter'] += 1
+                    metrics.increment('neo4j_failures_total', family=self.family)
+                    metrics.increment('neo4j_dead_letter_rows_total', family=self.family)
+                    print(f"ERRO: Linha enviada para {self.dead_letter.path} ({self.family}): {e}")
+                    return 0, 1
+                return self._split(session, batch, args, family_stats)
+
+            elapsed = time.perf_counter() - start
+            batch_writer.record_transaction(self.family, len(batch), elapsed)
+            self.sizer.record(len(batch), elapsed)
+            family_stats['rows'] += len(batch)
+            family_stats['batches'] += 1
+            family_stats['seconds'] += elapsed
+            return len(batch), 0
+
+    def _split(self, session, batch, args, family_stats):
+        """Grava as duas metades do lote separadamente, isolando as linhas que falham."""
+        middle = len(batch) // 2
+        first = self._write_batch(session, batch[:middle], args, family_stats)
+        if middle >= ALL_FAILED_ABORT_ROWS and first[1] == middle:
+            self._abort(middle)
+        second = self._write_batch(session, batch[middle:], args, family_stats)
+        if len(batch) >= ALL_FAILED_ABORT_ROWS and first[1] + second[1] == len(batch):
+            self._abort(len(batch))
+        return first[0] + second[0], first[1] + second[1]
+
+    def _abort(self, rows):
+        print(f"ERRO: Todas as {rows} linhas de um lote falharam ({self.family}). Interrompendo a escrita.")
+        raise self._last_error
+
+
+def unwind_writer(family, query, initial_size=batch_writer.DEFAULT_BATCH_SIZE, **kwargs):
+    """AdaptiveWriter para uma query `UNWIND $rows` (o caso das famílias de carga)."""
+    return AdaptiveWriter(family, lambda tx, batch: batch_writer._run_unwind_batch(tx, query, batch, family),
+                          sizer=BatchSizer(initial=initial_size), **kwargs)
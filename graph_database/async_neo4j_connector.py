@@ -0,0 +1,132 @@
+# analise_tweets_neo4j/graph_database/async_neo4j_connector.py
+# Conector assíncrono (asyncio) do Neo4j, paralelo ao neo4j_connector.py. Usa as mesmas
+# credenciais e a mesma configuração de pool, e permite manter muitas transações em
+# andamento a partir de um único event loop.
+
+import asyncio
+import time
+
+from neo4j import AsyncGraphDatabase, exceptions
+
+from graph_database import neo4j_connector, batch_writer
+from utils import metrics
+
+# Driver assíncrono compartilhado. Um driver assíncrono pertence ao event loop em que foi
+# criado, então guardamos também o loop e criamos outro driver se o loop mudar.
+_async_driver = None
+_async_driver_loop = None
+
+# Transações em andamento ao mesmo tempo em write_batches_concurrently().
+DEFAULT_CONCURRENCY = 8
+
+
+async def connect_db_async():
+    """
+    Retorna o driver assíncrono compartilhado do event loop atual, criando-o (e
+    verificando a conectividade) na primeira chamada.
+    """
+    global _async_driver, _async_driver_loop
+    loop = asyncio.get_running_loop()
+    if _async_driver is not None and _async_driver_loop is loop:
+        return _async_driver
+
+    credentials = neo4j_connector.get_credentials()
+    if credentials is None:
+        return None
+    uri, auth = credentials
+
+    try:
+        driver = AsyncGraphDatabase.driver(uri, auth=auth, **neo4j_connector.driver_config())
+        await driver.verify_connectivity()
+    except exceptions.AuthError as e:
+        print(f"ERRO DE AUTENTICAÇÃO: Não foi possível conectar ao Neo4j. Verifique usuário e senha.")
+        print(f"Detalhes: {e}")
+        return None
+    except exceptions.ServiceUnavailable as e:
+        print(f"ERRO DE SERVIÇO: Não foi possível conectar ao Neo4j em {uri}. O servidor está rodando?")
+        print(f"Detalhes: {e}")
+        return None
+    except Exception as e:
+        print(f"ERRO DESCONHECIDO ao conectar ao Neo4j: {e}")
+        return None
+
+    print(f"INFO: Conectado (async) com sucesso ao Neo4j em {uri}")
+    _async_driver = driver
+    _async_driver_loop = loop
+    return driver
+
+
+async def check_health_async(driver):
+    """Versão assíncrona de neo4j_connector.check_health()."""
+    try:
+        async with driver.session() as session:
+            result = await session.run("RETURN 1 AS ok")
+            record = await result.single()
+            return record['ok'] == 1
+    except Exception as e:
+        print(f"ERRO: O Neo4j não respondeu à verificação de saúde: {e}")
+        return False
+
+
+async def close_db_async(driver):
+    """
+    Fecha o driver assíncrono. Deve ser chamado antes de o event loop terminar, já que
+    as conexões pertencem a ele.
+    """
+    global _async_driver, _async_driver_loop
+    if driver:
+        if driver is _async_driver:
+            _async_driver = None
+            _async_driver_loop = None
+        try:
+            await driver.close()
+            print("INFO: Conexão (async) com o Neo4j fechada.")
+        except Exception as e:
+            print(f"ERRO ao fechar a conexão (async) com o Neo4j: {e}")
+
+
+async def _run_unwind_batch_async(tx, query, batch):
+    result = await tx.run(query, rows=batch)
+    await result.consume()
+
+
+async def write_batches_concurrently(driver, query, rows, batch_size=batch_writer.DEFAULT_BATCH_SIZE,
+                                     concurrency=DEFAULT_CONCURRENCY, family='query'):
+    """
+    Envia `rows` para uma query `UNWIND $rows` em lotes de `batch_size`, com até
+    `concurrency` transações em andamento ao mesmo tempo (cada uma na sua sessão).
+    Indicado para famílias sem disputa de nós entre lotes (ex: relações particionadas).
+    A latência de cada transação entra nas métricas com o rótulo `family`.
+    Retorna o número de lotes enviados.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def write(batch):
+        async with semaphore:
+            async with driver.session() as session:
+                start = time.perf_counter()
+                try:
+                    await session.execute_write(_run_unwind_batch_async, query, batch)
+                except Exception:
+                    metrics.increment('neo4j_failures_total', family=family)
+                    raise
+                batch_writer.record_transaction(family, len(batch), time.perf_counter() - start)
+
+    batches = list(batch_writer.chunked(rows, batch_size))
+    await asyncio.gather(*(write(batch) for batch in batches))
+    return len(batches)
+
+
+# Bloco de teste para executar este arquivo diretamente
+if __name__ == '__main__':
+    async def main():
+        print("--- Testando o conector assíncrono do Neo4j ---")
+        driver = await connect_db_async()
+        if driver:
+            print(f"Servidor saudável: {await check_health_async(driver)}")
+            await close_db_async(driver)
+        else:
+            print("Não foi possível estabelecer a conexão com o Neo4j.")
+        print("--- Fim do teste do conector assíncrono ---")
+
+    asyncio.run(main())
@@ -0,0 +1,88 @@
+# analise_tweets_neo4j/graph_database/batch_writer.py
+# Escrita em lotes no Neo4j: cada família de query recebe as linhas via `UNWIND $rows`,
+# trocando milhares de transações de uma linha por poucas transações grandes.
+
+import time
+
+from graph_database import query_profiler
+from utils import metrics
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def chunked(rows, size):
+    """
+    Divide uma sequência (ou iterável) de linhas em listas de no máximo `size` elementos.
+    """
+    if size <= 0:
+        raise ValueError("O tamanho do lote deve ser positivo.")
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _run_unwind_batch(tx, query, batch, family='query'):
+    """Executa uma query `UNWIND $rows` com um lote de linhas dentro de uma transação."""
+    query_profiler.run(tx, query, family, rows=batch)
+
+
+def write_in_batches(session, query, rows, batch_size=DEFAULT_BATCH_SIZE, family='query', stats=None):
+    """
+    Envia `rows` para a query em lotes de `batch_size`, um `execute_write` por lote.
+    A query deve consumir o parâmetro `$rows` (ex: `UNWIND $rows AS row ...`).
+
+    As estatísticas da família (linhas, lotes, segundos) são acumuladas em `stats`,
+    permitindo somar várias chamadas (ex: um CSV lido em pedaços) antes do relatório.
+    Retorna o dicionário `stats`.
+    """
+    if stats is None:
+        stats = {}
+    family_stats = stats.setdefault(family, {'rows': 0, 'batches': 0, 'seconds': 0.0})
+
+    for batch in chunked(rows, batch_size):
+        start = time.perf_counter()
+        try:
+            session.execute_write(_run_unwind_batch, query, batch, family)
+        except Exception:
+            metrics.increment('neo4j_failures_total', family=family)
+            raise
+        elapsed = time.perf_counter() - start
+        record_transaction(family, len(batch), elapsed)
+        family_stats['seconds'] += elapsed
+        family_stats['rows'] += len(batch)
+        family_stats['batches'] += 1
+    return stats
+
+
+def record_transaction(family, rows, seconds):
+    """Registra nas métricas uma transação concluída da família (latência e linhas)."""
+    metrics.observe('neo4j_transaction_seconds', seconds, family=family)
+    metrics.increment('neo4j_rows_written_total', rows, family=family)
+
+
+def rows_per_second(family_stats):
+    """Calcula a vazão (linhas/s) de uma família; 0.0 se nada foi medido."""
+    if family_stats['seconds'] <= 0:
+        return 0.0
+    return family_stats['rows'] / family_stats['seconds']
+
+
+def print_throughput_report(stats):
+    """Imprime a vazão de cada família de query acumulada em `stats`."""
+    if not stats:
+        print("Nenhum lote foi enviado ao banco.")
+        return
+    print("\nVazão por família de query:")
+    for family, family_stats in stats.items():
+        line = (f"  {family:<16} {family_stats['rows']:>10} linhas em {family_stats['batches']:>6} lotes | "
+                f"{family_stats['seconds']:8.2f}s | {rows_per_second(family_stats):10.1f} linhas/s")
+        if family_stats.get('retries'):
+            line += f" | {family_stats['retries']} retentativas"
+        if family_stats.get('dead_letter'):
+            line += f" | {family_stats['dead_letter']} no dead letter"
+        print(line)
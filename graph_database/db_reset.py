@@ -0,0 +1,121 @@
+# analise_tweets_neo4j/graph_database/db_reset.py
+# Limpeza do banco em lotes limitados: um único `MATCH (n) DETACH DELETE n` acumula o grafo
+# inteiro em uma transação e esgota o heap de transações do Neo4j em grafos grandes.
+
+import time
+
+from neo4j import exceptions
+
+DEFAULT_DELETE_BATCH_SIZE = 10_000
+
+# Cada chamada de limpeza apaga no máximo este número de lotes antes de reportar o progresso.
+BATCHES_PER_ROUND = 10
+
+DELETE_RELATIONSHIPS_QUERY = """
+MATCH ()-[r]->()
+WITH r LIMIT $limit
+CALL { WITH r DELETE r } IN TRANSACTIONS OF $batch_size ROWS
+"""
+
+# DETACH cobre relações criadas depois da etapa anterior (ex: uma carga concorrente).
+DELETE_NODES_QUERY = """
+MATCH (n)
+WITH n LIMIT $limit
+CALL { WITH n DETACH DELETE n } IN TRANSACTIONS OF $batch_size ROWS
+"""
+
+
+def _delete_in_rounds(session, query, counter, label, batch_size):
+    """
+    Repete a query de limpeza até que ela não apague mais nada, imprimindo o progresso.
+    `counter` é o nome do contador do resumo da query (ex: 'nodes_deleted').
+    """
+    total = 0
+    while True:
+        summary = session.run(query, limit=batch_size * BATCHES_PER_ROUND, batch_size=batch_size).consume()
+        deleted = getattr(summary.counters, counter)
+        if deleted == 0:
+            return total
+        total += deleted
+        print(f"  {total} {label}...")
+
+
+def delete_all_in_batches(driver, batch_size=DEFAULT_DELETE_BATCH_SIZE, database=None):
+    """
+    Apaga primeiro as relações e depois os nós, em transações de `batch_size` linhas.
+    `CALL { ... } IN TRANSACTIONS` exige transação implícita, por isso usa session.run().
+    Retorna (relações apagadas, nós apagados).
+    """
+    with driver.session(database=database) as session:
+        relationships = _delete_in_rounds(session, DELETE_RELATIONSHIPS_QUERY, 'relationships_deleted',
+                                          'relações apagadas', batch_size)
+        nodes = _delete_in_rounds(session, DELETE_NODES_QUERY, 'nodes_deleted', 'nós apagados', batch_size)
+    return relationships, nodes
+
+
+def drop_all_constraints(driver, database=None):
+    """
+    Remove todas as constraints do banco. Falhas são reportadas (e não ignoradas).
+    Retorna (removidas, falhas).
+    """
+    dropped = 0
+    failed = 0
+    with driver.session(database=database) as session:
+        names = [record['name'] for record in session.run("SHOW CONSTRAINTS YIELD name")]
+        for name in names:
+            try:
+                session.run(f"DROP CONSTRAINT `{name}` IF EXISTS").consume()
+                dropped += 1
+            except exceptions.Neo4jError as e:
+                failed += 1
+                print(f"ERRO ao remover a constraint '{name}': {e}")
+    return dropped, failed
+
+
+def recreate_database(driver, database=None):
+    """
+    Caminho rápido: descarta e recria o banco inteiro com `CREATE OR REPLACE DATABASE`.
+    Só está disponível no Neo4j Enterprise/Aura com permissão de administração; retorna
+    False (sem alterar nada) se o servidor recusar o comando.
+    """
+    try:
+        with driver.session(database='system') as session:
+            if database is None:
+                database = session.run("SHOW DEFAULT DATABASE YIELD name").single()['name']
+            session.run(f"CREATE OR REPLACE DATABASE `{database}` WAIT").consume()
+        return True
+    except exceptions.Neo4jError as e:
+        print(f"AVISO: Não foi possível recriar o banco '{database}' ({e.code}). Usando a limpeza em lotes.")
+        return False
+
+
+def reset_database(driver, batch_size=DEFAULT_DELETE_BATCH_SIZE, database=None, fast=False, drop_constraints=False):
+    """
+    Apaga todos os dados do banco sem estourar a memória do servidor. Constraints e índices
+    são mantidos (graph_database/schema.py só cria o que faltar); com `drop_constraints`, as
+    constraints também são removidas.
+    Com `fast`, tenta primeiro recriar o banco (instantâneo em qualquer tamanho, mas sem o
+    schema) e só cai para a limpeza em lotes se o servidor não permitir.
+    Retorna um dicionário com o modo usado e as contagens de itens removidos.
+    """
+    start = time.perf_counter()
+    print("Limpando o banco de dados...")
+
+    if fast and recreate_database(driver, database):
+        report = {'mode': 'recreate', 'relationships': None, 'nodes': None, 'constraints': None}
+    else:
+        relationships, nodes = delete_all_in_batches(driver, batch_size, database)
+        constraints = 0
+        if drop_constraints:
+            constraints, failed = drop_all_constraints(driver, database)
+            if failed:
+                print(f"AVISO: {failed} constraints não puderam ser removidas.")
+        report = {'mode': 'batches', 'relationships': relationships, 'nodes': nodes, 'constraints': constraints}
+
+    elapsed = time.perf_counter() - start
+    if report['mode'] == 'recreate':
+        print(f"Banco de dados recriado em {elapsed:.1f}s.")
+    else:
+        print(f"Banco de dados limpo em {elapsed:.1f}s: {report['relationships']} relações, "
+              f"{report['nodes']} nós e {report['constraints']} constraints removidos.")
+    return report
@@ -1,7 +1,43 @@
 # analise_tweets_neo4j/graph_database/graph_builder.py
 
+import time
+
 from neo4j import GraphDatabase, exceptions
 
+from data_processing.mention_resolver import mention_only_id, normalize_handle
+from graph_database import adaptive_writer, query_profiler, schema
+from utils import metrics
+
+def create_constraints(driver):
+    """
+    Aplica as constraints e índices usados pelas escritas deste módulo (User.userId, Tweet.tweetId,
+    Hashtag.tag, User.usernameKey), declarados em graph_database/schema.py, e preenche o
+    usernameKey dos usuários gravados antes dele existir. Idempotente.
+    """
+    schema.ensure_schema(driver, database="neo4j")
+    backfill_username_keys(driver, database="neo4j")
+
+# Usuários gravados antes do usernameKey existir recebem a chave (em transações de 10 mil nós).
+# Os usernames gravados aqui já vêm sem '@' (ver tweet_data_mapper), então toLower(trim())
+# equivale a mention_resolver.normalize_handle.
+BACKFILL_USERNAME_KEY_QUERY = (
+    "MATCH (u:User) WHERE u.usernameKey IS NULL AND u.username IS NOT NULL "
+    "CALL { WITH u SET u.usernameKey = toLower(trim(u.username)) } IN TRANSACTIONS OF 10000 ROWS"
+)
+
+def backfill_username_keys(driver, database="neo4j"):
+    """Preenche User.usernameKey onde ele falta. Retorna quantos usuários foram atualizados."""
+    with driver.session(database=database) as session:
+        summary = session.run(BACKFILL_USERNAME_KEY_QUERY).consume()
+    updated = summary.counters.properties_set
+    if updated:
+        print(f"INFO: usernameKey preenchido em {updated} usuários gravados antes dele.")
+    return updated
+
+def _username_key(username):
+    """Chave de busca do username (a mesma do MentionResolver), ou None se não houver username."""
+    return normalize_handle(username) if username else None
+
 def _create_user_node(tx, user_data):
     """
     Cria ou atualiza (MERGE) um nó User.
@@ -11,6 +47,7 @@ def _create_user_node(tx, user_data):
         "MERGE (u:User {userId: $userId}) " # << MUDANÇA AQUI
         "ON CREATE SET "
         "  u.username = $username, " # Nome de usuário agora é uma propriedade
+        "  u.usernameKey = $usernameKey, "
         "  u.location = $location, "
         "  u.description = $description, "
         "  u.createdAt = $createdAt, "
@@ -19,14 +56,17 @@ def _create_user_node(tx, user_data):
         "  u.lastUpdated = timestamp() "
         "ON MATCH SET "
         "  u.username = $username, "
+        "  u.usernameKey = $usernameKey, "
         "  u.location = $location, "
         "  u.followersCount = $followersCount, "
         "  u.isVerified = $isVerified, "
+        "  u.isMentionOnly = null, " # Criado antes por uma menção, agora com dados próprios
         "  u.lastUpdated = timestamp() "
     )
-    tx.run(query,
+    query_profiler.run(tx, query, 'usuario',
            userId=user_data['author_id'], # << MUDANÇA AQUI
            username=user_data.get('author_username'),
+           usernameKey=_username_key(user_data.get('author_username')),
            location=user_data.get('author_location'),
            description=user_data.get('author_description'),
            createdAt=user_data.get('author_created_at'),
@@ -48,7 +88,7 @@ def _create_tweet_node_and_post_relationship(tx, tweet_data):
         "  t.lastUpdated = timestamp() "
         "ON MATCH SET t.retweetCount = $retweetCount, t.likeCount = $likeCount"
     )
-    tx.run(query_tweet,
+    query_profiler.run(tx, query_tweet, 'tweet',
            tweetId=tweet_data['tweet_id'], text=tweet_data['text'],
            createdAt=tweet_data.get('created_at'), source=tweet_data.get('source'),
            lang=tweet_data.get('lang'), retweetCount=tweet_data.get('retweet_count'),
@@ -62,7 +102,7 @@ def _create_tweet_node_and_post_relationship(tx, tweet_data):
         "MATCH (t:Tweet {tweetId: $tweetId}) "
         "MERGE (u)-[r:POSTED]->(t)"
     )
-    tx.run(query_posted_rel, authorId=tweet_data['author_id'], tweetId=tweet_data['tweet_id']) # << MUDANÇA AQUI
+    query_profiler.run(tx, query_posted_rel, 'posted', authorId=tweet_data['author_id'], tweetId=tweet_data['tweet_id']) # << MUDANÇA AQUI
 
 def _create_hashtags_and_relationships(tx, tweet_id, hashtags_list):
     # Esta função não precisa de mudanças
@@ -73,37 +113,276 @@ def _create_hashtags_and_relationships(tx, tweet_id, hashtags_list):
         "MERGE (h:Hashtag {tag: toLower(tagName)}) "
         "MERGE (t)-[r:HAS_TAG]->(h)"
     )
-    tx.run(query, tweetId=tweet_id, tags=hashtags_list)
+    query_profiler.run(tx, query, 'hashtag', tweetId=tweet_id, tags=hashtags_list)
+
+# Destino de cada menção: o userId resolvido no cliente; sem ele, um autor já gravado com o
+# mesmo handle (busca no índice de User.usernameKey, sem '@' e em minúsculas, como no
+# MentionResolver); só se nenhum existir, o usuário "só menção". Se o handle pertencer a mais de
+# um autor, vale o menor userId, a mesma escolha do MentionResolver.
+MENTION_TARGET_CLAUSE = (
+    "OPTIONAL MATCH (known:User {usernameKey: mentionedUserData.usernameKey}) "
+    "  WHERE mentionedUserData.userId IS NULL AND known.isMentionOnly IS NULL "
+    "WITH t, mentionedUserData, min(known.userId) AS knownUserId "
+    "MERGE (mentioned_u:User {userId: coalesce(mentionedUserData.userId, knownUserId, mentionedUserData.mentionOnlyId)}) "
+    "ON CREATE SET mentioned_u.username = mentionedUserData.username, "
+    "  mentioned_u.usernameKey = mentionedUserData.usernameKey, mentioned_u.isMentionOnly = true "
+    "MERGE (t)-[r:MENTIONS]->(mentioned_u)"
+)
+
+def _mentioned_users(mentions_list):
+    """
+    Menções no formato das queries: o userId resolvido no cliente (campo 'id', preenchido por
+    MentionResolver, ou None), a chave normalizada do handle e o userId de usuário "só menção",
+    usado se a query também não encontrar um autor com esse handle.
+    """
+    return [{'userId': mention.get('id'), 'username': mention['username'],
+             'usernameKey': normalize_handle(mention['username']),
+             'mentionOnlyId': mention_only_id(mention['username'])}
+            for mention in mentions_list or [] if mention.get('username')]
 
 def _create_mentions_and_relationships(tx, tweet_id, mentions_list):
-    # Esta função não precisa de mudanças na sua lógica principal,
-    # mas o MERGE de User agora cria nós baseados em 'username' pois não temos o 'userId' da pessoa mencionada.
+    # As menções são gravadas pelo userId (índice único). Sem um ID resolvido no cliente, o
+    # autor com o mesmo handle é procurado pelo índice de User.usernameKey antes de se criar
+    # um usuário "só menção", que é completado quando tuitar.
     if not mentions_list: return
     query = (
         "MATCH (t:Tweet {tweetId: $tweetId}) "
         "UNWIND $mentionedUsers AS mentionedUserData "
-        # Nota: Estamos criando/encontrando usuários mencionados pelo seu username,
-        # pois não temos o userId deles no texto do tweet.
-        "MERGE (mentioned_u:User {username: mentionedUserData.username}) "
-        "ON CREATE SET mentioned_u.isMentionOnly = true "
-        "MERGE (t)-[r:MENTIONS]->(mentioned_u)"
+        + MENTION_TARGET_CLAUSE
     )
-    usernames_to_merge = [{'username': mention['username']} for mention in mentions_list if mention.get('username')]
-    if usernames_to_merge:
-        tx.run(query, tweetId=tweet_id, mentionedUsers=usernames_to_merge)
+    mentioned_users = _mentioned_users(mentions_list)
+    if mentioned_users:
+        query_profiler.run(tx, query, 'mencao', tweetId=tweet_id, mentionedUsers=mentioned_users)
+
+def _timed_write(session, family, transaction_function, *args):
+    """Executa uma transação de escrita registrando a latência (ou a falha) nas métricas."""
+    start = time.perf_counter()
+    try:
+        session.execute_write(transaction_function, *args)
+    except Exception:
+        metrics.increment('neo4j_failures_total', family=family)
+        raise
+    metrics.observe('neo4j_transaction_seconds', time.perf_counter() - start, family=family)
 
-def add_tweet_to_graph(driver, tweet_data):
-    # Esta função principal não precisa de mudanças
+def add_tweet_to_graph(driver, tweet_data, resolver=None):
+    # Cada transação é medida por família (usuario, tweet, hashtag, mencao) em utils.metrics.
+    # Para muitos tweets, prefira GraphWriter: uma transação por lote em vez de até quatro por tweet.
+    # Com `resolver` (MentionResolver), o autor entra no índice de handles e as menções são
+    # resolvidas para userIds no cliente, como em GraphWriter.
     if not driver or not tweet_data: return
+    if resolver is not None:
+        resolver.add_tweet(tweet_data)
+        resolver.resolve_mentions(tweet_data)
     try:
         with driver.session(database="neo4j") as session:
-            session.execute_write(_create_user_node, tweet_data)
-            session.execute_write(_create_tweet_node_and_post_relationship, tweet_data)
+            _timed_write(session, 'usuario', _create_user_node, tweet_data)
+            _timed_write(session, 'tweet', _create_tweet_node_and_post_relationship, tweet_data)
             if tweet_data.get('hashtags'):
-                session.execute_write(_create_hashtags_and_relationships, tweet_data['tweet_id'], tweet_data['hashtags'])
+                _timed_write(session, 'hashtag', _create_hashtags_and_relationships, tweet_data['tweet_id'], tweet_data['hashtags'])
             if tweet_data.get('mentions'):
-                session.execute_write(_create_mentions_and_relationships, tweet_data['tweet_id'], tweet_data['mentions'])
+                _timed_write(session, 'mencao', _create_mentions_and_relationships, tweet_data['tweet_id'], tweet_data['mentions'])
+        metrics.increment('pipeline_rows_total', stage='graph_builder')
     except exceptions.Neo4jError as e:
         print(f"ERRO Neo4j [graph_builder] ao processar tweet ID {tweet_data.get('tweet_id', 'DESCONHECIDO')}: {e}")
     except Exception as e:
         print(f"ERRO GERAL [graph_builder] ao processar tweet ID {tweet_data.get('tweet_id', 'DESCONHECIDO')}: {e}")
+
+# --- Escrita em lote ---
+# As mesmas escritas das funções acima, para um lote de tweets via `UNWIND $rows`.
+
+BATCH_USER_QUERY = (
+    "UNWIND $rows AS row "
+    "MERGE (u:User {userId: row.userId}) "
+    "ON CREATE SET "
+    "  u.username = row.username, u.usernameKey = row.usernameKey, "
+    "  u.location = row.location, u.description = row.description, "
+    "  u.createdAt = row.createdAt, u.followersCount = row.followersCount, u.isVerified = row.isVerified, "
+    "  u.lastUpdated = timestamp() "
+    "ON MATCH SET "
+    "  u.username = row.username, u.usernameKey = row.usernameKey, u.location = row.location, "
+    "  u.followersCount = row.followersCount, u.isVerified = row.isVerified, u.isMentionOnly = null, "
+    "  u.lastUpdated = timestamp() "
+)
+
+BATCH_TWEET_QUERY = (
+    "UNWIND $rows AS row "
+    "MERGE (t:Tweet {tweetId: row.tweetId}) "
+    "ON CREATE SET "
+    "  t.text = row.text, t.createdAt = row.createdAt, t.source = row.source, "
+    "  t.lang = row.lang, t.retweetCount = row.retweetCount, t.likeCount = row.likeCount, "
+    "  t.replyCount = row.replyCount, t.quoteCount = row.quoteCount, t.isRetweet = row.isRetweet, "
+    "  t.sentimentLabel = row.sentimentLabel, t.sentimentScore = row.sentimentScore, "
+    "  t.lastUpdated = timestamp() "
+    "ON MATCH SET t.retweetCount = row.retweetCount, t.likeCount = row.likeCount, "
+    "  t.sentimentLabel = coalesce(row.sentimentLabel, t.sentimentLabel), "
+    "  t.sentimentScore = coalesce(row.sentimentScore, t.sentimentScore)"
+)
+
+BATCH_POSTED_QUERY = (
+    "UNWIND $rows AS row "
+    "MATCH (u:User {userId: row.authorId}) "
+    "MATCH (t:Tweet {tweetId: row.tweetId}) "
+    "MERGE (u)-[r:POSTED]->(t)"
+)
+
+BATCH_HASHTAG_QUERY = (
+    "UNWIND $rows AS row "
+    "MATCH (t:Tweet {tweetId: row.tweetId}) "
+    "UNWIND row.tags AS tagName "
+    "MERGE (h:Hashtag {tag: toLower(tagName)}) "
+    "MERGE (t)-[r:HAS_TAG]->(h)"
+)
+
+BATCH_MENTION_QUERY = (
+    "UNWIND $rows AS row "
+    "MATCH (t:Tweet {tweetId: row.tweetId}) "
+    "UNWIND row.mentionedUsers AS mentionedUserData "
+    + MENTION_TARGET_CLAUSE
+)
+
+# Tweets acumulados antes de uma gravação, e tempo máximo (s) que um tweet espera no buffer.
+DEFAULT_BUFFER_SIZE = 1000
+DEFAULT_FLUSH_INTERVAL = 5.0
+
+def _batch_rows(tweets):
+    """
+    Separa os tweets mapeados nas linhas de cada query em lote (usuários, tweets, POSTED, hashtags, menções).
+    Tweets com 'sentiment' (resultado do sentiment_analysis.analyzer) já gravam o rótulo e o score.
+    """
+    users, tweet_rows, posted, hashtags, mentions = [], [], [], [], []
+    for tweet_data in tweets:
+        sentiment = tweet_data.get('sentiment') or {}
+        users.append({
+            'userId': tweet_data['author_id'], 'username': tweet_data.get('author_username'),
+            'usernameKey': _username_key(tweet_data.get('author_username')),
+            'location': tweet_data.get('author_location'), 'description': tweet_data.get('author_description'),
+            'createdAt': tweet_data.get('author_created_at'),
+            'followersCount': tweet_data.get('author_followers_count'),
+            'isVerified': tweet_data.get('author_is_verified'),
+        })
+        tweet_rows.append({
+            'tweetId': tweet_data['tweet_id'], 'text': tweet_data['text'], 'createdAt': tweet_data.get('created_at'),
+            'source': tweet_data.get('source'), 'lang': tweet_data.get('lang'),
+            'retweetCount': tweet_data.get('retweet_count'), 'likeCount': tweet_data.get('like_count'),
+            'replyCount': tweet_data.get('reply_count'), 'quoteCount': tweet_data.get('quote_count'),
+            'isRetweet': tweet_data.get('is_retweet'),
+            'sentimentLabel': sentiment.get('label'),
+            'sentimentScore': sentiment.get('score_compound', sentiment.get('score')),
+        })
+        posted.append({'authorId': tweet_data['author_id'], 'tweetId': tweet_data['tweet_id']})
+        if tweet_data.get('hashtags'):
+            hashtags.append({'tweetId': tweet_data['tweet_id'], 'tags': tweet_data['hashtags']})
+        mentioned_users = _mentioned_users(tweet_data.get('mentions'))
+        if mentioned_users:
+            mentions.append({'tweetId': tweet_data['tweet_id'], 'mentionedUsers': mentioned_users})
+    return [('usuario', BATCH_USER_QUERY, users), ('tweet', BATCH_TWEET_QUERY, tweet_rows),
+            ('posted', BATCH_POSTED_QUERY, posted), ('hashtag', BATCH_HASHTAG_QUERY, hashtags),
+            ('mencao', BATCH_MENTION_QUERY, mentions)]
+
+def _write_tweet_batch(tx, statements):
+    """Executa as queries do lote em sequência, na mesma transação (nós antes das relações)."""
+    for family, query, rows in statements:
+        if rows:
+            query_profiler.run(tx, query, family, rows=rows)
+
+def tweet_batch_writer(batch_size=DEFAULT_BUFFER_SIZE):
+    """
+    AdaptiveWriter que grava lotes de tweets mapeados (no máximo `batch_size` por transação).
+    Tweets que falham sozinhos vão para data/dead_letter/tweet_lote.jsonl.
+    """
+    return adaptive_writer.AdaptiveWriter(
+        'tweet_lote', lambda tx, batch: _write_tweet_batch(tx, _batch_rows(batch)),
+        sizer=adaptive_writer.BatchSizer(initial=batch_size, max_size=batch_size))
+
+class GraphWriter:
+    """
+    Escritor com buffer para tweets mapeados: add() acumula os tweets e, quando o buffer
+    chega a `buffer_size` tweets ou o mais antigo espera há `flush_interval` segundos,
+    grava usuários, tweets, POSTED, hashtags e menções de todos eles em uma única
+    transação (uma ida ao banco por lote em vez de até quatro por tweet).
+    Ao sair do `with`, o que restou no buffer é gravado.
+
+    O prazo é verificado em add() e em flush_if_due(); quem recebe tweets de forma
+    irregular (ex: um stream) deve chamar flush_if_due() periodicamente.
+
+    A gravação usa um adaptive_writer.AdaptiveWriter: se o lote for grande demais para o
+    servidor ele é dividido, erros transitórios são repetidos e tweets que falham sozinhos
+    vão para data/dead_letter/tweet_lote.jsonl, sem derrubar o resto do lote.
+
+    Com `resolver` (data_processing.mention_resolver.MentionResolver), cada autor recebido entra
+    no índice de handles e as menções são resolvidas para userIds antes de entrar no buffer.
+    """
+
+    def __init__(self, driver, buffer_size=DEFAULT_BUFFER_SIZE, flush_interval=DEFAULT_FLUSH_INTERVAL,
+                 database="neo4j", resolver=None):
+        if buffer_size <= 0:
+            raise ValueError("O tamanho do buffer deve ser positivo.")
+        self.driver = driver
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.database = database
+        self.resolver = resolver
+        self.written = 0
+        self.failed = 0
+        self.writer = tweet_batch_writer(buffer_size)
+        self._buffer = []
+        self._oldest = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.flush()
+
+    def __len__(self):
+        return len(self._buffer)
+
+    def add(self, tweet_data):
+        """Adiciona um tweet mapeado ao buffer, gravando o lote se algum limite foi atingido."""
+        if not tweet_data:
+            return
+        if self.resolver is not None:
+            self.resolver.add_tweet(tweet_data)
+            self.resolver.resolve_mentions(tweet_data)
+        if not self._buffer:
+            self._oldest = time.monotonic()
+        self._buffer.append(tweet_data)
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+        else:
+            self.flush_if_due()
+
+    def add_many(self, tweets):
+        for tweet_data in tweets:
+            self.add(tweet_data)
+
+    def flush_if_due(self):
+        """Grava o buffer se o tweet mais antigo já esperou `flush_interval` segundos."""
+        if self._buffer and time.monotonic() - self._oldest >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """
+        Grava todos os tweets do buffer (normalmente em uma transação). Retorna quantos foram
+        gravados. Se um erro transitório persistir, o lote é descartado com uma mensagem,
+        como em add_tweet_to_graph().
+        """
+        batch, self._buffer = self._buffer, []
+        if not batch or not self.driver:
+            return 0
+        try:
+            with self.driver.session(database=self.database) as session:
+                written, dead = self.writer.write(session, batch)
+        except exceptions.Neo4jError as e:
+            self.failed += len(batch)
+            print(f"ERRO Neo4j [graph_builder] ao gravar lote de {len(batch)} tweets "
+                  f"(IDs {batch[0].get('tweet_id')} a {batch[-1].get('tweet_id')}): {e}")
+            return 0
+        except Exception as e:
+            self.failed += len(batch)
+            print(f"ERRO GERAL [graph_builder] ao gravar lote de {len(batch)} tweets: {e}")
+            return 0
+        self.written += written
+        self.failed += dead
+        metrics.increment('pipeline_rows_total', written, stage='graph_builder')
+        return written
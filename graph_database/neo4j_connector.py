@@ -1,14 +1,19 @@
 # analise_tweets_neo4j/graph_database/neo4j_connector.py
 
+import atexit
+import threading
+
 from neo4j import GraphDatabase, exceptions
 from config import settings # Importa suas configurações (URI, USER, PASSWORD)
 
-# Variável global para armazenar o driver, se você quiser gerenciá-lo globalmente (opcional)
-# _driver = None
+# Driver compartilhado pelo processo: o pool de conexões é criado (e a conectividade
+# verificada) uma única vez, e todas as chamadas de connect_db() o reutilizam.
+_driver = None
+_driver_lock = threading.Lock()
 
-def connect_db():
+def get_credentials():
     """
-    Cria e retorna uma instância do driver do Neo4j.
+    Retorna (uri, (usuário, senha)) das configurações, ou None se estiverem incompletas.
     """
     uri = settings.NEO4J_URI
     user = settings.NEO4J_USER
@@ -18,36 +23,88 @@ def connect_db():
         print("ERRO: Credenciais do Neo4j (URI, USER, PASSWORD) não estão completamente configuradas.")
         print("Verifique seu arquivo .env e config/settings.py.")
         return None
+    return uri, (user, password)
+
+def driver_config():
+    """
+    Configuração do pool e das sessões, lida de config/settings.py. É a mesma para o
+    driver síncrono e o assíncrono (ver async_neo4j_connector.py).
+    """
+    return {
+        'database': settings.NEO4J_DATABASE,
+        'max_connection_pool_size': settings.NEO4J_MAX_POOL_SIZE,
+        'connection_acquisition_timeout': settings.NEO4J_ACQUISITION_TIMEOUT,
+        'max_connection_lifetime': settings.NEO4J_MAX_CONNECTION_LIFETIME,
+        'fetch_size': settings.NEO4J_FETCH_SIZE,
+    }
+
+def connect_db():
+    """
+    Retorna o driver do Neo4j compartilhado pelo processo, criando-o na primeira chamada.
+    """
+    global _driver
+    with _driver_lock:
+        if _driver is not None:
+            return _driver
+
+        credentials = get_credentials()
+        if credentials is None:
+            return None
+        uri, auth = credentials
 
+        try:
+            driver = GraphDatabase.driver(uri, auth=auth, **driver_config())
+            # Verifica a conectividade
+            driver.verify_connectivity()
+            print(f"INFO: Conectado com sucesso ao Neo4j em {uri}")
+            _driver = driver
+            return driver
+        except exceptions.AuthError as e:
+            print(f"ERRO DE AUTENTICAÇÃO: Não foi possível conectar ao Neo4j. Verifique usuário e senha.")
+            print(f"Detalhes: {e}")
+            return None
+        except exceptions.ServiceUnavailable as e:
+            print(f"ERRO DE SERVIÇO: Não foi possível conectar ao Neo4j em {uri}. O servidor está rodando?")
+            print(f"Detalhes: {e}")
+            return None
+        except Exception as e:
+            print(f"ERRO DESCONHECIDO ao conectar ao Neo4j: {e}")
+            return None
+
+def check_health(driver):
+    """
+    Verifica se o servidor responde a uma query trivial. Retorna True/False.
+    """
     try:
-        driver = GraphDatabase.driver(uri, auth=(user, password))
-        # Verifica a conectividade
-        driver.verify_connectivity()
-        print(f"INFO: Conectado com sucesso ao Neo4j em {uri}")
-        return driver
-    except exceptions.AuthError as e:
-        print(f"ERRO DE AUTENTICAÇÃO: Não foi possível conectar ao Neo4j. Verifique usuário e senha.")
-        print(f"Detalhes: {e}")
-        return None
-    except exceptions.ServiceUnavailable as e:
-        print(f"ERRO DE SERVIÇO: Não foi possível conectar ao Neo4j em {uri}. O servidor está rodando?")
-        print(f"Detalhes: {e}")
-        return None
+        with driver.session() as session:
+            return session.run("RETURN 1 AS ok").single()['ok'] == 1
     except Exception as e:
-        print(f"ERRO DESCONHECIDO ao conectar ao Neo4j: {e}")
-        return None
+        print(f"ERRO: O Neo4j não respondeu à verificação de saúde: {e}")
+        return False
 
 def close_db(driver):
     """
-    Fecha a conexão do driver do Neo4j.
+    Fecha a conexão do driver do Neo4j. Se for o driver compartilhado, a próxima
+    chamada de connect_db() cria um novo.
     """
+    global _driver
     if driver:
+        with _driver_lock:
+            if driver is _driver:
+                _driver = None
         try:
             driver.close()
             print("INFO: Conexão com o Neo4j fechada.")
         except Exception as e:
             print(f"ERRO ao fechar a conexão com o Neo4j: {e}")
 
+def _close_shared_driver():
+    """Fecha o driver compartilhado no encerramento do processo, se ainda estiver aberto."""
+    if _driver is not None:
+        close_db(_driver)
+
+atexit.register(_close_shared_driver)
+
 # Bloco de teste para executar este arquivo diretamente
 if __name__ == '__main__':
     print("--- Testando o conector do Neo4j ---")
@@ -0,0 +1,108 @@
+# analise_tweets_neo4j/graph_database/parallel_loader.py
+# Carga paralela em lotes: as linhas de cada família de query são particionadas pela chave
+# do nó que elas travam (ex: seguidor_id para SEGUE, tweet_id para POSSUI_HASHTAG), e cada
+# partição é escrita por um worker com sua própria sessão. Como linhas com a mesma chave
+# caem sempre na mesma partição, transações concorrentes não disputam o mesmo nó principal.
+
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+from neo4j import exceptions
+
+from graph_database import batch_writer
+from utils import metrics
+
+# Esperas (em segundos) entre as tentativas de um lote que sofreu erro transitório (ex: deadlock).
+# A sequência é fixa para que a reexecução seja determinística.
+RETRY_BACKOFF_SECONDS = (0.1, 0.2, 0.4, 0.8, 1.6)
+
+
+def partition_rows(rows, key, partitions):
+    """
+    Distribui as linhas em `partitions` listas pelo hash estável (CRC32) de `row[key]`.
+    A mesma chave sempre vai para a mesma partição, em qualquer execução.
+    """
+    buckets = [[] for _ in range(partitions)]
+    for row in rows:
+        bucket = zlib.crc32(str(row[key]).encode('utf-8')) % partitions
+        buckets[bucket].append(row)
+    return buckets
+
+
+def _write_batch_with_retry(session, query, batch, family='query'):
+    """
+    Escreve um lote em uma transação explícita (sem o retry automático do driver),
+    repetindo-o segundo RETRY_BACKOFF_SECONDS quando o erro é transitório.
+    Retorna o número de novas tentativas feitas.
+    """
+    for attempt in range(len(RETRY_BACKOFF_SECONDS) + 1):
+        try:
+            start = time.perf_counter()
+            with session.begin_transaction() as tx:
+                batch_writer._run_unwind_batch(tx, query, batch, family)
+                tx.commit()
+            batch_writer.record_transaction(family, len(batch), time.perf_counter() - start)
+            return attempt
+        except exceptions.TransientError as e:
+            if attempt == len(RETRY_BACKOFF_SECONDS):
+                metrics.increment('neo4j_failures_total', family=family)
+                raise
+            metrics.increment('neo4j_retries_total', family=family)
+            print(f"AVISO: Erro transitório em lote de {len(batch)} linhas ({e.code}). "
+                  f"Nova tentativa em {RETRY_BACKOFF_SECONDS[attempt]}s...")
+            time.sleep(RETRY_BACKOFF_SECONDS[attempt])
+        except Exception:
+            metrics.increment('neo4j_failures_total', family=family)
+            raise
+
+
+def _write_partition(driver, query, rows, batch_size, family='query', writer=None):
+    """
+    Escreve uma partição inteira com uma sessão própria. Com `writer` (um
+    adaptive_writer.AdaptiveWriter), o tamanho dos lotes e as retentativas ficam a cargo dele.
+    Retorna (lotes, retentativas, linhas no dead letter).
+    """
+    with driver.session() as session:
+        if writer is not None:
+            partition_stats = {}
+            writer.write(session, rows, stats=partition_stats)
+            family_stats = partition_stats[family]
+            return family_stats['batches'], family_stats['retries'], family_stats['dead_letter']
+        batches = 0
+        retries = 0
+        for batch in batch_writer.chunked(rows, batch_size):
+            retries += _write_batch_with_retry(session, query, batch, family)
+            batches += 1
+    return batches, retries, 0
+
+
+def write_family_in_parallel(driver, query, rows, partition_key, batch_size, workers, family='query', stats=None,
+                             writer=None):
+    """
+    Escreve todas as linhas de uma família com `workers` sessões concorrentes,
+    cada uma responsável por uma partição de `partition_key`.
+    A família só retorna quando todas as partições terminaram, para que a fase
+    seguinte (ex: relações depois dos nós) encontre os dados completos.
+    Com `writer` (adaptive_writer.AdaptiveWriter), as partições usam lotes adaptativos.
+    """
+    if stats is None:
+        stats = {}
+    family_stats = stats.setdefault(family, {'rows': 0, 'batches': 0, 'seconds': 0.0, 'retries': 0})
+    family_stats.setdefault('retries', 0)
+    family_stats.setdefault('dead_letter', 0)
+
+    partitions = [p for p in partition_rows(rows, partition_key, workers) if p]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_write_partition, driver, query, partition, batch_size, family, writer)
+                   for partition in partitions]
+        for future in futures:
+            batches, retries, dead_letter = future.result()
+            family_stats['batches'] += batches
+            family_stats['retries'] += retries
+            family_stats['dead_letter'] += dead_letter
+    family_stats['seconds'] += time.perf_counter() - start
+    family_stats['rows'] += len(rows)
+    return stats
+
@@ -0,0 +1,265 @@
+# analise_tweets_neo4j/graph_database/query_profiler.py
+# Profiling opcional das queries Cypher de escrita. Todas as escritas do projeto passam por
+# run(tx, query, family, ...): com o profiler desligado (padrão) ela só executa a query; com
+# ele ligado, uma a cada `sample_every` execuções de cada família (sempre incluindo a primeira)
+# roda com PROFILE (executa e mede db hits e linhas por operador) ou EXPLAIN (só o plano, sem
+# custo de execução extra), e:
+# - resume o plano (operadores, db hits, linhas) por família;
+# - aponta planos com varredura por rótulo ou do banco inteiro (NodeByLabelScan, AllNodesScan),
+#   sinal de índice ou constraint faltando (ex: MERGE (u:User {username: ...}));
+# - grava cada execução mais lenta que `slow_seconds` em data/profiles/slow_queries.jsonl, na
+#   hora em que acontece, e um relatório final em JSON.
+
+import json
+import os
+import re
+import threading
+import time
+
+from utils import metrics
+
+DEFAULT_PROFILE_DIR = os.path.join('data', 'profiles')
+DEFAULT_SAMPLE_EVERY = 100
+DEFAULT_SLOW_SECONDS = 1.0
+MODES = ('PROFILE', 'EXPLAIN')
+
+# Operadores que leem todos os nós de um rótulo (ou do banco) em vez de usar um índice.
+SCAN_OPERATORS = ('NodeByLabelScan', 'AllNodesScan', 'DirectedAllRelationshipsScan', 'UndirectedAllRelationshipsScan')
+
+# Comandos de schema não aceitam PROFILE/EXPLAIN.
+SCHEMA_COMMAND = re.compile(r'^\s*(CREATE|DROP|SHOW)\s+(OR\s+REPLACE\s+)?(\w+\s+)?(CONSTRAINT|INDEX|INDEXES|CONSTRAINTS)\b', re.IGNORECASE)
+
+_active = None
+
+
+def _operator_name(operator_type):
+    # No Neo4j 5 o tipo vem com o runtime (ex: 'NodeByLabelScan@neo4j').
+    return operator_type.split('@')[0]
+
+
+def summarize_plan(plan):
+    """
+    Resume um plano (summary.profile ou summary.plan do driver): lista de operadores,
+    total de db hits, linhas da raiz e as varreduras por rótulo encontradas.
+    Com EXPLAIN não há db hits nem linhas (ficam None).
+    """
+    operators = []
+    scans = []
+    db_hits = 0
+    has_hits = False
+    pending = [plan]
+    while pending:
+        node = pending.pop()
+        name = _operator_name(node.get('operatorType', '?'))
+        operators.append(name)
+        if 'dbHits' in node:
+            has_hits = True
+            db_hits += node['dbHits']
+        if name in SCAN_OPERATORS:
+            args = node.get('args', {})
+            scans.append({'operator': name, 'details': args.get('Details', args.get('LabelName', '')),
+                          'estimated_rows': args.get('EstimatedRows')})
+        pending.extend(reversed(node.get('children', [])))
+    return {
+        'operators': operators,
+        'db_hits': db_hits if has_hits else None,
+        'rows': plan.get('rows'),
+        'label_scans': scans,
+    }
+
+
+def _batch_rows(parameters):
+    rows = parameters.get('rows')
+    return len(rows) if isinstance(rows, list) else None
+
+
+class QueryProfiler:
+    """
+    Amostra execuções por família de query e acumula os resumos de plano e as queries lentas.
+    Ative com enable()/`with profiler:`; ao desativar, grava o relatório em `output_dir`.
+    """
+
+    def __init__(self, mode='PROFILE', sample_every=DEFAULT_SAMPLE_EVERY, slow_seconds=DEFAULT_SLOW_SECONDS,
+                 output_dir=DEFAULT_PROFILE_DIR):
+        mode = mode.upper()
+        if mode not in MODES:
+            raise ValueError(f"Modo de profiling inválido: {mode} (use PROFILE ou EXPLAIN)")
+        self.mode = mode
+        self.sample_every = max(1, sample_every)
+        self.slow_seconds = slow_seconds
+        self.output_dir = output_dir
+        self.slow_log_path = os.path.join(output_dir, 'slow_queries.jsonl')
+        self._lock = threading.Lock()
+        self.families = {}
+
+    def __enter__(self):
+        enable(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        disable()
+
+    def _family(self, family, query):
+        stats = self.families.get(family)
+        if stats is None:
+            stats = self.families[family] = {
+                'query': query.strip(), 'executions': 0, 'sampled': 0, 'seconds': 0.0, 'max_seconds': 0.0,
+                'slow': 0, 'db_hits': 0, 'last_plan': None, 'label_scans': [],
+            }
+        return stats
+
+    def _should_sample(self, family, query):
+        if SCHEMA_COMMAND.match(query):
+            return False
+        with self._lock:
+            executions = self._family(family, query)['executions']
+        return executions % self.sample_every == 0
+
+    def run(self, tx, query, family, parameters):
+        """Executa a query na transação (amostrando o plano quando for a vez) e retorna o summary."""
+        sample = self._should_sample(family, query)
+        plan = None
+        if sample and self.mode == 'EXPLAIN':
+            plan = getattr(tx.run('EXPLAIN ' + query, parameters).consume(), 'plan', None)
+
+        start = time.perf_counter()
+        summary = tx.run(('PROFILE ' if sample and self.mode == 'PROFILE' else '') + query, parameters).consume()
+        elapsed = time.perf_counter() - start
+        if sample and self.mode == 'PROFILE':
+            plan = getattr(summary, 'profile', None)
+
+        self._record(family, query, parameters, elapsed, sample, summarize_plan(plan) if plan else None)
+        return summary
+
+    def _record(self, family, query, parameters, elapsed, sampled, plan_summary):
+        with self._lock:
+            stats = self._family(family, query)
+            stats['executions'] += 1
+            stats['seconds'] += elapsed
+            stats['max_seconds'] = max(stats['max_seconds'], elapsed)
+            if sampled:
+                stats['sampled'] += 1
+            if plan_summary is not None:
+                stats['last_plan'] = plan_summary
+                stats['db_hits'] += plan_summary['db_hits'] or 0
+                new_scans = [scan for scan in plan_summary['label_scans'] if scan not in stats['label_scans']]
+                stats['label_scans'].extend(new_scans)
+            else:
+                new_scans = []
+            slow = elapsed >= self.slow_seconds
+            if slow:
+                stats['slow'] += 1
+            last_plan = stats['last_plan']
+
+        for scan in new_scans:
+            metrics.increment('neo4j_label_scans_total', family=family)
+            print(f"ALERTA [profiler]: A query '{family}' faz {scan['operator']} ({scan['details']}). "
+                  f"Falta um índice ou constraint para essa busca?")
+        if slow:
+            metrics.increment('neo4j_slow_queries_total', family=family)
+            self._log_slow({
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'family': family,
+                'seconds': round(elapsed, 4),
+                'batch_rows': _batch_rows(parameters),
+                'sampled': sampled,
+                # Sem amostra nesta execução, anexa o último plano conhecido da família.
+                'plan': plan_summary or last_plan,
+                'query': query.strip(),
+            })
+
+    def _log_slow(self, entry):
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            with self._lock, open(self.slow_log_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        except OSError as e:
+            print(f"AVISO: Não foi possível gravar a query lenta em {self.slow_log_path}: {e}")
+
+    def report(self):
+        """Relatório por família: execuções, tempos, db hits, último plano e varreduras por rótulo."""
+        with self._lock:
+            families = {}
+            for family, stats in self.families.items():
+                families[family] = {
+                    **{key: value for key, value in stats.items() if key != 'seconds'},
+                    'total_seconds': round(stats['seconds'], 4),
+                    'mean_seconds': round(stats['seconds'] / stats['executions'], 6) if stats['executions'] else None,
+                    'max_seconds': round(stats['max_seconds'], 4),
+                }
+        return {
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'mode': self.mode,
+            'sample_every': self.sample_every,
+            'slow_seconds': self.slow_seconds,
+            'families_with_label_scans': sorted(f for f, stats in families.items() if stats['label_scans']),
+            'families': families,
+        }
+
+    def write_report(self, path=None):
+        """Grava o relatório em JSON (por padrão em data/profiles/profile_<data>.json) e retorna o caminho."""
+        if path is None:
+            path = os.path.join(self.output_dir, f"profile_{time.strftime('%Y%m%d-%H%M%S')}.json")
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=2, ensure_ascii=False)
+        return path
+
+    def print_summary(self):
+        report = self.report()
+        print(f"\nProfiling das queries ({self.mode}, 1 a cada {self.sample_every} execuções por família):")
+        for family, stats in report['families'].items():
+            plan = stats['last_plan'] or {}
+            print(f"  {family:<16} {stats['executions']:>8} execuções | média {stats['mean_seconds'] or 0:.4f}s | "
+                  f"máx {stats['max_seconds']:.4f}s | {stats['slow']} lentas | db hits (amostras) {stats['db_hits']} | "
+                  f"operadores: {' > '.join(plan.get('operators', [])) or '-'}")
+        if report['families_with_label_scans']:
+            print(f"ALERTA [profiler]: Varredura por rótulo em: {', '.join(report['families_with_label_scans'])}")
+
+
+def enable(profiler):
+    """Liga o profiler para todas as chamadas de run() do processo."""
+    global _active
+    _active = profiler
+
+
+def disable():
+    """Desliga o profiler ativo, imprimindo o resumo e gravando o relatório."""
+    global _active
+    profiler, _active = _active, None
+    if profiler is not None:
+        profiler.print_summary()
+        try:
+            print(f"INFO: Relatório de profiling gravado em {profiler.write_report()}")
+        except OSError as e:
+            print(f"AVISO: Não foi possível gravar o relatório de profiling: {e}")
+
+
+def run(tx, query, family='query', parameters=None, **kwargs):
+    """
+    Executa `query` na transação `tx` e consome o resultado, retornando o summary.
+    É o ponto único de execução das escritas: com um profiler ativo, a execução pode ser
+    amostrada com PROFILE/EXPLAIN e entra nas estatísticas da família `family`.
+    """
+    parameters = {**(parameters or {}), **kwargs}
+    profiler = _active
+    if profiler is None:
+        return tx.run(query, parameters).consume()
+    return profiler.run(tx, query, family, parameters)
+
+
+def add_arguments(parser):
+    """Adiciona ao argparse as opções de profiling comuns aos scripts do pipeline."""
+    parser.add_argument('--profile-queries', choices=MODES, type=str.upper, default=None,
+                        help="Amostra as queries de escrita com PROFILE (executa e mede) ou EXPLAIN (só o plano).")
+    parser.add_argument('--profile-every', type=int, default=DEFAULT_SAMPLE_EVERY,
+                        help=f"Amostra 1 a cada N execuções de cada família (padrão: {DEFAULT_SAMPLE_EVERY}).")
+    parser.add_argument('--slow-query-seconds', type=float, default=DEFAULT_SLOW_SECONDS,
+                        help=f"Execuções acima deste tempo vão para {DEFAULT_PROFILE_DIR}/slow_queries.jsonl (padrão: {DEFAULT_SLOW_SECONDS:g}).")
+
+
+def profiler_from_args(args):
+    """QueryProfiler a partir das opções de add_arguments(), ou None se o profiling não foi pedido."""
+    if not args.profile_queries:
+        return None
+    return QueryProfiler(mode=args.profile_queries, sample_every=args.profile_every, slow_seconds=args.slow_query_seconds)
@@ -0,0 +1,176 @@
+# analise_tweets_neo4j/graph_database/schema.py
+# Schema declarativo do banco: as constraints e os índices dos dois modelos de grafo do projeto
+# (Usuario/Tweet.id, da carga em 1_populate_graph.py, e User/Tweet.tweetId, do graph_builder).
+# ensure_schema() compara a declaração com SHOW CONSTRAINTS / SHOW INDEXES, cria só o que
+# falta e espera os índices ficarem ONLINE antes da carga, para que nenhuma busca quente
+# (MERGE pela chave, faixa de Tweet.id, filtros por sentimento e data) caia numa varredura.
+# Rodar de novo não recria nada: a comparação é pela definição (rótulo, propriedades, tipo),
+# não pelo nome, então constraints criadas antes com nomes automáticos também valem.
+
+import time
+
+from neo4j import exceptions
+
+# (nome, rótulo, propriedade) das constraints de unicidade. Cada uma cria também um índice
+# RANGE na propriedade, que atende as buscas por igualdade e por faixa (ex: Tweet.id).
+CONSTRAINTS = [
+    # Modelo da carga (1_populate_graph.py)
+    ('usuario_id_unique', 'Usuario', 'id'),
+    ('tweet_id_unique', 'Tweet', 'id'),
+    ('midia_url_unique', 'Midia', 'url'),
+    ('hashtag_nome_unique', 'Hashtag', 'nome'),
+    ('assunto_nome_unique', 'Assunto', 'nome'),
+    # Modelo do graph_builder
+    ('user_user_id_unique', 'User', 'userId'),
+    ('tweet_tweet_id_unique', 'Tweet', 'tweetId'),
+    ('hashtag_tag_unique', 'Hashtag', 'tag'),
+]
+
+# (nome, tipo, rótulo, propriedade) dos índices das propriedades filtradas fora das chaves.
+INDEXES = [
+    ('tweet_sentiment_label', 'RANGE', 'Tweet', 'sentimentLabel'),
+    ('tweet_criado_em', 'RANGE', 'Tweet', 'criado_em'),
+    ('usuario_handle_text', 'TEXT', 'Usuario', 'handle'),
+    ('user_username', 'RANGE', 'User', 'username'),
+    # Handle normalizado (sem '@', minúsculas), usado para ligar menções a autores já gravados.
+    ('user_username_key', 'RANGE', 'User', 'usernameKey'),
+]
+
+# O tipo das constraints de unicidade mudou de nome ao longo do Neo4j 5.
+UNIQUENESS_TYPES = ('UNIQUENESS', 'NODE_PROPERTY_UNIQUENESS')
+
+# Tempo máximo (s) esperando os índices ficarem ONLINE, e intervalo entre as verificações.
+DEFAULT_AWAIT_TIMEOUT = 600
+AWAIT_POLL_SECONDS = 2.0
+
+
+def constraint_statement(name, label, prop):
+    return f"CREATE CONSTRAINT {name} IF NOT EXISTS FOR (n:{label}) REQUIRE n.{prop} IS UNIQUE"
+
+
+def index_statement(name, index_type, label, prop):
+    return f"CREATE {index_type} INDEX {name} IF NOT EXISTS FOR (n:{label}) ON (n.{prop})"
+
+
+def create_statements():
+    """Todos os comandos de criação do schema declarado, na ordem em que são aplicados."""
+    return ([constraint_statement(*constraint) for constraint in CONSTRAINTS]
+            + [index_statement(*index) for index in INDEXES])
+
+
+def _existing_schema(session):
+    """Constraints de unicidade e índices do banco, como {definição: nome} e {definição: estado}."""
+    constraints = {}
+    for record in session.run("SHOW CONSTRAINTS YIELD name, type, labelsOrTypes, properties"):
+        if record['type'] in UNIQUENESS_TYPES and len(record['properties']) == 1:
+            constraints[(record['labelsOrTypes'][0], record['properties'][0])] = record['name']
+
+    indexes = {}
+    for record in session.run("SHOW INDEXES YIELD name, type, entityType, labelsOrTypes, properties, state, "
+                              "owningConstraint"):
+        # Índices LOOKUP (de rótulo) e os criados pelas constraints não são declarados aqui.
+        if record['entityType'] != 'NODE' or not record['properties'] or record['owningConstraint']:
+            continue
+        key = (record['type'], record['labelsOrTypes'][0], tuple(record['properties']))
+        indexes[key] = {'name': record['name'], 'state': record['state']}
+    return constraints, indexes
+
+
+def diff_schema(session):
+    """
+    Compara a declaração com o banco. Retorna um dicionário com:
+    - create: comandos para o que falta (constraints antes dos índices);
+    - extra: nomes de constraints/índices existentes que não estão declarados (só informativo);
+    - existing: quantos itens declarados já existem.
+    """
+    constraints, indexes = _existing_schema(session)
+    declared_constraints = {(label, prop) for _, label, prop in CONSTRAINTS}
+    declared_indexes = {(index_type, label, (prop,)) for _, index_type, label, prop in INDEXES}
+
+    create = [constraint_statement(name, label, prop) for name, label, prop in CONSTRAINTS
+              if (label, prop) not in constraints]
+    create += [index_statement(name, index_type, label, prop) for name, index_type, label, prop in INDEXES
+               if (index_type, label, (prop,)) not in indexes]
+    extra = ([name for key, name in constraints.items() if key not in declared_constraints]
+             + [index['name'] for key, index in indexes.items() if key not in declared_indexes])
+    return {
+        'create': create,
+        'extra': sorted(extra),
+        'existing': len(CONSTRAINTS) + len(INDEXES) - len(create),
+    }
+
+
+def await_indexes(session, timeout=DEFAULT_AWAIT_TIMEOUT):
+    """
+    Espera todos os índices do banco saírem de POPULATING, mostrando o progresso.
+    Levanta RuntimeError se algum índice falhar ou se o prazo acabar.
+    """
+    deadline = time.monotonic() + timeout
+    last_report = None
+    while True:
+        pending = []
+        for record in session.run("SHOW INDEXES YIELD name, state, populationPercent"):
+            if record['state'] == 'FAILED':
+                raise RuntimeError(f"O índice '{record['name']}' falhou ao ser populado.")
+            if record['state'] != 'ONLINE':
+                pending.append(f"{record['name']} ({record['populationPercent'] or 0:.0f}%)")
+        if not pending:
+            return
+        if time.monotonic() >= deadline:
+            raise RuntimeError(f"Índices ainda não estão ONLINE após {timeout}s: {', '.join(pending)}")
+        report = ', '.join(pending)
+        if report != last_report:
+            print(f"  Aguardando índices: {report}")
+            last_report = report
+        time.sleep(AWAIT_POLL_SECONDS)
+
+
+def ensure_schema(driver, database=None, wait=True, timeout=DEFAULT_AWAIT_TIMEOUT):
+    """
+    Aplica apenas as diferenças entre o schema declarado e o banco e, com `wait`, espera os
+    índices ficarem ONLINE. Itens não declarados são apenas listados, nunca removidos.
+    Retorna o resultado de diff_schema() (com os comandos efetivamente aplicados em 'create').
+    """
+    with driver.session(database=database) as session:
+        diff = diff_schema(session)
+        for statement in diff['create']:
+            try:
+                session.run(statement).consume()
+            except exceptions.ClientError as e:
+                # Ex: dados existentes violam a unicidade; a carga não deve seguir sem a constraint.
+                print(f"ERRO ao aplicar '{statement}': {e}")
+                raise
+        if diff['create']:
+            print(f"Schema: {len(diff['create'])} constraints/índices criados, {diff['existing']} já existiam.")
+        else:
+            print(f"Schema: nada a alterar ({diff['existing']} constraints/índices já existem).")
+        if diff['extra']:
+            print(f"AVISO: Constraints/índices no banco fora da declaração: {', '.join(diff['extra'])}")
+        if wait:
+            await_indexes(session, timeout)
+    return diff
+
+
+if __name__ == '__main__':
+    import argparse
+    from graph_database import neo4j_connector
+
+    parser = argparse.ArgumentParser(description="Compara (e aplica) o schema declarado com o do banco.")
+    parser.add_argument('--apply', action='store_true', help="Cria o que falta e espera os índices ficarem ONLINE.")
+    parser.add_argument('--timeout', type=int, default=DEFAULT_AWAIT_TIMEOUT,
+                        help=f"Espera máxima pelos índices, em segundos (padrão: {DEFAULT_AWAIT_TIMEOUT}).")
+    args = parser.parse_args()
+
+    driver = neo4j_connector.connect_db()
+    if driver:
+        if args.apply:
+            ensure_schema(driver, timeout=args.timeout)
+        else:
+            with driver.session() as session:
+                diff = diff_schema(session)
+            print(f"{diff['existing']} itens declarados já existem.")
+            for statement in diff['create']:
+                print(f"  A criar: {statement}")
+            for name in diff['extra']:
+                print(f"  Fora da declaração: {name}")
+        neo4j_connector.close_db(driver)
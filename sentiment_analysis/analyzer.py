@@ -1,24 +1,79 @@
 # analise_tweets_neo4j/sentiment_analysis/analyzer.py
 
-from nltk.sentiment.vader import SentimentIntensityAnalyzer
-from sentiment_analysis.preprocessor import preprocess_text_for_sentiment # Importa nossa função
-
-# Inicializa o SentimentIntensityAnalyzer uma vez para reutilização
-# Isso carrega o léxico vader_lexicon que baixamos
-try:
-    analyzer = SentimentIntensityAnalyzer()
-except LookupError as e:
-    print(f"ERRO: vader_lexicon não encontrado. Por favor, execute o script de download do NLTK.")
-    print(f"Detalhes: {e}")
-    analyzer = None # Define como None para que as tentativas de uso falhem graciosamente
+import functools
+import os
+import re
+import string
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from sentiment_analysis.lexicon_cache import load_vader_resources, vader_constants
+from sentiment_analysis.preprocessor import preprocess_text_for_sentiment, preprocess_texts_for_sentiment # Importa nossas funções
+from sentiment_analysis.sentiment_cache import make_cache_key
+from utils import metrics
+
+# Número de textos enviados de uma vez a cada processo do pool de análise.
+DEFAULT_SCORING_CHUNK_SIZE = 500
+
+# O léxico VADER é carregado sob demanda, na primeira análise, a partir do cache binário
+# (lexicon_cache.py). Importar este módulo não lê o léxico nem importa o NLTK.
+_resources = None
+_resources_error = None
+_analyzer = None
+_batch_scorer = None
+
+def _load_resources():
+    """Léxico e constantes do VADER (carregados uma vez por processo), ou None se o léxico não existir."""
+    global _resources, _resources_error
+    if _resources is None and _resources_error is None:
+        try:
+            _resources = load_vader_resources()
+        except LookupError as e:
+            print(f"ERRO: vader_lexicon não encontrado. Por favor, execute o script de download do NLTK.")
+            print(f"Detalhes: {e}")
+            _resources_error = e # Não tenta de novo; as análises falham graciosamente
+    return _resources
+
+def get_batch_scorer():
+    """VaderBatchScorer do processo, criado na primeira chamada, ou None se o léxico não existir."""
+    global _batch_scorer
+    if _batch_scorer is None and _load_resources() is not None:
+        _batch_scorer = VaderBatchScorer(_resources['lexicon'], vader_constants(_resources))
+    return _batch_scorer
+
+def get_analyzer():
+    """
+    SentimentIntensityAnalyzer do próprio NLTK (importado só quando pedido), usado para textos
+    avulsos e como referência para o scorer em lote. O léxico vem do cache binário, sem reler
+    o zip. Retorna None se o léxico não existir.
+    """
+    global _analyzer
+    if _analyzer is None and _load_resources() is not None:
+        from nltk.sentiment.vader import SentimentIntensityAnalyzer, VaderConstants
+        # Mesmo estado que o __init__ do NLTK monta a partir do vader_lexicon.zip (o teste
+        # tests/test_vader_batch_scorer.py compara com um SentimentIntensityAnalyzer() comum).
+        _analyzer = SentimentIntensityAnalyzer.__new__(SentimentIntensityAnalyzer)
+        _analyzer.lexicon = _resources['lexicon']
+        _analyzer.constants = VaderConstants()
+    return _analyzer
+
+def __getattr__(name):
+    # Compatibilidade: `analyzer.analyzer` ainda devolve o SentimentIntensityAnalyzer, agora sob demanda.
+    if name == 'analyzer':
+        return get_analyzer()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def get_vader_sentiment(text):
     """
     Analisa o sentimento de um texto usando VADER e retorna os scores.
     Retorna um dicionário com 'neg', 'neu', 'pos', 'compound'.
+    Um texto avulso vai direto ao NLTK: montar os arrays do scorer em lote custa mais que
+    pontuar um único texto. Para muitos textos, use analyze_sentiments_in_batch.
     """
+    analyzer = get_analyzer()
     if analyzer is None:
-        print("ERRO: SentimentIntensityAnalyzer não foi inicializado.")
+        print("ERRO: O léxico VADER não foi carregado.")
         return {'neg': 0.0, 'neu': 0.0, 'pos': 0.0, 'compound': 0.0} # Retorno padrão em caso de erro
 
     # Pré-processa o texto antes de analisar
@@ -33,6 +88,14 @@ def get_vader_sentiment(text):
     sentiment_scores = analyzer.polarity_scores(processed_text)
     return sentiment_scores
 
+def get_lexicon_version():
+    """
+    Identificador do léxico e da versão do NLTK em uso, parte da chave do cache de
+    sentimentos: trocar qualquer um dos dois invalida os resultados guardados.
+    """
+    resources = _load_resources()
+    return resources['lexicon_version'] if resources is not None else None
+
 def classify_sentiment_from_compound_score(compound_score):
     """
     Classifica o sentimento em 'positive', 'negative', ou 'neutral'
@@ -46,16 +109,40 @@ def classify_sentiment_from_compound_score(compound_score):
     else:
         return 'neutral'
 
-def analyze_sentiment_of_tweet(tweet_text):
+def _is_valid_text(tweet_text):
+    return isinstance(tweet_text, str) and bool(tweet_text.strip())
+
+def _invalid_text_result():
+    return {'label': 'neutral', 'score': 0.0, 'error': 'Texto vazio ou inválido'}
+
+def _score_processed_text(processed_text):
+    """Analisa um texto já pré-processado (exige o léxico carregado)."""
+    return _build_sentiment_result(get_analyzer().polarity_scores(processed_text))
+
+def analyze_sentiment_of_tweet(tweet_text, cache=None):
     """
     Função completa que recebe o texto de um tweet, obtém os scores VADER,
     e classifica o sentimento.
     Retorna um dicionário com o label do sentimento e o score compound.
+    Com um SentimentCache em `cache`, textos já analisados não são analisados de novo.
     """
-    if not isinstance(tweet_text, str) or not tweet_text.strip():
-        return {'label': 'neutral', 'score': 0.0, 'error': 'Texto vazio ou inválido'}
+    if not _is_valid_text(tweet_text):
+        return _invalid_text_result()
 
-    vader_scores = get_vader_sentiment(tweet_text)
+    if cache is not None and _load_resources() is not None:
+        processed_text = preprocess_text_for_sentiment(tweet_text)
+        key = make_cache_key(processed_text, get_lexicon_version())
+        cached = cache.get(key)
+        if cached is not None:
+            return dict(cached)
+        result = _score_processed_text(processed_text)
+        cache.put(key, result)
+        return dict(result)
+
+    return _build_sentiment_result(get_vader_sentiment(tweet_text))
+
+def _build_sentiment_result(vader_scores):
+    """Converte os scores do VADER no dicionário devolvido por analyze_sentiment_of_tweet."""
     compound_score = vader_scores['compound']
     sentiment_label = classify_sentiment_from_compound_score(compound_score)
     
@@ -67,6 +154,367 @@ def analyze_sentiment_of_tweet(tweet_text):
         'score_neutral': vader_scores['neu']
     }
 
+# --- Scorer VADER em lote (NumPy) ---
+# Reimplementação vetorizada do polarity_scores do NLTK: o léxico é carregado uma vez em um
+# vocabulário (token -> id) e arrays de atributos, e um lote inteiro de textos é pontuado com
+# operações sobre arrays (valência, janelas de boosters/negações, ênfase de maiúsculas,
+# "but", idiomas, pontuação e normalização do compound). Os textos só são percorridos em
+# Python para a tokenização.
+
+_PUNCTUATION_CLASS = re.escape(string.punctuation)
+_LEADING_PUNCTUATION = re.compile(f"([{_PUNCTUATION_CLASS}]+)([^{_PUNCTUATION_CLASS}]{{2,}})")
+_TRAILING_PUNCTUATION = re.compile(f"([^{_PUNCTUATION_CLASS}]{{2,}})([{_PUNCTUATION_CLASS}]+)")
+@functools.lru_cache(maxsize=100_000)
+def _strip_vader_punctuation(token, vader_punctuation):
+    """Remove do token a pontuação da lista do VADER no início ou no fim, como o SentiText."""
+    match = _LEADING_PUNCTUATION.fullmatch(token)
+    if match and match.group(1) in vader_punctuation:
+        return match.group(2)
+    match = _TRAILING_PUNCTUATION.fullmatch(token)
+    if match and match.group(2) in vader_punctuation:
+        return match.group(1)
+    return token
+
+def tokenize_for_vader(text, vader_punctuation):
+    """
+    Tokens do texto como o SentiText do NLTK os vê: palavras com mais de um caractere, sem a
+    pontuação da lista do VADER (`vader_punctuation`, um frozenset do PUNC_LIST) no início ou
+    no fim (contrações e emoticons são mantidos).
+    """
+    punctuation = string.punctuation
+    return [token if token[0] not in punctuation and token[-1] not in punctuation
+            else _strip_vader_punctuation(token, vader_punctuation)
+            for token in text.split() if len(token) > 1]
+
+class VaderBatchScorer:
+    """
+    Pontua lotes de textos com os mesmos resultados do SentimentIntensityAnalyzer do NLTK
+    (inclusive a peculiaridade de avaliar cada token no contexto da sua primeira ocorrência
+    na frase), dentro de um arredondamento de 1e-4 no compound.
+    """
+
+    def __init__(self, lexicon, constants):
+        self.constants = constants
+        self.punctuation = frozenset(constants.PUNC_LIST)
+        words = list(dict.fromkeys(list(lexicon) + list(constants.BOOSTER_DICT) + list(constants.NEGATE)
+                                   + ['kind', 'of', 'least', 'at', 'very', 'but']))
+        self.vocabulary = {word: word_id for word_id, word in enumerate(words)}
+        # Uma posição extra no fim dos arrays representa os tokens fora do vocabulário (id -1).
+        size = len(words) + 1
+        self.valence = np.zeros(size)
+        self.in_lexicon = np.zeros(size, dtype=bool)
+        self.booster = np.zeros(size)
+        self.is_booster = np.zeros(size, dtype=bool)
+        self.is_negation = np.zeros(size, dtype=bool)
+        for word_id, word in enumerate(words):
+            if word in lexicon:
+                self.valence[word_id] = lexicon[word]
+                self.in_lexicon[word_id] = True
+            if word in constants.BOOSTER_DICT:
+                self.booster[word_id] = constants.BOOSTER_DICT[word]
+                self.is_booster[word_id] = True
+            self.is_negation[word_id] = word in constants.NEGATE
+        self.word_id = {word: self.vocabulary[word] for word in ('kind', 'of', 'least', 'at', 'very', 'but')}
+
+        # Idiomas e boosters de duas palavras comparam os tokens originais (com maiúsculas).
+        phrases = list(constants.SPECIAL_CASE_IDIOMS) + [key for key in constants.BOOSTER_DICT if ' ' in key]
+        self.phrase_words = {word: word_id for word_id, word in
+                             enumerate(dict.fromkeys(word for phrase in phrases for word in phrase.split()))}
+        self._phrase_base = len(self.phrase_words) + 1
+        self.idiom_codes = {2: {}, 3: {}}
+        for phrase, value in constants.SPECIAL_CASE_IDIOMS.items():
+            parts = phrase.split()
+            self.idiom_codes[len(parts)][int(self._phrase_code([self.phrase_words[part] for part in parts]))] = value
+        self.booster_bigram_codes = np.array([self._phrase_code([self.phrase_words[part] for part in key.split()])
+                                              for key in constants.BOOSTER_DICT if ' ' in key])
+
+    def _phrase_code(self, ids):
+        code = 0
+        for word_id in ids:
+            code = code * self._phrase_base + (np.asarray(word_id) + 1)
+        return code
+
+    def _idiom_values(self, codes, size):
+        """Valor do idioma de cada código (NaN onde não há idioma)."""
+        table = self.idiom_codes[size]
+        values = np.full(len(codes), np.nan)
+        for code, value in table.items():
+            values[codes == code] = value
+        return values
+
+    def score_tokens(self, token_lists, texts):
+        """
+        Pontua textos já tokenizados (tokenize). `texts` são os textos originais,
+        usados na ênfase de '!' e '?'. Retorna arrays (neg, neu, pos, compound) sem arredondar.
+        """
+        constants = self.constants
+        documents = len(token_lists)
+        lengths = np.fromiter((len(tokens) for tokens in token_lists), dtype=np.int64, count=documents)
+        raw = [token for tokens in token_lists for token in tokens]
+        total = len(raw)
+        doc = np.repeat(np.arange(documents), lengths)
+        starts = np.cumsum(lengths) - lengths
+        pos = np.arange(total) - starts[doc]
+
+        # Os atributos de cada token são calculados uma vez por token distinto e depois espalhados.
+        distinct = {}
+        codes = np.fromiter((distinct.setdefault(token, len(distinct)) for token in raw), dtype=np.int64, count=total)
+        uniques = list(distinct)
+        lowered = [token.lower() for token in uniques]
+        ids = np.array([self.vocabulary.get(token, -1) for token in lowered], dtype=np.int64)[codes]
+        in_lexicon = self.in_lexicon[ids]
+        is_booster = self.is_booster[ids]
+        booster = self.booster[ids]
+        negated = (self.is_negation[ids]
+                   | np.array(["n't" in token for token in lowered], dtype=bool)[codes])
+        upper = np.array([token.isupper() for token in uniques], dtype=bool)[codes]
+        never = np.array([token == 'never' for token in uniques], dtype=bool)[codes]
+        so_this = np.array([token in ('so', 'this') for token in uniques], dtype=bool)[codes]
+        phrase_ids = np.array([self.phrase_words.get(token, -1) for token in uniques], dtype=np.int64)[codes]
+        is_word = {word: ids == word_id for word, word_id in self.word_id.items()}
+
+        # Maiúsculas só contam quando algumas (mas não todas) as palavras da frase estão em caixa alta.
+        upper_count = np.bincount(doc, weights=upper, minlength=documents)
+        cap_diff_doc = (upper_count < lengths) & (upper_count > 0)
+        emphasis = upper & cap_diff_doc[doc]
+
+        # Tokens ignorados: boosters e o "kind" de "kind of"
+        length = lengths[doc]
+        next_is_of = np.zeros(total, dtype=bool)
+        next_is_of[:-1] = is_word['of'][1:] & (pos[:-1] < length[:-1] - 1)
+        active = in_lexicon & ~is_booster & ~(is_word['kind'] & next_is_of)
+
+        # Daqui em diante só os tokens com valência (uma fração pequena do total) são processados.
+        tokens = np.flatnonzero(active)
+        token_pos = pos[tokens]
+        token_length = length[tokens]
+        shifts = {}
+
+        def at(array, offset, fill):
+            """array[i + offset] para cada token com valência, com `fill` fora da frase."""
+            if offset not in shifts:
+                index = np.clip(tokens + offset, 0, max(total - 1, 0))
+                shifts[offset] = (index, (token_pos + offset >= 0) & (token_pos + offset < token_length))
+            index, valid = shifts[offset]
+            return np.where(valid, array[index], fill)
+
+        valence = self.valence[ids[tokens]]
+        valence = np.where(emphasis[tokens], np.where(valence > 0, valence + constants.C_INCR,
+                                                      valence - constants.C_INCR), valence)
+
+        for start_i, damping in ((0, 1.0), (1, 0.95), (2, 0.9)):
+            offset = -(start_i + 1)
+            window = (token_pos > start_i) & ~at(in_lexicon, offset, True)
+
+            # Booster na janela (scalar_inc_dec), com o sinal da valência acumulada
+            scalar = np.where(valence < 0, -at(booster, offset, 0.0), at(booster, offset, 0.0))
+            capped = at(is_booster, offset, False) & at(emphasis, offset, False)
+            scalar = np.where(capped, np.where(valence > 0, scalar + constants.C_INCR,
+                                               scalar - constants.C_INCR), scalar)
+            valence = np.where(window, valence + scalar * damping, valence)
+
+            # Negações e "never so/this" (_never_check)
+            if start_i == 0:
+                valence = np.where(window & at(negated, -1, False), valence * constants.N_SCALAR, valence)
+            elif start_i == 1:
+                never_so = at(never, -2, False) & at(so_this, -1, False)
+                valence = np.where(window & never_so, valence * 1.5,
+                                   np.where(window & at(negated, -2, False), valence * constants.N_SCALAR, valence))
+            else:
+                never_so = (at(never, -3, False) & at(so_this, -2, False)) | at(so_this, -1, False)
+                valence = np.where(window & never_so, valence * 1.25,
+                                   np.where(window & at(negated, -3, False), valence * constants.N_SCALAR, valence))
+                valence = self._apply_idioms(valence, window, phrase_ids, at)
+
+        # "least" (_least_check)
+        previous_least = at(is_word['least'], -1, False) & ~at(in_lexicon, -1, True)
+        at_or_very = at(is_word['at'], -2, False) | at(is_word['very'], -2, False)
+        least = previous_least & ((token_pos > 1) & ~at_or_very | (token_pos == 1))
+        valence = np.where(least, valence * constants.N_SCALAR, valence)
+
+        token_sentiment = np.zeros(total)
+        token_sentiment[tokens] = valence
+
+        # Cada token repete o resultado da primeira ocorrência do mesmo token na frase.
+        if total:
+            keys = doc * (int(codes.max()) + 1) + codes
+            _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+            sentiments = token_sentiment[first[inverse.ravel()]]
+        else:
+            sentiments = token_sentiment
+
+        # "but" (_but_check): metade antes da primeira ocorrência, 1.5x depois
+        but_position = np.full(documents, np.iinfo(np.int64).max)
+        but = is_word['but']
+        np.minimum.at(but_position, doc[but], pos[but])
+        has_but = but_position[doc] != np.iinfo(np.int64).max
+        sentiments = np.where(has_but & (pos < but_position[doc]), sentiments * 0.5,
+                              np.where(has_but & (pos > but_position[doc]), sentiments * 1.5, sentiments))
+
+        # score_valence
+        exclamations = np.minimum(np.fromiter((text.count('!') for text in texts), dtype=np.int64, count=documents), 4)
+        questions = np.fromiter((text.count('?') for text in texts), dtype=np.int64, count=documents)
+        amplifier = exclamations * 0.292 + np.where(questions > 1, np.where(questions <= 3, questions * 0.18, 0.96), 0)
+
+        sum_s = np.bincount(doc, weights=sentiments, minlength=documents)
+        sum_s = np.where(sum_s > 0, sum_s + amplifier, np.where(sum_s < 0, sum_s - amplifier, sum_s))
+        compound = sum_s / np.sqrt(sum_s * sum_s + 15)
+
+        pos_sum = np.bincount(doc, weights=np.where(sentiments > 0, sentiments + 1, 0.0), minlength=documents)
+        neg_sum = np.bincount(doc, weights=np.where(sentiments < 0, sentiments - 1, 0.0), minlength=documents)
+        neu_count = np.bincount(doc, weights=sentiments == 0, minlength=documents)
+        more_positive = pos_sum > np.abs(neg_sum)
+        more_negative = pos_sum < np.abs(neg_sum)
+        pos_sum = np.where(more_positive, pos_sum + amplifier, pos_sum)
+        neg_sum = np.where(more_negative, neg_sum - amplifier, neg_sum)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            denominator = pos_sum + np.abs(neg_sum) + neu_count
+            empty = lengths == 0
+            scores = [np.where(empty, 0.0, np.abs(part / denominator)) for part in (neg_sum, neu_count, pos_sum)]
+        return scores[0], scores[1], scores[2], np.where(empty, 0.0, compound)
+
+    def _apply_idioms(self, valence, window, phrase_ids, at):
+        """_idioms_check do NLTK para os tokens com a janela de 3 palavras ativa."""
+        word = {offset: at(phrase_ids, offset, -1) for offset in (-3, -2, -1, 0, 1, 2)}
+        code = lambda *offsets: self._phrase_code([word[offset] for offset in offsets])
+
+        idiom = np.full(len(valence), np.nan)
+        for offsets in ((-1, 0), (-2, -1, 0), (-2, -1), (-3, -2, -1), (-3, -2)):
+            idiom = np.where(np.isnan(idiom), self._idiom_values(code(*offsets), len(offsets)), idiom)
+        for offsets in ((0, 1), (0, 1, 2)):
+            following = self._idiom_values(code(*offsets), len(offsets))
+            idiom = np.where(np.isnan(following), idiom, following)
+        valence = np.where(window & ~np.isnan(idiom), idiom, valence)
+
+        booster_phrase = np.isin(code(-3, -2), self.booster_bigram_codes) | np.isin(code(-2, -1), self.booster_bigram_codes)
+        return np.where(window & booster_phrase, valence + self.constants.B_DECR, valence)
+
+    def tokenize(self, text):
+        return tokenize_for_vader(text, self.punctuation)
+
+    def polarity_scores_batch(self, texts):
+        """Equivalente em lote de SentimentIntensityAnalyzer.polarity_scores (lista de dicionários)."""
+        texts = [text if isinstance(text, str) else str(text) for text in texts]
+        neg, neu, pos, compound = self.score_tokens([self.tokenize(text) for text in texts], texts)
+        return [{'neg': round(n, 3), 'neu': round(u, 3), 'pos': round(p, 3), 'compound': round(c, 4)}
+                for n, u, p, c in zip(neg.tolist(), neu.tolist(), pos.tolist(), compound.tolist())]
+
+def _init_scoring_worker():
+    """
+    Inicializador de cada processo do pool: carrega o léxico (do cache binário, sem importar
+    o NLTK) uma única vez por worker, e não por texto ou por lote.
+    """
+    get_batch_scorer()
+
+def _analyze_chunk(texts):
+    """Analisa um pedaço de textos dentro de um worker."""
+    if get_batch_scorer() is None:
+        return [analyze_sentiment_of_tweet(text) for text in texts]
+    valid = [_is_valid_text(text) for text in texts]
+    scored = iter(_score_processed_chunk(preprocess_texts_for_sentiment(
+        [text for text, ok in zip(texts, valid) if ok])))
+    return [next(scored) if ok else _invalid_text_result() for ok in valid]
+
+def _score_processed_chunk(processed_texts):
+    """Analisa um pedaço de textos já pré-processados dentro de um worker."""
+    scorer = get_batch_scorer()
+    if scorer is None:
+        return [_build_sentiment_result(get_vader_sentiment(text)) for text in processed_texts]
+    return [_build_sentiment_result(scores) for scores in scorer.polarity_scores_batch(processed_texts)]
+
+class SentimentScoringPool:
+    """
+    Pool de processos para analisar sentimentos em lote. O VADER é Python puro e limitado
+    por CPU, então os textos são divididos em pedaços de `chunksize` e distribuídos entre
+    `workers` processos. Os resultados voltam na mesma ordem dos textos de entrada.
+    Com workers=1 a análise roda no próprio processo, sem pool.
+
+    Com um SentimentCache em `cache`, os textos são pré-processados no processo principal,
+    consultados no cache, e só os textos distintos ainda não vistos vão para os workers.
+    """
+
+    def __init__(self, workers=None, chunksize=DEFAULT_SCORING_CHUNK_SIZE, cache=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunksize = chunksize
+        self.cache = cache
+        self._executor = None
+        if self.workers > 1:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_scoring_worker)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _map_chunks(self, function, items):
+        """Aplica `function` a pedaços de `items` (no pool, se houver) e junta os resultados em ordem."""
+        if self._executor is None or len(items) <= self.chunksize:
+            return function(items)
+        chunks = [items[i:i + self.chunksize] for i in range(0, len(items), self.chunksize)]
+        results = []
+        for chunk_result in self._executor.map(function, chunks):
+            results.extend(chunk_result)
+        return results
+
+    def analyze(self, texts):
+        """
+        Retorna a lista de resultados de analyze_sentiment_of_tweet, na ordem de `texts`.
+        Textos, acertos do cache e tempo gasto entram em utils.metrics (estágio 'sentiment').
+        """
+        texts = list(texts)
+        start = time.perf_counter()
+        results = self._analyze(texts)
+        metrics.increment('pipeline_stage_seconds_total', time.perf_counter() - start, stage='sentiment')
+        metrics.increment('pipeline_rows_total', len(texts), stage='sentiment')
+        return results
+
+    def _analyze(self, texts):
+        if self.cache is None or get_batch_scorer() is None:
+            metrics.increment('sentiment_texts_total', len(texts), source='vader')
+            return self._map_chunks(_analyze_chunk, texts)
+
+        lexicon_version = get_lexicon_version()
+        valid = [_is_valid_text(text) for text in texts]
+        processed_texts = iter(preprocess_texts_for_sentiment([text for text, ok in zip(texts, valid) if ok]))
+        keys = []
+        to_score = {}
+        for ok in valid:
+            if not ok:
+                keys.append(None)
+                continue
+            processed_text = next(processed_texts)
+            key = make_cache_key(processed_text, lexicon_version)
+            keys.append(key)
+            to_score[key] = processed_text
+
+        known = self.cache.get_many([key for key in to_score])
+        missing_keys = [key for key in to_score if key not in known]
+        scored = self._map_chunks(_score_processed_chunk, [to_score[key] for key in missing_keys])
+        metrics.increment('sentiment_texts_total', len(missing_keys), source='vader')
+        # Textos repetidos no próprio lote também contam como 'cache': só um deles é analisado.
+        metrics.increment('sentiment_texts_total', sum(valid) - len(missing_keys), source='cache')
+        for key, result in zip(missing_keys, scored):
+            self.cache.put(key, result)
+            known[key] = result
+        self.cache.flush()
+
+        return [dict(known[key]) if key is not None else _invalid_text_result() for key in keys]
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+def analyze_sentiments_in_batch(texts, workers=None, chunksize=DEFAULT_SCORING_CHUNK_SIZE):
+    """
+    Atalho para analisar uma lista de textos com um pool temporário.
+    Para vários lotes seguidos, prefira manter um SentimentScoringPool aberto.
+    """
+    with SentimentScoringPool(workers, chunksize) as pool:
+        return pool.analyze(texts)
+
 if __name__ == '__main__':
     # Exemplos de teste
     tweets_de_exemplo = [
@@ -80,6 +528,7 @@ if __name__ == '__main__':
         "The service was good, but the food was terrible." # Exemplo misto
     ]
 
+    analyzer = get_analyzer()
     if analyzer: # Só executa se o analyzer foi inicializado com sucesso
         for i, tweet in enumerate(tweets_de_exemplo):
             print(f"\n--- Tweet de Exemplo {i+1} ---")
@@ -95,5 +544,18 @@ if __name__ == '__main__':
             print(f"Sentimento Classificado: {sentiment_result['label']}")
             print(f"Score Compound: {sentiment_result['score_compound']:.4f}") # Formata para 4 casas decimais
             print(f"  Scores Detalhados: Pos: {sentiment_result['score_positive']:.4f}, Neu: {sentiment_result['score_neutral']:.4f}, Neg: {sentiment_result['score_negative']:.4f}")
+
+        # Confere o scorer em lote contra o NLTK nos mesmos exemplos
+        import time
+        processed = preprocess_texts_for_sentiment(tweets_de_exemplo * 200)
+        start = time.perf_counter()
+        reference = [analyzer.polarity_scores(text) for text in processed]
+        nltk_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        batch = get_batch_scorer().polarity_scores_batch(processed)
+        batch_seconds = time.perf_counter() - start
+        deviation = max(abs(ref[key] - got[key]) for ref, got in zip(reference, batch) for key in ref)
+        print(f"\nScorer em lote: diferença máxima para o NLTK {deviation:.4f}; "
+              f"{nltk_seconds:.3f}s (NLTK) vs {batch_seconds:.3f}s (lote) para {len(processed)} textos.")
     else:
         print("\nNão foi possível executar os exemplos pois o SentimentIntensityAnalyzer não foi carregado.")
\ No newline at end of file
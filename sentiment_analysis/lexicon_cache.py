@@ -0,0 +1,124 @@
+# analise_tweets_neo4j/sentiment_analysis/lexicon_cache.py
+# Cache binário do léxico VADER. Importar o NLTK e ler o vader_lexicon.zip custa centenas de
+# milissegundos, pagos de novo em cada processo do pool de análise. Aqui o léxico já convertido
+# (e as constantes do VADER) ficam em um pickle local, que carrega em poucos milissegundos e
+# dispensa importar o NLTK. O cache é refeito se o zip do léxico ou a versão do NLTK mudarem.
+
+import hashlib
+import os
+import pickle
+import types
+
+DEFAULT_LEXICON_CACHE_PATH = os.path.join('data', '.vader_lexicon.pickle')
+
+# Muda quando o conteúdo do cache muda de formato.
+CACHE_FORMAT = 1
+
+
+def _source_signature(path):
+    """Identifica o arquivo de origem do léxico (caminho, data de modificação e tamanho)."""
+    stat = os.stat(path)
+    return path, stat.st_mtime_ns, stat.st_size
+
+
+def lexicon_version(nltk_version, lexicon):
+    """Hash da versão do NLTK e do léxico, usado nas chaves do cache de sentimentos."""
+    digest = hashlib.sha1(nltk_version.encode('utf-8'))
+    for word, valence in sorted(lexicon.items()):
+        digest.update(f"{word}\t{valence}\n".encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def build_vader_resources():
+    """
+    Lê o léxico e as constantes direto do NLTK (caminho lento).
+    Levanta LookupError se o vader_lexicon não foi baixado.
+    """
+    import nltk
+    from nltk.sentiment.vader import SentimentIntensityAnalyzer, VaderConstants
+
+    pointer = nltk.data.find('sentiment/vader_lexicon.zip')
+    source = getattr(pointer, 'path', None) or pointer.zipfile.filename
+    lexicon = SentimentIntensityAnalyzer().lexicon
+    constants = VaderConstants()
+    return {
+        'format': CACHE_FORMAT,
+        'nltk_version': nltk.__version__,
+        'source': _source_signature(source),
+        'lexicon': lexicon,
+        'lexicon_version': lexicon_version(nltk.__version__, lexicon),
+        'constants': {
+            'B_INCR': constants.B_INCR,
+            'B_DECR': constants.B_DECR,
+            'C_INCR': constants.C_INCR,
+            'N_SCALAR': constants.N_SCALAR,
+            'NEGATE': set(constants.NEGATE),
+            'BOOSTER_DICT': dict(constants.BOOSTER_DICT),
+            'SPECIAL_CASE_IDIOMS': dict(constants.SPECIAL_CASE_IDIOMS),
+            'PUNC_LIST': list(constants.PUNC_LIST),
+        },
+    }
+
+
+def _installed_nltk_version():
+    """Versão do NLTK instalada, lida dos metadados do pacote (sem importar o NLTK)."""
+    # Importado aqui: o importlib.metadata sozinho estoura o orçamento de import deste módulo.
+    import importlib.metadata
+    try:
+        return importlib.metadata.version('nltk')
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+
+def _is_current(resources):
+    """
+    True se o cache tem o formato atual, foi gerado com o NLTK instalado e o zip do léxico
+    não mudou desde então.
+    """
+    if not isinstance(resources, dict) or resources.get('format') != CACHE_FORMAT:
+        return False
+    if resources.get('nltk_version') != _installed_nltk_version():
+        return False
+    path = resources['source'][0]
+    try:
+        return _source_signature(path) == resources['source']
+    except OSError:
+        return False
+
+
+def _save(resources, path):
+    directory = os.path.dirname(path)
+    try:
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp.{os.getpid()}"
+        with open(tmp_path, 'wb') as file:
+            pickle.dump(resources, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        # Sem permissão de escrita, seguimos sem cache: o léxico só é relido na próxima execução.
+        print(f"AVISO: Não foi possível gravar o cache do léxico em {path}: {e}")
+
+
+def load_vader_resources(path=DEFAULT_LEXICON_CACHE_PATH, rebuild=False):
+    """
+    Retorna o léxico e as constantes do VADER, do cache se ele estiver válido ou do NLTK
+    (gravando o cache para as próximas execuções). Levanta LookupError se o léxico não existir.
+    """
+    if not rebuild and os.path.exists(path):
+        try:
+            with open(path, 'rb') as file:
+                resources = pickle.load(file)
+            if _is_current(resources):
+                return resources
+        except (OSError, pickle.UnpicklingError, EOFError, KeyError, TypeError, IndexError):
+            pass # cache corrompido ou de outra versão: é refeito abaixo
+
+    resources = build_vader_resources()
+    _save(resources, path)
+    return resources
+
+
+def vader_constants(resources):
+    """Objeto com os mesmos atributos do VaderConstants do NLTK, a partir dos recursos carregados."""
+    return types.SimpleNamespace(**resources['constants'])
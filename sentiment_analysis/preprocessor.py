@@ -6,53 +6,100 @@ import re
 
 # stop_words_en = set(stopwords.words('english')) if 'stopwords' in nltk.corpus.util.available_corpora else set()
 
-def preprocess_text_for_sentiment(text):
+# Um único regex, compilado uma vez, reconhece em uma só varredura todos os tokens especiais do
+# tweet. A alternância é tentada da esquerda para a direita em cada posição, então uma URL
+# é consumida inteira antes que um '@' ou '#' dentro dela seja visto como menção/hashtag.
+# Menções e hashtags param antes de um 'http'/'www' colado (ex: "#COVIDhttps://t.co/x"),
+# como na limpeza antiga, que removia as URLs antes de procurar as menções.
+_WORD = r'(?:(?!(?:http|www)\S)\w)+'
+TOKEN_PATTERN = re.compile(
+    r'(?P<url>http\S+|www\S+)'                                   # URL: removida do texto
+    rf'|@(?P<mention>{_WORD})'                                   # @user: removida do texto e listada
+    rf'|@\s(?=(?P<spaced_mention>{_WORD}))'                      # "@ user": listada, mantida no texto
+    rf'|#(?P<hashtag>{_WORD})'                                   # hashtag: listada, mantida no texto
+)
+
+def normalize_text(text):
     """
-    Realiza uma limpeza básica no texto para análise de sentimento com VADER.
-    VADER é sensível a maiúsculas e pontuação para intensidade, então algumas
-    limpezas padrão (como lowercasing total ou remoção de pontuação)
-    devem ser feitas com cuidado ou omitidas.
+    Percorre o texto uma única vez e retorna (texto limpo para o VADER, menções, hashtags).
+    Menções e hashtags vêm sem '@'/'#', sem repetição e na ordem em que aparecem.
     """
     if not isinstance(text, str):
-        return ""
+        return "", [], []
+    if '@' not in text and '#' not in text and 'http' not in text and 'www' not in text:
+        # Sem tokens especiais (a maioria dos tweets): basta normalizar os espaços
+        return " ".join(text.split()), [], []
 
-    # 1. Remover URLs
-    text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
-    
-    # 2. Remover menções de usuário (@username) - geralmente não contribuem para o sentimento do texto em si.
-    #    VADER não tem scores para nomes de usuário.
-    text = re.sub(r'@\w+', '', text)
-    
-    # 3. Remover hashtags (o símbolo '#') mas manter a palavra da tag.
-    #    VADER pode ter scores para palavras que são comumente usadas como hashtags.
-    #    Ex: '#खुश' (Hindi para feliz) tem score no léxico VADER. #happy também.
-    #    Alternativamente, poderia remover a hashtag inteira: re.sub(r'#\w+', '', text)
-    # text = text.replace('#', '') # Remove apenas o símbolo '#'
-    
-    # 4. Remover caracteres especiais (exceto pontuação que VADER usa, como '!' ou '?')
-    #    Esta etapa é opcional e pode ser muito agressiva para VADER.
-    #    VADER lida bem com muita "bagunça" de mídias sociais.
-    #    text = re.sub(r'[^A-Za-z0-9\s.!?]', '', text) # Exemplo, mantém letras, números, espaços e .!?
+    mentions = []
+    hashtags = []
+
+    def replace(match):
+        kind = match.lastgroup
+        if kind == 'url':
+            return ''
+        if kind == 'mention':
+            # Nomes de usuário não têm score no VADER e não contribuem para o sentimento.
+            mentions.append(match.group(kind))
+            return ''
+        if kind == 'spaced_mention':
+            mentions.append(match.group(kind))
+        else:
+            # O símbolo '#' é mantido: o VADER pode ter scores para palavras usadas como
+            # hashtags (ex: #happy), e remover a hashtag inteira apagaria esse sinal.
+            hashtags.append(match.group(kind))
+        return match.group(0)
+
+    # Remove espaços extras (inclusive os deixados pelos tokens removidos)
+    cleaned = " ".join(TOKEN_PATTERN.sub(replace, text).split())
+    return cleaned, list(dict.fromkeys(mentions)), list(dict.fromkeys(hashtags))
 
-    # 5. Remover espaços extras
-    text = " ".join(text.split())
+def normalize_texts(texts):
+    """
+    Versão em lote de normalize_text para listas ou Series. Retorna três listas alinhadas
+    com a entrada: (textos limpos, menções, hashtags). Textos repetidos (ex: retweets)
+    são processados uma vez só; as listas devolvidas para repetições são cópias.
+    """
+    if hasattr(texts, 'tolist'):
+        texts = texts.tolist()
+    seen = {}
+    cleaned, mentions, hashtags = [], [], []
+    for text in texts:
+        try:
+            result = seen.get(text)
+        except TypeError: # valor não hashável
+            result = None
+        if result is None:
+            result = normalize_text(text)
+            if isinstance(text, str):
+                seen[text] = result
+        cleaned.append(result[0])
+        mentions.append(list(result[1]))
+        hashtags.append(list(result[2]))
+    return cleaned, mentions, hashtags
 
-    # 6. Lowercasing (CAUTELA com VADER):
+def preprocess_text_for_sentiment(text):
+    """
+    Realiza uma limpeza básica no texto para análise de sentimento com VADER
+    (remove URLs, menções e espaços extras; ver normalize_text).
+    VADER é sensível a maiúsculas e pontuação para intensidade, então algumas
+    limpezas padrão (como lowercasing total ou remoção de pontuação)
+    devem ser feitas com cuidado ou omitidas.
+    """
+    # Lowercasing (CAUTELA com VADER):
     #    VADER usa MAIÚSCULAS para indicar intensidade (ex: "GREAT" é mais positivo que "great").
     #    Se converter para minúsculas, essa informação de intensidade é perdida.
-    #    Para uma análise mais simples ou se não se importar com essa nuance, pode descomentar:
-    #    text = text.lower()
-
-    # 7. Remoção de Stopwords (CAUTELA com VADER):
+    #
+    # Remoção de Stopwords (CAUTELA com VADER):
     #    VADER é projetado para funcionar bem com stopwords, pois algumas (como "not") invertem o sentimento.
     #    Geralmente não é recomendado remover stopwords antes de usar VADER.
-    #    Se quisesse:
-    #    if stop_words_en: # Verifica se a lista de stopwords foi carregada
-    #        word_tokens = word_tokenize(text)
-    #        filtered_text = [w for w in word_tokens if not w.lower() in stop_words_en]
-    #        text = " ".join(filtered_text)
-            
-    return text.strip()
+    #
+    # Remoção de caracteres especiais: opcional e pode ser muito agressiva para VADER,
+    #    que lida bem com muita "bagunça" de mídias sociais.
+    return normalize_text(text)[0]
+
+def preprocess_texts_for_sentiment(texts):
+    """Versão em lote de preprocess_text_for_sentiment (lista ou Series)."""
+    return normalize_texts(texts)[0]
 
 if __name__ == '__main__':
     sample_tweet1 = "I LOVE this new product! It's AMAZING!!! <3 #awesome @User123 http://example.com"
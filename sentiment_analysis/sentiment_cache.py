@@ -0,0 +1,180 @@
+# analise_tweets_neo4j/sentiment_analysis/sentiment_cache.py
+# Cache de resultados de sentimento endereçado pelo conteúdo: a chave é o hash do texto já
+# pré-processado mais a versão do léxico. Retweets repetem o texto original quase sempre,
+# então textos iguais (na mesma execução ou em execuções anteriores) são analisados uma vez só.
+
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+DEFAULT_CACHE_PATH = os.path.join('data', '.sentiment_cache.sqlite')
+
+# Itens mantidos na camada em memória (LRU).
+DEFAULT_MEMORY_ITEMS = 100_000
+
+# Máximo de itens no arquivo; acima disso os menos usados recentemente são descartados.
+DEFAULT_MAX_DISK_ITEMS = 5_000_000
+
+
+def make_cache_key(processed_text, lexicon_version):
+    """Chave de 128 bits para um texto pré-processado analisado com uma versão do léxico."""
+    return hashlib.blake2b(f"{lexicon_version}\0{processed_text}".encode('utf-8'), digest_size=16).digest()
+
+
+class SentimentCache:
+    """
+    Cache em duas camadas: um LRU em memória na frente de um arquivo SQLite local.
+    Novos resultados ficam pendentes em memória e vão para o disco em flush(),
+    que também aplica o limite de tamanho do arquivo.
+    Pode ser compartilhado entre threads (ex: os workers do backfill por shards).
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, memory_items=DEFAULT_MEMORY_ITEMS,
+                 max_disk_items=DEFAULT_MAX_DISK_ITEMS):
+        self.path = path
+        self.memory_items = memory_items
+        self.max_disk_items = max_disk_items
+        self.hits_memory = 0
+        self.hits_disk = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._pending = {}
+        self._touched = set()
+        self._clock = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sentiment_cache ("
+            "  key BLOB PRIMARY KEY,"
+            "  label TEXT NOT NULL,"
+            "  compound REAL NOT NULL,"
+            "  positive REAL NOT NULL,"
+            "  negative REAL NOT NULL,"
+            "  neutral REAL NOT NULL,"
+            "  last_used INTEGER NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS sentiment_cache_last_used ON sentiment_cache (last_used)")
+        self._clock, self._disk_items = self._conn.execute(
+            "SELECT coalesce(max(last_used), 0), count(*) FROM sentiment_cache").fetchone()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _remember(self, key, result):
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def get_many(self, keys):
+        """
+        Busca várias chaves de uma vez. Retorna {chave: resultado} só com as encontradas;
+        os resultados são dicionários no formato de analyze_sentiment_of_tweet.
+        Acertos e faltas são contados por chave distinta.
+        """
+        with self._lock:
+            return self._get_many(keys)
+
+    def _get_many(self, keys):
+        found = {}
+        missing = []
+        for key in set(keys):
+            result = self._memory.get(key)
+            if result is not None:
+                self._memory.move_to_end(key)
+                found[key] = result
+                self.hits_memory += 1
+                # O last_used do disco também precisa avançar, senão o LRU do arquivo
+                # descartaria primeiro justamente os itens mais usados (que ficam na memória).
+                if key not in self._pending:
+                    self._touched.add(key)
+            else:
+                missing.append(key)
+
+        disk_hits = 0
+        for start in range(0, len(missing), 500):
+            part = missing[start:start + 500]
+            placeholders = ','.join('?' * len(part))
+            rows = self._conn.execute(
+                "SELECT key, label, compound, positive, negative, neutral FROM sentiment_cache "
+                f"WHERE key IN ({placeholders})", part)
+            for key, label, compound, positive, negative, neutral in rows:
+                result = {'label': label, 'score_compound': compound, 'score_positive': positive,
+                          'score_negative': negative, 'score_neutral': neutral}
+                found[key] = result
+                self._remember(key, result)
+                self._touched.add(key)
+                self.hits_disk += 1
+                disk_hits += 1
+
+        self.misses += len(missing) - disk_hits
+        return found
+
+    def get(self, key):
+        """Busca uma única chave; retorna o resultado ou None."""
+        return self.get_many([key]).get(key)
+
+    def put(self, key, result):
+        """Guarda um resultado completo (com 'score_compound') na memória e o agenda para o disco."""
+        with self._lock:
+            self._remember(key, result)
+            self._pending[key] = result
+
+    def flush(self):
+        """Grava os resultados pendentes e descarta os itens mais antigos se o arquivo passou do limite."""
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        self._clock += 1
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO sentiment_cache VALUES (?, ?, ?, ?, ?, ?, ?)",
+            ((key, r['label'], r['score_compound'], r['score_positive'], r['score_negative'],
+              r['score_neutral'], self._clock) for key, r in self._pending.items()))
+        self._conn.executemany("UPDATE sentiment_cache SET last_used = ? WHERE key = ?",
+                               ((self._clock, key) for key in self._touched))
+        # Estimativa barata do tamanho (pendentes são, em geral, chaves novas);
+        # a contagem exata só é feita quando a estimativa passa do limite.
+        self._disk_items += len(self._pending)
+        self._pending.clear()
+        self._touched.clear()
+
+        if self._disk_items > self.max_disk_items:
+            self._disk_items = self._conn.execute("SELECT count(*) FROM sentiment_cache").fetchone()[0]
+            excess = self._disk_items - self.max_disk_items
+            if excess > 0:
+                self._conn.execute(
+                    "DELETE FROM sentiment_cache WHERE key IN "
+                    "(SELECT key FROM sentiment_cache ORDER BY last_used LIMIT ?)", (excess,))
+                self._disk_items -= excess
+        self._conn.commit()
+
+    def stats(self):
+        """Contadores de acertos (memória/disco) e faltas desde a criação do cache."""
+        lookups = self.hits_memory + self.hits_disk + self.misses
+        hit_rate = (self.hits_memory + self.hits_disk) / lookups if lookups else 0.0
+        return {'hits_memory': self.hits_memory, 'hits_disk': self.hits_disk,
+                'misses': self.misses, 'hit_rate': hit_rate}
+
+    def print_report(self):
+        stats = self.stats()
+        print(f"Cache de sentimentos: {stats['hits_memory']} acertos em memória, {stats['hits_disk']} no disco, "
+              f"{stats['misses']} faltas (taxa de acerto {stats['hit_rate']:.1%}).")
+
+    def close(self):
+        """Grava o que estiver pendente e fecha o arquivo."""
+        with self._lock:
+            if self._conn is not None:
+                self._flush()
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,258 @@
+# analise_tweets_neo4j/stream_ingest.py
+# Ingestão contínua: em vez das duas fases em lote (carga dos CSVs e, depois, sentimento por
+# intervalo de IDs), observa um diretório onde o feed deposita arquivos CSV/JSONL (ou um
+# arquivo que só cresce) e, a cada micro-lote, mapeia as linhas novas com tweet_data_mapper,
+# analisa o sentimento na hora e grava tweets, autores, hashtags, menções e sentimento no
+# grafo (modelo User/Tweet.tweetId do graph_builder) em uma transação.
+#
+# - Latência limitada: um micro-lote é gravado ao juntar `batch_size` tweets ou quando o
+#   tweet mais antigo dele já espera `max_latency` segundos, o que vier primeiro.
+# - Posições por arquivo em data/.stream_offsets.sqlite, gravadas só depois da escrita no
+#   grafo (ver data_processing/feed_tailer.py): reiniciar o processo não perde nem duplica linhas.
+# - Encerramento gracioso: Ctrl+C / SIGTERM para a leitura, grava o micro-lote pendente e
+#   salva as posições. Um segundo sinal encerra na hora (o lote pendente é relido na próxima execução).
+
+import contextlib
+import signal
+import threading
+import time
+
+import pandas as pd
+
+from data_processing import feed_tailer, mention_resolver
+from data_processing.tweet_data_mapper import map_dataframe
+from graph_database import adaptive_writer, graph_builder, neo4j_connector, query_profiler, schema
+from sentiment_analysis import analyzer as sentiment_analyzer
+from sentiment_analysis.sentiment_cache import SentimentCache
+from utils import metrics
+
+DEFAULT_WATCH_DIR = 'data/feed'
+
+# Tweets por micro-lote e espera máxima (s) de um tweet lido até ser gravado.
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_MAX_LATENCY = 2.0
+
+# Intervalo (s) entre as verificações de arquivos novos quando o feed está parado.
+DEFAULT_POLL_INTERVAL = 1.0
+
+# Tempo máximo (s) tentando gravar o lote pendente ao encerrar.
+DEFAULT_DRAIN_TIMEOUT = 60.0
+
+
+class _StopSignal:
+    """Primeiro SIGINT/SIGTERM pede o encerramento gracioso; o segundo interrompe na hora."""
+
+    def __init__(self, stop):
+        self.stop = stop
+        self._previous = {}
+
+    def __enter__(self):
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            self._previous[signum] = signal.signal(signum, self._handle)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        for signum, handler in self._previous.items():
+            signal.signal(signum, handler)
+
+    def _handle(self, signum, frame):
+        if self.stop.is_set():
+            raise KeyboardInterrupt
+        print("\nINFO: Encerrando: a leitura parou e o lote pendente será gravado (repita o sinal para sair já).")
+        self.stop.set()
+
+
+def prepare_tweets(records, scoring_pool, resolver):
+    """Mapeia os registros lidos, resolve as menções e anexa o sentimento de cada tweet."""
+    tweets = map_dataframe(pd.DataFrame.from_records(records))
+    if not tweets:
+        return []
+    for tweet_data in tweets:
+        resolver.add_tweet(tweet_data)
+    for tweet_data, result in zip(tweets, scoring_pool.analyze(tweet['text'] for tweet in tweets)):
+        resolver.resolve_mentions(tweet_data)
+        tweet_data['sentiment'] = result
+    return tweets
+
+
+class StreamIngestor:
+    """
+    Laço de ingestão contínua. run() lê micro-lotes do FeedTailer até `stop` ser acionado;
+    cada lote é gravado com o escritor em lote do graph_builder e só então as posições dos
+    arquivos são salvas.
+    """
+
+    def __init__(self, driver, tailer, scoring_pool, resolver, batch_size=DEFAULT_BATCH_SIZE,
+                 max_latency=DEFAULT_MAX_LATENCY, poll_interval=DEFAULT_POLL_INTERVAL,
+                 drain_timeout=DEFAULT_DRAIN_TIMEOUT, stop=None):
+        self.driver = driver
+        self.tailer = tailer
+        self.scoring_pool = scoring_pool
+        self.resolver = resolver
+        self.batch_size = batch_size
+        self.max_latency = max_latency
+        self.poll_interval = poll_interval
+        self.drain_timeout = drain_timeout
+        self.stop = stop or threading.Event()
+        self.writer = graph_builder.tweet_batch_writer(batch_size)
+        self.written = 0
+        self.dead_letter = 0
+        self._pending = []
+        self._oldest = None
+        self._attempt = 0
+
+    def _due(self):
+        if len(self._pending) >= self.batch_size:
+            return True
+        if self._pending and time.monotonic() - self._oldest >= self.max_latency:
+            return True
+        # Registros lidos que não viraram tweets (ex: sem texto) só precisam ter a posição salva.
+        return not self._pending and self.tailer.has_uncommitted
+
+    def _read(self):
+        """Lê e prepara registros novos até completar o micro-lote. Retorna quantos registros leu."""
+        records = self.tailer.read(self.batch_size - len(self._pending))
+        if not records:
+            return 0
+        if not self._pending:
+            self._oldest = time.monotonic()
+        metrics.increment('pipeline_rows_total', len(records), stage='stream_leitura')
+        self._pending.extend(prepare_tweets(records, self.scoring_pool, self.resolver))
+        return len(records)
+
+    def _flush(self):
+        """
+        Grava o micro-lote pendente e salva as posições. Se o banco continuar indisponível
+        (erro transitório após as retentativas do AdaptiveWriter), o lote é mantido para a
+        próxima tentativa e retorna False.
+        """
+        if self._pending:
+            try:
+                with self.driver.session() as session:
+                    written, dead = self.writer.write(session, self._pending)
+            except Exception as e:
+                if not adaptive_writer.is_transient(e):
+                    raise
+                self._attempt += 1
+                print(f"ERRO: Não foi possível gravar o lote de {len(self._pending)} tweets ({e}). "
+                      f"Nova tentativa em breve; a leitura fica parada até lá.")
+                return False
+            self.written += written
+            self.dead_letter += dead
+            metrics.increment('pipeline_rows_total', written, stage='stream_escrita')
+            metrics.observe('stream_latency_seconds', time.monotonic() - self._oldest)
+        self.tailer.commit()
+        self._pending = []
+        self._oldest = None
+        self._attempt = 0
+        return True
+
+    def _wait(self, seconds):
+        """Espera interrompível por um sinal de parada."""
+        self.stop.wait(max(0.0, seconds))
+
+    def run(self):
+        print(f"INFO: Observando {', '.join(self.tailer.sources)} (lotes de até {self.batch_size} tweets, "
+              f"latência máxima de {self.max_latency:g}s). Ctrl+C para encerrar.")
+        while not self.stop.is_set():
+            # Enquanto o banco recusa as escritas (_attempt > 0), nada novo é lido.
+            read = self._read() if not self._attempt and len(self._pending) < self.batch_size else 0
+            if self._due():
+                if not self._flush():
+                    self._wait(adaptive_writer.backoff_seconds(min(self._attempt, adaptive_writer.MAX_RETRIES)))
+                    continue
+                print(f"  {self.written} tweets gravados, {self.dead_letter} no dead letter...")
+            elif not read:
+                wait = self.poll_interval
+                if self._pending:
+                    wait = min(wait, self._oldest + self.max_latency - time.monotonic())
+                self._wait(wait)
+        self.drain()
+
+    def drain(self):
+        """Grava o que ficou pendente (sem ler mais nada), por até `drain_timeout` segundos."""
+        deadline = time.monotonic() + self.drain_timeout
+        while self._pending or self.tailer.has_uncommitted:
+            if self._flush():
+                break
+            if time.monotonic() >= deadline:
+                print(f"AVISO: {len(self._pending)} tweets não foram gravados antes do encerramento. "
+                      f"Eles serão relidos na próxima execução.")
+                return False
+            time.sleep(adaptive_writer.backoff_seconds(min(self._attempt, adaptive_writer.MAX_RETRIES)))
+        return True
+
+
+def run_stream_ingest(sources, batch_size=DEFAULT_BATCH_SIZE, max_latency=DEFAULT_MAX_LATENCY,
+                      poll_interval=DEFAULT_POLL_INTERVAL, offsets_path=feed_tailer.DEFAULT_OFFSETS_PATH,
+                      settle_seconds=feed_tailer.DEFAULT_SETTLE_SECONDS, scoring_workers=1, use_cache=True,
+                      drain_timeout=DEFAULT_DRAIN_TIMEOUT):
+    """
+    Roda a ingestão contínua até receber SIGINT/SIGTERM. `sources` são diretórios
+    observados e/ou arquivos acompanhados (tail). A análise roda no próprio processo por
+    padrão (`scoring_workers=1`), o que basta para micro-lotes e evita a ida e volta ao pool.
+    """
+    print("--- INGESTÃO CONTÍNUA (STREAMING) ---")
+    driver = neo4j_connector.connect_db()
+    if not driver:
+        return
+
+    schema.ensure_schema(driver)
+    graph_builder.backfill_username_keys(driver, database=None)
+    with driver.session() as session:
+        resolver = mention_resolver.from_graph(session)
+    print(f"INFO: {len(resolver)} handles de autores já gravados carregados para resolver menções.")
+
+    cache = SentimentCache() if use_cache else None
+    stop = threading.Event()
+    with feed_tailer.OffsetStore(offsets_path) as store, \
+            sentiment_analyzer.SentimentScoringPool(workers=scoring_workers, cache=cache) as scoring_pool, \
+            _StopSignal(stop):
+        tailer = feed_tailer.FeedTailer(sources, store, settle_seconds=settle_seconds)
+        ingestor = StreamIngestor(driver, tailer, scoring_pool, resolver, batch_size, max_latency,
+                                  poll_interval, drain_timeout, stop)
+        try:
+            ingestor.run()
+        except KeyboardInterrupt:
+            print(f"AVISO: Interrompido sem gravar {len(ingestor._pending)} tweets pendentes; "
+                  f"eles serão relidos na próxima execução.")
+
+    if cache is not None:
+        cache.close()
+    resolver.print_report()
+    print(f"\n--- INGESTÃO CONTÍNUA ENCERRADA: {ingestor.written} tweets gravados, "
+          f"{ingestor.dead_letter} no dead letter ---")
+    neo4j_connector.close_db(driver)
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(
+        description="Ingestão contínua: grava no Neo4j, com sentimento, os tweets que chegam em arquivos CSV/JSONL.")
+    parser.add_argument('sources', nargs='*', default=[DEFAULT_WATCH_DIR],
+                        help=f"Diretórios observados e/ou arquivos acompanhados (padrão: {DEFAULT_WATCH_DIR}).")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"Tweets por micro-lote (padrão: {DEFAULT_BATCH_SIZE}).")
+    parser.add_argument('--max-latency', type=float, default=DEFAULT_MAX_LATENCY,
+                        help=f"Espera máxima (s) de um tweet lido até ser gravado (padrão: {DEFAULT_MAX_LATENCY:g}).")
+    parser.add_argument('--poll-interval', type=float, default=DEFAULT_POLL_INTERVAL,
+                        help=f"Intervalo (s) entre verificações com o feed parado (padrão: {DEFAULT_POLL_INTERVAL:g}).")
+    parser.add_argument('--settle-seconds', type=float, default=feed_tailer.DEFAULT_SETTLE_SECONDS,
+                        help="Tempo (s) parado para aceitar um último registro sem quebra de linha.")
+    parser.add_argument('--offsets', default=feed_tailer.DEFAULT_OFFSETS_PATH,
+                        help=f"Arquivo das posições de leitura (padrão: {feed_tailer.DEFAULT_OFFSETS_PATH}).")
+    parser.add_argument('--scoring-workers', type=int, default=1,
+                        help="Processos de análise de sentimento (padrão: 1, no próprio processo).")
+    parser.add_argument('--drain-timeout', type=float, default=DEFAULT_DRAIN_TIMEOUT,
+                        help=f"Tempo máximo (s) gravando o lote pendente ao encerrar (padrão: {DEFAULT_DRAIN_TIMEOUT:g}).")
+    parser.add_argument('--no-cache', action='store_true', help="Não usa o cache de sentimentos.")
+    metrics.add_arguments(parser)
+    query_profiler.add_arguments(parser)
+    args = parser.parse_args()
+
+    with metrics.reporter_from_args(args, name='stream_ingest'), \
+            (query_profiler.profiler_from_args(args) or contextlib.nullcontext()):
+        run_stream_ingest(args.sources, batch_size=args.batch_size, max_latency=args.max_latency,
+                          poll_interval=args.poll_interval, offsets_path=args.offsets,
+                          settle_seconds=args.settle_seconds, scoring_workers=args.scoring_workers,
+                          use_cache=not args.no_cache, drain_timeout=args.drain_timeout)
@@ -0,0 +1,8 @@
+# analise_tweets_neo4j/tests/conftest.py
+# Os módulos do projeto são importados a partir da raiz (ex: `from data_processing import ...`),
+# como nos scripts; assim os testes rodam com `pytest` de qualquer diretório.
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,145 @@
+# analise_tweets_neo4j/tests/test_adaptive_writer.py
+
+import json
+import random
+
+import pytest
+from neo4j import exceptions
+
+from graph_database import adaptive_writer
+from graph_database.adaptive_writer import AdaptiveWriter, BatchSizer, DeadLetterFile
+
+
+class FakeTransaction:
+    def __init__(self, session):
+        self.session = session
+
+    def __enter__(self):
+        self.session.transactions += 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def commit(self):
+        self.session.committed.extend(self.session.pending)
+        self.session.pending = []
+
+
+class FakeSession:
+    def __init__(self):
+        self.transactions = 0
+        self.committed = []
+        self.pending = []
+
+    def begin_transaction(self):
+        self.pending = []
+        return FakeTransaction(self)
+
+
+def error(error_class, code):
+    return error_class._hydrate_neo4j(code=code, message=code)
+
+
+def write_rows(fail):
+    """write_function que levanta fail(lote) (se não for None) ou grava o lote."""
+    def write(tx, batch):
+        e = fail(batch)
+        if e is not None:
+            raise e
+        tx.session.pending.extend(batch)
+    return write
+
+
+def make_writer(tmp_path, fail, initial=100):
+    return AdaptiveWriter('teste', write_rows(fail), sizer=BatchSizer(initial=initial, min_size=1),
+                          dead_letter=DeadLetterFile(str(tmp_path / 'teste.jsonl')),
+                          rng=random.Random(0), sleep=lambda seconds: None)
+
+
+def test_auth_error_is_raised_after_one_transaction(tmp_path):
+    auth = error(exceptions.AuthError, 'Neo.ClientError.Security.Unauthorized')
+    writer = make_writer(tmp_path, lambda batch: auth)
+    session = FakeSession()
+    with pytest.raises(exceptions.AuthError):
+        writer.write(session, [{'id': i} for i in range(50)])
+    assert session.transactions == 1
+    assert writer.dead_letter.count == 0
+
+
+def test_syntax_error_is_not_bisected(tmp_path):
+    syntax = error(exceptions.CypherSyntaxError, 'Neo.ClientError.Statement.SyntaxError')
+    writer = make_writer(tmp_path, lambda batch: syntax)
+    session = FakeSession()
+    with pytest.raises(exceptions.CypherSyntaxError):
+        writer.write(session, [{'id': i} for i in range(50)])
+    assert session.transactions == 1
+
+
+def test_bisect_isolates_the_bad_rows(tmp_path):
+    bad_ids = {7, 42, 77}
+    type_error = error(exceptions.CypherTypeError, 'Neo.ClientError.Statement.TypeError')
+    writer = make_writer(tmp_path, lambda batch: type_error if any(row['id'] in bad_ids for row in batch) else None)
+    session = FakeSession()
+    stats = {}
+
+    written, dead = writer.write(session, [{'id': i} for i in range(100)], stats=stats)
+
+    assert (written, dead) == (97, 3)
+    assert sorted(row['id'] for row in session.committed) == [i for i in range(100) if i not in bad_ids]
+    with open(writer.dead_letter.path, encoding='utf-8') as f:
+        entries = [json.loads(line) for line in f]
+    assert sorted(entry['row']['id'] for entry in entries) == sorted(bad_ids)
+    assert {entry['error_code'] for entry in entries} == {'Neo.ClientError.Statement.TypeError'}
+    assert stats['teste']['rows'] == 97
+    assert stats['teste']['dead_letter'] == 3
+
+
+def test_memory_error_shrinks_the_batch(tmp_path):
+    limit = 30
+    oom = error(exceptions.TransientError, 'Neo.TransientError.General.MemoryPoolOutOfMemoryError')
+    writer = make_writer(tmp_path, lambda batch: oom if len(batch) > limit else None, initial=100)
+    session = FakeSession()
+
+    written, dead = writer.write(session, [{'id': i} for i in range(200)])
+
+    assert (written, dead) == (200, 0)
+    assert sorted(row['id'] for row in session.committed) == list(range(200))
+    assert writer.sizer.size <= limit
+    assert writer.sizer.max_size <= limit
+
+
+def test_transient_error_is_retried(tmp_path):
+    deadlock = error(exceptions.TransientError, 'Neo.TransientError.Transaction.DeadlockDetected')
+    failures = [deadlock, deadlock]
+    writer = make_writer(tmp_path, lambda batch: failures.pop() if failures else None)
+    session = FakeSession()
+    stats = {}
+
+    assert writer.write(session, [{'id': 1}, {'id': 2}], stats=stats) == (2, 0)
+    assert stats['teste']['retries'] == 2
+    assert session.transactions == 3
+
+
+def test_all_bad_batch_aborts(tmp_path):
+    type_error = error(exceptions.CypherTypeError, 'Neo.ClientError.Statement.TypeError')
+    writer = make_writer(tmp_path, lambda batch: type_error)
+    session = FakeSession()
+    with pytest.raises(exceptions.CypherTypeError):
+        writer.write(session, [{'id': i} for i in range(1000)])
+    # A divisão para na primeira parte com ALL_FAILED_ABORT_ROWS linhas ou mais, todas ruins,
+    # em vez de testar as 1000 linhas uma a uma.
+    assert adaptive_writer.ALL_FAILED_ABORT_ROWS <= writer.dead_letter.count < 2 * adaptive_writer.ALL_FAILED_ABORT_ROWS
+    assert session.committed == []
+    assert session.transactions < 50
+
+
+def test_small_all_bad_tail_does_not_abort(tmp_path):
+    """Um resto de lote menor que ALL_FAILED_ABORT_ROWS com todas as linhas ruins vai só para o dead letter."""
+    bad_ids = {8, 9}
+    type_error = error(exceptions.CypherTypeError, 'Neo.ClientError.Statement.TypeError')
+    writer = make_writer(tmp_path, lambda batch: type_error if any(row['id'] in bad_ids for row in batch) else None,
+                         initial=8)
+    session = FakeSession()
+
+    assert writer.write(session, [{'id': i} for i in range(10)]) == (8, 2)
@@ -0,0 +1,54 @@
+# analise_tweets_neo4j/tests/test_bulk_import.py
+
+import numpy as np
+
+from data_processing.bulk_import import KeySet
+
+
+def keys(*values):
+    return np.array(values, dtype=np.uint64)
+
+
+def test_add_new_marks_only_the_first_occurrence_of_each_key():
+    key_set = KeySet()
+    assert key_set.add_new(keys(5, 3, 5, 9, 3)).tolist() == [True, True, False, True, False]
+    assert len(key_set) == 3
+
+
+def test_add_new_ignores_keys_already_in_the_set():
+    key_set = KeySet()
+    key_set.add_new(keys(1, 2, 3))
+    assert key_set.add_new(keys(3, 4, 1, 4)).tolist() == [False, True, False, False]
+    assert key_set.contains(keys(1, 2, 3, 4, 5)).tolist() == [True, True, True, True, False]
+    assert len(key_set) == 4
+
+
+def test_add_new_with_empty_input():
+    key_set = KeySet()
+    assert key_set.add_new(keys()).tolist() == []
+    assert key_set.contains(keys(1)).tolist() == [False]
+
+
+def test_contains_handles_the_full_uint64_range():
+    key_set = KeySet()
+    top = np.iinfo(np.uint64).max
+    key_set.add_new(keys(0, top))
+    assert key_set.contains(keys(top, top - 1, 0)).tolist() == [True, False, True]
+
+
+def test_runs_are_merged_without_losing_keys():
+    """Mais lotes que MAX_RUNS força a fusão dos vetores; o conteúdo não pode mudar."""
+    key_set = KeySet()
+    rng = np.random.default_rng(0)
+    seen = set()
+    for _ in range(KeySet.MAX_RUNS * 3):
+        batch = rng.integers(0, 5000, size=200, dtype=np.uint64)
+        new = key_set.add_new(batch)
+        expected = []
+        for value in batch.tolist():
+            expected.append(value not in seen)
+            seen.add(value)
+        assert new.tolist() == expected
+        assert len(key_set._runs) <= KeySet.MAX_RUNS
+    assert len(key_set) == len(seen)
+    assert key_set.contains(np.arange(5000, dtype=np.uint64)).sum() == len(seen)
@@ -0,0 +1,89 @@
+# analise_tweets_neo4j/tests/test_ingestion_manifest.py
+
+import pandas as pd
+import pytest
+
+from data_processing import ingestion_manifest
+from data_processing.ingestion_manifest import IngestionManifest
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    with IngestionManifest(str(tmp_path / 'manifest.sqlite')) as manifest:
+        yield manifest
+
+
+def _chunk(rows):
+    df = pd.DataFrame(rows, columns=['id', 'texto'])
+    return df, ingestion_manifest.row_keys(df, ['id']), ingestion_manifest.content_hashes(df)
+
+
+def test_row_keys_joins_composite_columns():
+    df = pd.DataFrame({'seguidor_id': [1, 2], 'seguido_id': [3, 4]})
+    keys = ingestion_manifest.row_keys(df, ['seguidor_id', 'seguido_id'])
+    assert keys.tolist() == ['1|3', '2|4']
+
+
+def test_content_hashes_are_stable_and_content_dependent():
+    df, _, hashes = _chunk([(1, 'a'), (2, 'b')])
+    again = ingestion_manifest.content_hashes(df.copy())
+    assert hashes.tolist() == again.tolist()
+    assert hashes.iloc[0] != hashes.iloc[1]
+
+
+def test_changed_mask_flags_only_new_or_modified_rows(manifest):
+    _, keys, hashes = _chunk([(1, 'a'), (2, 'b')])
+    assert manifest.changed_mask('tweets.csv', keys, hashes).tolist() == [True, True]
+    manifest.record('tweets.csv', keys, hashes)
+    manifest.commit()
+
+    df, keys, hashes = _chunk([(1, 'a'), (2, 'editado'), (3, 'c')])
+    df.index = [10, 11, 12]
+    keys.index = df.index
+    mask = manifest.changed_mask('tweets.csv', keys, hashes)
+    assert mask.tolist() == [False, True, True]
+    assert mask.index.tolist() == [10, 11, 12]
+
+
+def test_changed_mask_is_per_source(manifest):
+    _, keys, hashes = _chunk([(1, 'a')])
+    manifest.record('tweets.csv', keys, hashes)
+    manifest.commit()
+    assert manifest.changed_mask('usuarios.csv', keys, hashes).tolist() == [True]
+
+
+def test_changed_mask_keeps_full_64_bit_precision(manifest):
+    """Hashes que diferem só nos bits baixos não podem ser confundidos (sem passar por float)."""
+    keys = pd.Series(['1'])
+    big = pd.Series([2 ** 62 + 1], dtype='int64')
+    manifest.record('tweets.csv', keys, big)
+    manifest.commit()
+    assert manifest.changed_mask('tweets.csv', keys, big).tolist() == [False]
+    assert manifest.changed_mask('tweets.csv', keys, big + 1).tolist() == [True]
+
+
+def test_uncommitted_records_are_lost_on_reopen(tmp_path):
+    """Sem commit(), uma queda faz a próxima execução reenviar as linhas."""
+    path = str(tmp_path / 'manifest.sqlite')
+    _, keys, hashes = _chunk([(1, 'a')])
+    with IngestionManifest(path) as manifest:
+        manifest.record('tweets.csv', keys, hashes)
+    with IngestionManifest(path) as manifest:
+        assert manifest.count('tweets.csv') == 0
+        manifest.record('tweets.csv', keys, hashes)
+        manifest.commit()
+    with IngestionManifest(path) as manifest:
+        assert manifest.count('tweets.csv') == 1
+
+
+def test_clear_forgets_one_source_or_all(manifest):
+    _, keys, hashes = _chunk([(1, 'a'), (2, 'b')])
+    manifest.record('tweets.csv', keys, hashes)
+    manifest.record('usuarios.csv', keys, hashes)
+    manifest.commit()
+
+    manifest.clear('tweets.csv')
+    assert manifest.count('tweets.csv') == 0
+    assert manifest.count('usuarios.csv') == 2
+    manifest.clear()
+    assert manifest.count('usuarios.csv') == 0
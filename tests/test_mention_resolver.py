@@ -0,0 +1,55 @@
+# analise_tweets_neo4j/tests/test_mention_resolver.py
+
+from data_processing import mention_resolver
+from data_processing.mention_resolver import MentionResolver
+from graph_database import graph_builder
+
+
+def test_handles_are_matched_without_at_sign_and_case():
+    resolver = MentionResolver()
+    resolver.add('@alice', '1')
+    tweet = {'mentions': [{'username': 'Alice', 'id': None}, {'username': 'bob', 'id': None}]}
+    resolver.resolve_mentions(tweet)
+    assert [mention['id'] for mention in tweet['mentions']] == ['1', None]
+    assert (resolver.resolved, resolver.unresolved) == (1, 1)
+
+
+def test_ambiguous_handle_resolves_to_the_smallest_id_in_any_order():
+    first = MentionResolver()
+    second = MentionResolver()
+    for handle, user_id in [('@ana', '20'), ('@ANA', '10'), ('@ana', '15')]:
+        first.add(handle, user_id)
+    for handle, user_id in [('@ana', '15'), ('@ana', '10'), ('@Ana', '20')]:
+        second.add(handle, user_id)
+    assert first.resolve('ana') == second.resolve('ana') == '10'
+    assert first.ambiguous == {'ana': {'10', '15', '20'}}
+    assert first.conflicts == 1
+
+
+def test_report_lists_ambiguous_handles(capsys):
+    resolver = MentionResolver()
+    resolver.add('@ana', '2')
+    resolver.add('@ana', '1')
+    resolver.resolve_mentions({'mentions': [{'username': 'ana'}]})
+    resolver.print_report()
+    output = capsys.readouterr().out
+    assert '1 handles com mais de um ID' in output
+    assert '@ana (1, 2)' in output
+    assert '1 menções a handles com mais de um ID' in output
+
+
+def test_graph_lookup_key_matches_the_resolver_normalisation():
+    """A menção '@Alice' e o autor 'alice' usam a mesma chave de busca no grafo (usernameKey)."""
+    author = {'tweet_id': 't1', 'text': 'oi', 'author_id': '1', 'author_username': 'alice',
+              'mentions': [{'username': 'Alice', 'id': None}]}
+    statements = dict((family, rows) for family, _, rows in graph_builder._batch_rows([author]))
+    user_key = statements['usuario'][0]['usernameKey']
+    mention = statements['mencao'][0]['mentionedUsers'][0]
+    assert user_key == mention['usernameKey'] == mention_resolver.normalize_handle('@Alice') == 'alice'
+    assert mention['mentionOnlyId'] == 'mencao:alice'
+
+
+def test_author_without_username_has_no_lookup_key():
+    tweet = {'tweet_id': 't1', 'text': 'oi', 'author_id': '1', 'author_username': ''}
+    statements = dict((family, rows) for family, _, rows in graph_builder._batch_rows([tweet]))
+    assert statements['usuario'][0]['usernameKey'] is None
@@ -0,0 +1,47 @@
+# analise_tweets_neo4j/tests/test_metrics.py
+
+import json
+
+import pytest
+
+from utils import metrics
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def test_quantile_uses_the_bucket_upper_bound():
+    for _ in range(99):
+        metrics.observe('neo4j_transaction_seconds', 0.003, family='tweets')
+    metrics.observe('neo4j_transaction_seconds', 0.4, family='tweets')
+    histogram = metrics.snapshot()['histograms']['neo4j_transaction_seconds{family="tweets"}']
+    assert histogram['p50'] == 0.005
+    assert histogram['p99'] == 0.005
+    assert histogram['count'] == 100
+
+
+def test_quantile_above_the_last_bucket_stays_valid_json(tmp_path):
+    metrics.observe('neo4j_transaction_seconds', 120.0, family='lenta')
+    snapshot = metrics.snapshot()
+    histogram = snapshot['histograms']['neo4j_transaction_seconds{family="lenta"}']
+    assert histogram['p95'] == metrics.LATENCY_BUCKETS[-1]
+    json.dumps(snapshot, allow_nan=False)
+
+    path = tmp_path / 'metrics.json'
+    metrics.write_json_snapshot(str(path))
+    json.loads(path.read_text(encoding='utf-8'), parse_constant=pytest.fail)
+
+
+def test_prometheus_text_keeps_the_inf_bucket():
+    metrics.observe('neo4j_transaction_seconds', 120.0, family='lenta')
+    text = metrics.to_prometheus_text()
+    assert 'neo4j_transaction_seconds_bucket{family="lenta",le="+Inf"} 1' in text
+    assert 'neo4j_transaction_seconds_bucket{family="lenta",le="30.0"} 0' in text
+
+
+def test_empty_histogram_has_no_quantiles():
+    assert metrics._quantile({'buckets': [0] * len(metrics.LATENCY_BUCKETS), 'sum': 0.0, 'count': 0}, 0.5) is None
@@ -0,0 +1,106 @@
+# analise_tweets_neo4j/tests/test_parallel_loader.py
+
+import pytest
+from neo4j import exceptions
+
+from graph_database import parallel_loader
+
+
+class FakeResult:
+    def consume(self):
+        return None
+
+
+class FakeTransaction:
+    def __init__(self, session):
+        self.session = session
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def run(self, query, parameters=None):
+        if self.session.errors:
+            raise self.session.errors.pop(0)
+        self.session.rows.extend(parameters['rows'])
+        return FakeResult()
+
+    def commit(self):
+        self.session.commits += 1
+
+
+class FakeSession:
+    """Sessão que levanta, em ordem, os erros de `errors` antes de aceitar os lotes."""
+
+    def __init__(self, errors=()):
+        self.errors = list(errors)
+        self.rows = []
+        self.commits = 0
+
+    def begin_transaction(self):
+        return FakeTransaction(self)
+
+
+def transient_error():
+    return exceptions.TransientError._hydrate_neo4j(
+        code='Neo.TransientError.Transaction.DeadlockDetected', message='deadlock')
+
+
+def test_partition_rows_keeps_every_row_once_and_in_order():
+    rows = [{'id': i % 7, 'n': i} for i in range(100)]
+    buckets = parallel_loader.partition_rows(rows, 'id', 4)
+    assert len(buckets) == 4
+    assert sorted(row['n'] for bucket in buckets for row in bucket) == list(range(100))
+    for bucket in buckets:
+        assert [row['n'] for row in bucket] == sorted(row['n'] for row in bucket)
+
+
+def test_partition_rows_sends_each_key_to_a_single_partition():
+    rows = [{'id': f"user_{i % 13}"} for i in range(200)]
+    buckets = parallel_loader.partition_rows(rows, 'id', 5)
+    owners = {}
+    for index, bucket in enumerate(buckets):
+        for row in bucket:
+            assert owners.setdefault(row['id'], index) == index
+
+
+def test_partition_rows_is_stable_across_runs_and_key_types():
+    """O hash é o CRC32 do texto da chave: não muda entre execuções nem entre 42 e '42'."""
+    first = parallel_loader.partition_rows([{'id': 42}], 'id', 8)
+    second = parallel_loader.partition_rows([{'id': '42'}], 'id', 8)
+    assert [len(bucket) for bucket in first] == [len(bucket) for bucket in second]
+    assert first[0] == [{'id': 42}]  # zlib.crc32(b'42') % 8 == 0
+
+
+def test_write_batch_retries_transient_errors_with_fixed_backoff(monkeypatch):
+    waits = []
+    monkeypatch.setattr(parallel_loader.time, 'sleep', waits.append)
+    session = FakeSession(errors=[transient_error(), transient_error()])
+
+    retries = parallel_loader._write_batch_with_retry(session, "UNWIND $rows AS row RETURN row", [{'id': 1}])
+
+    assert retries == 2
+    assert waits == list(parallel_loader.RETRY_BACKOFF_SECONDS[:2])
+    assert session.rows == [{'id': 1}]
+    assert session.commits == 1
+
+
+def test_write_batch_gives_up_after_the_last_backoff(monkeypatch):
+    monkeypatch.setattr(parallel_loader.time, 'sleep', lambda seconds: None)
+    attempts = len(parallel_loader.RETRY_BACKOFF_SECONDS) + 1
+    session = FakeSession(errors=[transient_error() for _ in range(attempts)])
+
+    with pytest.raises(exceptions.TransientError):
+        parallel_loader._write_batch_with_retry(session, "UNWIND $rows AS row RETURN row", [{'id': 1}])
+    assert session.commits == 0
+
+
+def test_write_batch_does_not_retry_other_errors(monkeypatch):
+    monkeypatch.setattr(parallel_loader.time, 'sleep', lambda seconds: pytest.fail("não deveria esperar"))
+    error = exceptions.ClientError._hydrate_neo4j(code='Neo.ClientError.Statement.SyntaxError', message='x')
+    session = FakeSession(errors=[error])
+
+    with pytest.raises(exceptions.ClientError):
+        parallel_loader._write_batch_with_retry(session, "UNWIND $rows AS row RETURN row", [{'id': 1}])
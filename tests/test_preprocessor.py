@@ -0,0 +1,95 @@
+# analise_tweets_neo4j/tests/test_preprocessor.py
+# normalize_text faz em uma só varredura a limpeza que antes era feita em etapas (URLs, depois
+# menções). O texto entregue ao VADER e as hashtags precisam ser os mesmos da versão antiga.
+
+import os
+import random
+import re
+
+import pandas as pd
+import pytest
+
+from sentiment_analysis.preprocessor import normalize_text, normalize_texts
+
+DATASET_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                            'data', 'tweets_neo4j_completos_FINAL.csv')
+
+EDGE_CASE_TEXTS = [
+    "",
+    "   ",
+    "sem tokens especiais",
+    "#COVIDhttps://t.co/x great",
+    "@www.x hi",
+    "@www",
+    "@http",
+    "@https://t.co/x depois",
+    "@ https://t.co/x depois",
+    "@http://x palavra",
+    "@abcwww.x fim",
+    "#http://x",
+    "#www",
+    "#a#b #a",
+    "a@b c",
+    "email@dominio.com",
+    "@ user texto",
+    "@User123 I LOVE this!!! #awesome http://example.com",
+    "texto www.site.com/caminho?q=1 e mais",
+    "linha\nquebrada @alguem\thttp://x",
+]
+
+
+def legacy_preprocess(text):
+    """A limpeza original de preprocess_text_for_sentiment, em etapas."""
+    if not isinstance(text, str):
+        return ""
+    text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
+    text = re.sub(r'@\w+', '', text)
+    return " ".join(text.split()).strip()
+
+
+def legacy_hashtags(text):
+    """Hashtags que sobram no texto depois de removidas as URLs, na ordem e sem repetição."""
+    without_urls = re.sub(r'http\S+|www\S+', '', text)
+    return list(dict.fromkeys(re.findall(r'#(\w+)', without_urls)))
+
+
+def random_texts(count, seed=0):
+    pieces = list('@#htpw:/. \n_aéA1') + ['http', 'www', 'https://', '@ ', '#']
+    rng = random.Random(seed)
+    return [''.join(rng.choice(pieces) for _ in range(rng.randint(0, 14))) for _ in range(count)]
+
+
+@pytest.mark.parametrize('text', EDGE_CASE_TEXTS)
+def test_edge_cases_match_the_legacy_cleaning(text):
+    cleaned, _, hashtags = normalize_text(text)
+    assert cleaned == legacy_preprocess(text)
+    assert hashtags == legacy_hashtags(text)
+
+
+def test_glued_url_is_not_part_of_the_hashtag_or_mention():
+    assert normalize_text("#COVIDhttps://t.co/x great") == ("#COVID great", [], ["COVID"])
+    assert normalize_text("@www.x hi") == ("@ hi", [], [])
+    assert normalize_text("@anawww.x oi") == ("oi", ["ana"], [])
+
+
+def test_random_texts_match_the_legacy_cleaning():
+    for text in random_texts(20_000):
+        cleaned, _, hashtags = normalize_text(text)
+        assert cleaned == legacy_preprocess(text), repr(text)
+        assert hashtags == legacy_hashtags(text), repr(text)
+
+
+def test_dataset_matches_the_legacy_cleaning():
+    if not os.path.exists(DATASET_PATH):
+        pytest.skip("dataset não encontrado")
+    texts = pd.read_csv(DATASET_PATH, usecols=['texto'])['texto']
+    cleaned, _, hashtags = normalize_texts(texts)
+    for text, result, tags in zip(texts.tolist(), cleaned, hashtags):
+        assert result == legacy_preprocess(text), repr(text)
+        if isinstance(text, str):
+            assert tags == legacy_hashtags(text), repr(text)
+
+
+def test_non_text_values():
+    assert normalize_text(None) == ("", [], [])
+    assert normalize_text(float('nan')) == ("", [], [])
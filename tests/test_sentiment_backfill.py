@@ -0,0 +1,85 @@
+# analise_tweets_neo4j/tests/test_sentiment_backfill.py
+
+import importlib
+import json
+import os
+
+import pytest
+
+# O nome do script começa com dígito, então não pode ser importado com `import`.
+backfill = importlib.import_module('2_analyze_and_update_sentiments')
+
+
+@pytest.fixture
+def checkpoint_path(tmp_path):
+    return str(tmp_path / 'checkpoints' / 'backfill.json')
+
+
+def test_split_id_range_covers_the_interval_without_gaps():
+    assert backfill.split_id_range(1, 10, 4) == [(1, 4), (5, 8), (9, 10)]
+    assert backfill.split_id_range(5, 5, 100) == [(5, 5)]
+
+
+def test_checkpoint_starts_empty_without_file(checkpoint_path):
+    checkpoint = backfill.ShardCheckpoint(checkpoint_path)
+    assert checkpoint.plan is None
+    assert checkpoint.completed == set()
+
+
+def test_checkpoint_resumes_with_only_the_pending_shards(checkpoint_path):
+    checkpoint = backfill.ShardCheckpoint(checkpoint_path)
+    checkpoint.start(1, 10, 4)
+    checkpoint.mark_done((5, 8))
+
+    resumed = backfill.ShardCheckpoint(checkpoint_path)
+    assert resumed.plan == {'min_id': 1, 'max_id': 10, 'shard_size': 4}
+    assert resumed.pending_shards() == [(1, 4), (9, 10)]
+
+
+def test_checkpoint_start_discards_previous_progress(checkpoint_path):
+    checkpoint = backfill.ShardCheckpoint(checkpoint_path)
+    checkpoint.start(1, 10, 4)
+    checkpoint.mark_done((1, 4))
+    checkpoint.start(1, 20, 10)
+
+    resumed = backfill.ShardCheckpoint(checkpoint_path)
+    assert resumed.pending_shards() == [(1, 10), (11, 20)]
+
+
+def test_checkpoint_save_is_atomic(checkpoint_path):
+    """A gravação passa por um arquivo temporário, que não sobra após o os.replace()."""
+    checkpoint = backfill.ShardCheckpoint(checkpoint_path)
+    checkpoint.start(1, 4, 2)
+    checkpoint.mark_done((3, 4))
+    with open(checkpoint_path, encoding='utf-8') as f:
+        assert json.load(f)['completed'] == [[3, 4]]
+    assert not os.path.exists(checkpoint_path + '.tmp')
+
+
+def test_checkpoint_clear_removes_the_file(checkpoint_path):
+    checkpoint = backfill.ShardCheckpoint(checkpoint_path)
+    checkpoint.start(1, 4, 2)
+    checkpoint.clear()
+    assert not os.path.exists(checkpoint_path)
+    assert backfill.ShardCheckpoint(checkpoint_path).plan is None
+
+
+def test_extend_adds_only_the_ids_outside_the_plan(checkpoint_path):
+    checkpoint = backfill.ShardCheckpoint(checkpoint_path)
+    checkpoint.start(10, 19, 5)
+    checkpoint.mark_done((10, 14))
+
+    assert checkpoint.extend(12, 27) == [(20, 27)]
+    assert checkpoint.extend(12, 27) == []
+
+    resumed = backfill.ShardCheckpoint(checkpoint_path)
+    assert resumed.bounds() == (10, 27)
+    # Os shards já planejados não mudam de limites; os novos vêm depois deles.
+    assert resumed.pending_shards() == [(15, 19), (20, 24), (25, 27)]
+
+
+def test_extend_below_the_plan(checkpoint_path):
+    checkpoint = backfill.ShardCheckpoint(checkpoint_path)
+    checkpoint.start(10, 19, 5)
+    assert checkpoint.extend(3, 19) == [(3, 9)]
+    assert checkpoint.shards() == [(10, 14), (15, 19), (3, 7), (8, 9)]
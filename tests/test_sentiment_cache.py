@@ -0,0 +1,60 @@
+# analise_tweets_neo4j/tests/test_sentiment_cache.py
+
+import pytest
+
+from sentiment_analysis.sentiment_cache import SentimentCache, make_cache_key
+
+
+def result(label='positive', compound=0.5):
+    return {'label': label, 'score_compound': compound, 'score_positive': 0.5,
+            'score_negative': 0.0, 'score_neutral': 0.5}
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / 'cache.sqlite')
+
+
+def disk_keys(cache):
+    return {row[0] for row in cache._conn.execute("SELECT key FROM sentiment_cache")}
+
+
+def test_results_survive_a_reopen(cache_path):
+    key = make_cache_key("good day", 'v1')
+    with SentimentCache(cache_path) as cache:
+        cache.put(key, result())
+    with SentimentCache(cache_path) as cache:
+        assert cache.get(key) == result()
+        assert cache.stats()['hits_disk'] == 1
+
+
+def test_key_depends_on_the_lexicon_version():
+    assert make_cache_key("good day", 'v1') != make_cache_key("good day", 'v2')
+
+
+def test_memory_hits_keep_entries_out_of_disk_eviction(cache_path):
+    """Um item lido só da camada em memória continua sendo o mais recente no disco."""
+    hot, cold, new = (make_cache_key(text, 'v1') for text in ("hot", "cold", "new"))
+    with SentimentCache(cache_path, max_disk_items=2) as cache:
+        cache.put(hot, result())
+        cache.put(cold, result())
+        cache.flush()
+
+        assert cache.get(hot) == result()
+        assert cache.stats()['hits_memory'] == 1
+        cache.put(new, result())
+        cache.flush()
+
+        assert disk_keys(cache) == {hot, new}
+
+
+def test_disk_hits_refresh_last_used(cache_path):
+    hot, cold, new = (make_cache_key(text, 'v1') for text in ("hot", "cold", "new"))
+    with SentimentCache(cache_path) as cache:
+        cache.put(cold, result())
+        cache.put(hot, result())
+    with SentimentCache(cache_path, max_disk_items=2) as cache:
+        assert cache.get(hot) == result()
+        cache.put(new, result())
+        cache.flush()
+        assert disk_keys(cache) == {hot, new}
@@ -0,0 +1,110 @@
+# analise_tweets_neo4j/tests/test_vader_batch_scorer.py
+# O VaderBatchScorer reimplementa o polarity_scores do NLTK com NumPy, e get_analyzer() monta o
+# analisador do NLTK a partir do léxico em cache; os dois precisam dar o mesmo resultado que um
+# SentimentIntensityAnalyzer() comum, inclusive nas regras menos comuns do VADER.
+
+import pytest
+
+pytest.importorskip('nltk')
+
+from sentiment_analysis import analyzer
+from sentiment_analysis.preprocessor import preprocess_texts_for_sentiment
+
+EDGE_CASE_TEXTS = [
+    "",
+    "   ",
+    "!!!",
+    "ok",
+    "I love this",
+    "I LOVE this",
+    "I LOVE THIS SO MUCH",
+    "I love this!!!",
+    "I love this!!!!!!!!",
+    "Is this good???",
+    "Is this good?",
+    "not good",
+    "not bad at all",
+    "isn't it great",
+    "never good",
+    "never so good",
+    "never this bad",
+    "without doubt it was good",
+    "at least it was okay",
+    "the least bad option",
+    "very good",
+    "very very good",
+    "kind of good",
+    "sort of bad",
+    "barely good",
+    "extremely bad",
+    "The food was great, but the service was terrible.",
+    "It was bad but the ending was great",
+    "it was the bomb",
+    "that was a kiss of death",
+    "cut the mustard",
+    "hand to mouth",
+    "yeah right",
+    "no",
+    "no way this is good",
+    "nope",
+    ":) :( :D",
+    "<3 lol",
+    "GREAT!!! but... not really",
+    "VADER is smart, handsome, and funny.",
+    "VADER is not smart, handsome, nor funny.",
+    "Today SUX!",
+    "Today only kinda sux! But I'll get by, lol",
+    "Make sure you :) or :D today!",
+    "Catch utf-8 emoji such as 💘 and 💋 and 😁",
+    "Not bad at all",
+    "the movie was uncomfortably long and incredibly dull",
+    "@user #happy http://example.com",
+    "123 456",
+    "a" * 500,
+]
+
+
+@pytest.fixture(scope='module')
+def reference():
+    """
+    SentimentIntensityAnalyzer construído normalmente pelo NLTK, a partir do vader_lexicon.zip
+    (pula o teste se o léxico não estiver baixado).
+    """
+    if analyzer.get_analyzer() is None or analyzer.get_batch_scorer() is None:
+        pytest.skip("vader_lexicon não encontrado; rode download_nltk_resources.py.")
+    from nltk.sentiment.vader import SentimentIntensityAnalyzer
+    return SentimentIntensityAnalyzer()
+
+
+def test_cached_analyzer_has_the_same_state_as_nltk(reference):
+    """
+    get_analyzer() monta o analisador sem o __init__ do NLTK (o léxico vem do cache). Se uma
+    versão nova do NLTK passar a guardar outro estado no __init__, este teste acusa.
+    """
+    cached = analyzer.get_analyzer()
+    assert set(vars(cached)) == set(vars(reference)) - {'lexicon_file'}
+    assert cached.lexicon == reference.lexicon
+
+
+@pytest.mark.parametrize('preprocess', [False, True], ids=['bruto', 'pre-processado'])
+def test_cached_analyzer_matches_nltk(reference, preprocess):
+    texts = preprocess_texts_for_sentiment(EDGE_CASE_TEXTS) if preprocess else EDGE_CASE_TEXTS
+    cached = analyzer.get_analyzer()
+    for text in texts:
+        assert cached.polarity_scores(text) == reference.polarity_scores(text), text
+
+
+@pytest.mark.parametrize('preprocess', [False, True], ids=['bruto', 'pre-processado'])
+def test_polarity_scores_batch_matches_nltk(reference, preprocess):
+    texts = preprocess_texts_for_sentiment(EDGE_CASE_TEXTS) if preprocess else EDGE_CASE_TEXTS
+    batch = analyzer.get_batch_scorer().polarity_scores_batch(texts)
+    for text, got in zip(texts, batch):
+        assert got == reference.polarity_scores(text), text
+
+
+def test_batch_result_does_not_depend_on_neighbours(reference):
+    """Um texto pontuado sozinho e no meio de um lote tem o mesmo resultado."""
+    scorer = analyzer.get_batch_scorer()
+    batch = scorer.polarity_scores_batch(EDGE_CASE_TEXTS)
+    alone = [scorer.polarity_scores_batch([text])[0] for text in EDGE_CASE_TEXTS]
+    assert batch == alone
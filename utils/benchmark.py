@@ -0,0 +1,294 @@
+# analise_tweets_neo4j/utils/benchmark.py
+# Benchmark ponta a ponta do pipeline, estágio por estágio: leitura do CSV, mapeamento,
+# pré-processamento, análise de sentimento (VADER) e escrita no grafo. Para cada estágio
+# registra linhas/s e o pico de memória (RSS) em um relatório JSON, que pode ser comparado
+# com um relatório anterior para detectar regressões.
+#
+# Uso (a partir da raiz do projeto):
+#   python -m utils.benchmark --scale 100k            (gera o dataset sintético se preciso)
+#   python -m utils.benchmark --tweets data/tweets_neo4j_completos_FINAL.csv --followers data/seguidores_para_neo4j_simples.csv
+#   python -m utils.benchmark --scale 1m --neo4j      (escreve no Neo4j configurado no .env)
+#   python -m utils.benchmark --scale 100k --compare data/benchmarks/anterior.json
+#
+# Sem --neo4j, as escritas vão para um substituto em memória que aceita as transações sem
+# enviá-las a lugar nenhum: mede o custo do lado do cliente (montar as linhas das famílias e
+# dividi-las em lotes), não o do servidor.
+
+import importlib
+import json
+import os
+import platform
+import sys
+import time
+
+from data_processing import dataset_loader, synthetic_data
+from data_processing.tweet_data_mapper import map_dataframe
+from graph_database import batch_writer
+from sentiment_analysis import analyzer
+from sentiment_analysis.preprocessor import preprocess_texts_for_sentiment
+
+DEFAULT_REPORT_DIR = os.path.join('data', 'benchmarks')
+DEFAULT_CHUNK_SIZE = 50_000
+
+# Queda de vazão (em relação ao relatório comparado) a partir da qual um estágio é apontado.
+REGRESSION_THRESHOLD = 0.10
+
+STAGES = ['csv_parse', 'mapping', 'preprocessing', 'vader_scoring', 'graph_writes']
+
+
+def peak_rss_mb():
+    """Pico de memória residente do processo até agora, em MB (None onde o módulo resource não existe)."""
+    try:
+        import resource
+    except ImportError: # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss vem em KB no Linux e em bytes no macOS.
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+class _StandInResult:
+    def consume(self):
+        return None
+
+
+class _StandInTransaction:
+    def __init__(self, session):
+        self.session = session
+
+    def run(self, query, parameters=None, **kwargs):
+        rows = kwargs.get('rows', (parameters or {}).get('rows', ()))
+        self.session.rows += len(rows)
+        return _StandInResult()
+
+
+class StandInSession:
+    """
+    Substituto em memória de uma sessão do Neo4j para as escritas em lote: executa as funções
+    de transação (execute_write) e conta lotes e linhas, sem servidor.
+    """
+
+    def __init__(self):
+        self.transactions = 0
+        self.rows = 0
+
+    def execute_write(self, transaction_function, *args, **kwargs):
+        self.transactions += 1
+        return transaction_function(_StandInTransaction(self), *args, **kwargs)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return None
+
+
+class _Stage:
+    """Acumula linhas e segundos de um estágio ao longo dos pedaços do CSV."""
+
+    def __init__(self):
+        self.rows = 0
+        self.seconds = 0.0
+        self.peak_rss_mb = None
+
+    def measure(self, function, *args):
+        """Executa function(*args), soma o tempo ao estágio e devolve o resultado."""
+        start = time.perf_counter()
+        result = function(*args)
+        self.seconds += time.perf_counter() - start
+        self.peak_rss_mb = peak_rss_mb()
+        return result
+
+    def report(self):
+        return {
+            'rows': self.rows,
+            'seconds': round(self.seconds, 4),
+            'rows_per_second': round(self.rows / self.seconds, 1) if self.seconds > 0 else None,
+            'peak_rss_mb': round(self.peak_rss_mb, 1) if self.peak_rss_mb is not None else None,
+        }
+
+
+def _timed_chunks(stage, chunks):
+    """Percorre um iterador de pedaços medindo o tempo gasto para obter cada um."""
+    iterator = iter(chunks)
+    while True:
+        chunk = stage.measure(next, iterator, None)
+        if chunk is None:
+            return
+        stage.rows += len(chunk)
+        yield chunk
+
+
+def _load_populate_module():
+    # O script de carga começa com um dígito e não pode ser importado com `import`.
+    return importlib.import_module('1_populate_graph')
+
+
+def run_benchmark(tweets_path, followers_path=None, chunksize=DEFAULT_CHUNK_SIZE, use_neo4j=False, csv_engine=None):
+    """
+    Executa os estágios sobre os CSVs e retorna o relatório (dicionário).
+
+    O arquivo de tweets é lido duas vezes, como na carga real: na primeira passada cada
+    pedaço é lido, mapeado, pré-processado, analisado e tem os nós Usuario/Tweet escritos;
+    na segunda, as relações são escritas (a leitura da segunda passada não entra no tempo de
+    leitura). Por último vêm as relações SEGUE do arquivo de seguidores.
+    """
+    populate = _load_populate_module()
+    stages = {name: _Stage() for name in STAGES}
+    write_stats = {}
+    seen = populate.new_seen_nodes()
+
+    driver = None
+    if use_neo4j:
+        from graph_database import neo4j_connector, schema
+        driver = neo4j_connector.connect_db()
+        if not driver:
+            raise RuntimeError("Não foi possível conectar ao Neo4j.")
+        schema.ensure_schema(driver)
+        session = driver.session()
+    else:
+        session = StandInSession()
+
+    scorer = analyzer.get_batch_scorer()
+    if scorer is None:
+        raise RuntimeError("Léxico do VADER indisponível; rode download_nltk_resources.py.")
+
+    def write_families(families):
+        stage = stages['graph_writes']
+        for family, query, rows in families:
+            stage.measure(batch_writer.write_in_batches, session, query, rows,
+                          populate.BATCH_SIZES[family], family, write_stats)
+            stage.rows += len(rows)
+
+    def read(path):
+        return dataset_loader.iter_csv_chunks(path, chunksize=chunksize, dtype=str, fillna='', engine=csv_engine)
+
+    total_start = time.perf_counter()
+    with session:
+
+        print(f"INFO: Passada 1 (leitura, mapeamento, sentimento e nós) sobre '{tweets_path}'...")
+        for df in _timed_chunks(stages['csv_parse'], read(tweets_path)):
+            tweets = stages['mapping'].measure(map_dataframe, df)
+            stages['mapping'].rows += len(df)
+
+            texts = [tweet['text'] for tweet in tweets]
+            processed = stages['preprocessing'].measure(preprocess_texts_for_sentiment, texts)
+            stages['preprocessing'].rows += len(texts)
+
+            stages['vader_scoring'].measure(scorer.polarity_scores_batch, processed)
+            stages['vader_scoring'].rows += len(processed)
+
+            write_families(stages['graph_writes'].measure(populate.build_node_family_rows, df, False, seen))
+            print(f"  {stages['csv_parse'].rows} linhas processadas...")
+
+        print("INFO: Passada 2 (relações dos tweets)...")
+        for df in read(tweets_path):
+            write_families(stages['graph_writes'].measure(populate.build_relationship_family_rows, df, seen))
+
+        if followers_path:
+            print(f"INFO: Relações de seguidores de '{followers_path}'...")
+            for df in _timed_chunks(stages['csv_parse'], read(followers_path)):
+                rows = stages['graph_writes'].measure(populate._family_rows, df, 'segue')
+                write_families([('segue', populate.CREATE_FOLLOW_REL_QUERY, rows)])
+    total_seconds = time.perf_counter() - total_start
+
+    if driver is not None:
+        neo4j_connector.close_db(driver)
+
+    return {
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'inputs': {
+            'tweets_path': tweets_path,
+            'followers_path': followers_path,
+            'chunksize': chunksize,
+            'csv_engine': csv_engine or 'c',
+        },
+        'graph_backend': 'neo4j' if use_neo4j else 'stand-in',
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+        },
+        'stages': {name: stage.report() for name, stage in stages.items()},
+        'write_families': {family: {**family_stats, 'rows_per_second': round(batch_writer.rows_per_second(family_stats), 1)}
+                           for family, family_stats in write_stats.items()},
+        'total_seconds': round(total_seconds, 3),
+        'peak_rss_mb': round(peak_rss_mb(), 1) if peak_rss_mb() is not None else None,
+    }
+
+
+def compare_reports(current, previous, threshold=REGRESSION_THRESHOLD):
+    """
+    Compara a vazão de cada estágio com a de um relatório anterior e retorna a lista de
+    estágios que ficaram mais de `threshold` (fração) mais lentos.
+    """
+    regressions = []
+    print("\nComparação com o relatório anterior:")
+    for name in STAGES:
+        now = current['stages'].get(name, {}).get('rows_per_second')
+        before = previous.get('stages', {}).get(name, {}).get('rows_per_second')
+        if not now or not before:
+            continue
+        change = now / before - 1
+        flag = ""
+        if change < -threshold:
+            regressions.append(name)
+            flag = "  <-- REGRESSÃO"
+        print(f"  {name:<14} {before:12.1f} -> {now:12.1f} linhas/s ({change:+.1%}){flag}")
+    return regressions
+
+
+def print_report(report):
+    print("\nResultado por estágio:")
+    for name, stage in report['stages'].items():
+        rate = f"{stage['rows_per_second']:12.1f} linhas/s" if stage['rows_per_second'] else f"{'-':>12} linhas/s"
+        rss = f"{stage['peak_rss_mb']:8.1f} MB" if stage['peak_rss_mb'] is not None else "       - MB"
+        print(f"  {name:<14} {stage['rows']:>10} linhas | {stage['seconds']:9.2f}s | {rate} | pico RSS {rss}")
+    print(f"  Total: {report['total_seconds']:.2f}s (escritas: {report['graph_backend']})")
+
+
+def save_report(report, path=None):
+    """Grava o relatório em JSON (por padrão em data/benchmarks/benchmark_<data>.json) e retorna o caminho."""
+    if path is None:
+        os.makedirs(DEFAULT_REPORT_DIR, exist_ok=True)
+        path = os.path.join(DEFAULT_REPORT_DIR, f"benchmark_{time.strftime('%Y%m%d-%H%M%S')}.json")
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(report, file, indent=2, ensure_ascii=False)
+    return path
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description="Benchmark por estágio do pipeline de tweets.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--scale', help="Usa (e gera, se não existir) o dataset sintético desta escala: 10k, 100k, 1m, 10m...")
+    source.add_argument('--tweets', help="CSV de tweets a medir.")
+    parser.add_argument('--followers', default=None, help="CSV de seguidores (com --tweets).")
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"Linhas lidas do CSV por pedaço (padrão: {DEFAULT_CHUNK_SIZE}).")
+    parser.add_argument('--csv-engine', choices=['c', 'pyarrow'], default=None, help="Parser de CSV.")
+    parser.add_argument('--neo4j', action='store_true',
+                        help="Escreve no Neo4j configurado no .env (use um banco de teste: o banco não é limpo antes).")
+    parser.add_argument('--output', default=None, help=f"Arquivo JSON do relatório (padrão: {DEFAULT_REPORT_DIR}/benchmark_<data>.json).")
+    parser.add_argument('--compare', default=None, help="Relatório JSON anterior para comparar a vazão.")
+    args = parser.parse_args()
+
+    if args.scale:
+        label = args.scale.lower()
+        tweets_path, followers_path = synthetic_data.dataset_paths(label)
+        if not (os.path.exists(tweets_path) and os.path.exists(followers_path)):
+            synthetic_data.generate_dataset(synthetic_data.parse_scale(label), label=label)
+    else:
+        tweets_path, followers_path = args.tweets, args.followers
+
+    report = run_benchmark(tweets_path, followers_path, chunksize=args.chunksize,
+                           use_neo4j=args.neo4j, csv_engine=args.csv_engine)
+    print_report(report)
+    print(f"\nINFO: Relatório gravado em {save_report(report, args.output)}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as file:
+            regressions = compare_reports(report, json.load(file))
+        if regressions:
+            print(f"ALERTA: Vazão caiu mais de {REGRESSION_THRESHOLD:.0%} em: {', '.join(regressions)}")
+            sys.exit(1)
@@ -0,0 +1,73 @@
+# analise_tweets_neo4j/utils/import_budget.py
+# Mede o tempo de importação dos módulos leves do projeto (e o tempo de partida de um worker
+# do pool de análise) em processos novos, e compara com um orçamento em milissegundos.
+# Uso: python utils/import_budget.py   (sai com código 1 se algum item passar do orçamento)
+
+import os
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Orçamento de importação (ms, tempo acumulado do módulo em `python -X importtime`).
+# O analyzer inclui o NumPy, que sozinho custa dezenas de milissegundos.
+IMPORT_BUDGET_MS = {
+    'config.settings': 20,
+    'sentiment_analysis.preprocessor': 30,
+    'sentiment_analysis.lexicon_cache': 40,
+    'sentiment_analysis.sentiment_cache': 40,
+    'sentiment_analysis.analyzer': 250,
+}
+
+# Orçamento (ms) para um worker do pool ficar pronto: importar o analyzer e carregar o léxico
+# do cache binário (o cache é gerado antes da medição, se ainda não existir).
+WORKER_START_BUDGET_MS = 300
+
+WORKER_START_SCRIPT = """
+import time
+start = time.perf_counter()
+from sentiment_analysis import analyzer
+analyzer._init_scoring_worker()
+print((time.perf_counter() - start) * 1000)
+"""
+
+
+def _run(args):
+    env = dict(os.environ, PYTHONPATH=PROJECT_ROOT)
+    return subprocess.run([sys.executable] + args, cwd=PROJECT_ROOT, env=env,
+                          capture_output=True, text=True, check=True)
+
+
+def measure_import_ms(module):
+    """Tempo acumulado (ms) de `import module` em um interpretador novo."""
+    stderr = _run(['-X', 'importtime', '-c', f'import {module}']).stderr
+    for line in reversed(stderr.splitlines()):
+        # Formato: "import time: self [us] | cumulative | imported package"
+        parts = [part.strip() for part in line.split('|')]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1]) / 1000
+    raise RuntimeError(f"Não foi possível medir a importação de {module}")
+
+
+def measure_worker_start_ms():
+    """Tempo (ms) para um processo novo importar o analyzer e carregar o léxico."""
+    _run(['-c', 'from sentiment_analysis import analyzer; analyzer._init_scoring_worker()']) # aquece o cache
+    return float(_run(['-c', WORKER_START_SCRIPT]).stdout.strip())
+
+
+def check_budget(repeats=3):
+    """Mede cada item (melhor de `repeats` execuções), imprime a tabela e retorna True se tudo couber."""
+    ok = True
+    items = [(module, budget, lambda module=module: measure_import_ms(module))
+             for module, budget in IMPORT_BUDGET_MS.items()]
+    items.append(('worker do pool (import + léxico)', WORKER_START_BUDGET_MS, measure_worker_start_ms))
+    for name, budget, measure in items:
+        elapsed = min(measure() for _ in range(repeats))
+        status = "OK" if elapsed <= budget else "ESTOUROU"
+        ok = ok and elapsed <= budget
+        print(f"{name:<40} {elapsed:8.1f} ms  (orçamento {budget} ms)  {status}")
+    return ok
+
+
+if __name__ == '__main__':
+    sys.exit(0 if check_budget() else 1)
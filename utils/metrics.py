@@ -0,0 +1,249 @@
+# analise_tweets_neo4j/utils/metrics.py
+# Instrumentação do pipeline: contadores, temporizadores e histogramas de latência, com rótulos
+# (ex: a família de query Cypher). Os valores ficam em um registro único por processo, seguro
+# para threads, e podem ser exportados periodicamente como uma linha de log estruturada (JSON)
+# e, opcionalmente, como arquivo texto do Prometheus (node_exporter textfile collector) e/ou
+# snapshot JSON.
+#
+# Nomes usados pelo projeto:
+#   pipeline_rows_total{stage}             linhas que passaram por um estágio
+#   pipeline_stage_seconds_total{stage}    tempo gasto em um estágio
+#   neo4j_transaction_seconds{family}      latência de cada transação (histograma)
+#   neo4j_rows_written_total{family}       linhas enviadas em transações concluídas
+#   neo4j_retries_total{family}            novas tentativas após erro transitório
+#   neo4j_failures_total{family}           transações que falharam definitivamente
+#   neo4j_dead_letter_rows_total{family}   linhas isoladas no dead letter (graph_database/adaptive_writer.py)
+#   sentiment_texts_total{source}          textos analisados (source: vader ou cache)
+#   stream_latency_seconds                 da leitura de um micro-lote do feed até a gravação (stream_ingest.py)
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Limites superiores (segundos) dos buckets dos histogramas de latência.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+DEFAULT_REPORT_INTERVAL = 30.0 # segundos entre duas linhas de log de métricas
+
+_lock = threading.Lock()
+_counters = {}   # (nome, rótulos) -> valor
+_histograms = {} # (nome, rótulos) -> {'buckets': [...], 'sum': float, 'count': int}
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+def increment(name, value=1, **labels):
+    """Soma `value` ao contador `name` com os rótulos dados."""
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def observe(name, value, **labels):
+    """Registra uma observação (ex: latência em segundos) no histograma `name`."""
+    key = _key(name, labels)
+    with _lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = {'buckets': [0] * len(LATENCY_BUCKETS), 'sum': 0.0, 'count': 0}
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if value <= bound:
+                histogram['buckets'][i] += 1
+                break
+        histogram['sum'] += value
+        histogram['count'] += 1
+
+
+@contextmanager
+def timer(name, **labels):
+    """
+    Mede o bloco e soma os segundos ao contador `name` (ex: pipeline_stage_seconds_total),
+    mesmo que o bloco levante uma exceção.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        increment(name, time.perf_counter() - start, **labels)
+
+
+def reset():
+    """Zera todas as métricas (ex: entre duas execuções no mesmo processo)."""
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+
+def _series_name(name, labels):
+    if not labels:
+        return name
+    return name + '{' + ','.join(f'{label}="{value}"' for label, value in labels) + '}'
+
+
+def _quantile(histogram, q):
+    """
+    Estimativa de um quantil pelo limite superior do bucket que o contém (None se vazio).
+    Acima do último bucket retorna o maior limite (como o histogram_quantile do Prometheus),
+    pois float('inf') viraria `Infinity` no JSON, que não é JSON válido.
+    """
+    if not histogram['count']:
+        return None
+    target = q * histogram['count']
+    seen = 0
+    for bound, count in zip(LATENCY_BUCKETS, histogram['buckets']):
+        seen += count
+        if seen >= target:
+            return bound
+    return LATENCY_BUCKETS[-1]
+
+
+def snapshot():
+    """Cópia das métricas atuais: {'counters': {série: valor}, 'histograms': {série: {...}}}."""
+    with _lock:
+        counters = {_series_name(name, labels): value for (name, labels), value in sorted(_counters.items())}
+        histograms = {}
+        for (name, labels), histogram in sorted(_histograms.items()):
+            histograms[_series_name(name, labels)] = {
+                'count': histogram['count'],
+                'sum': histogram['sum'],
+                'mean': histogram['sum'] / histogram['count'] if histogram['count'] else None,
+                'p50': _quantile(histogram, 0.50),
+                'p95': _quantile(histogram, 0.95),
+                'p99': _quantile(histogram, 0.99),
+            }
+    return {'timestamp': time.time(), 'counters': counters, 'histograms': histograms}
+
+
+def to_prometheus_text():
+    """Métricas no formato de exposição em texto do Prometheus."""
+    lines = []
+    with _lock:
+        counters = sorted(_counters.items())
+        histograms = sorted((key, dict(value, buckets=list(value['buckets']))) for key, value in _histograms.items())
+    declared = set()
+    for (name, labels), value in counters:
+        if name not in declared:
+            lines.append(f"# TYPE {name} counter")
+            declared.add(name)
+        lines.append(f"{_series_name(name, labels)} {value}")
+    for (name, labels), histogram in histograms:
+        if name not in declared:
+            lines.append(f"# TYPE {name} histogram")
+            declared.add(name)
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS, histogram['buckets']):
+            cumulative += count
+            lines.append(f"{_series_name(name + '_bucket', labels + (('le', str(bound)),))} {cumulative}")
+        lines.append(f"{_series_name(name + '_bucket', labels + (('le', '+Inf'),))} {histogram['count']}")
+        lines.append(f"{_series_name(name + '_sum', labels)} {histogram['sum']}")
+        lines.append(f"{_series_name(name + '_count', labels)} {histogram['count']}")
+    return "\n".join(lines) + "\n"
+
+
+def _write_atomic(path, content):
+    # O coletor pode ler o arquivo a qualquer momento: nunca deve ver um arquivo pela metade.
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp.{os.getpid()}"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def write_prometheus_textfile(path):
+    _write_atomic(path, to_prometheus_text())
+
+
+def write_json_snapshot(path):
+    _write_atomic(path, json.dumps(snapshot(), indent=2, ensure_ascii=False))
+
+
+class MetricsReporter:
+    """
+    Thread que, a cada `interval` segundos, imprime uma linha de log com as métricas e a vazão
+    de cada contador desde a linha anterior, e regrava os arquivos pedidos (`prometheus_path`,
+    `json_path`). Use como gerenciador de contexto: ao sair, emite um último relatório.
+    Com interval=0 não há relatório periódico, só o final.
+    """
+
+    def __init__(self, interval=DEFAULT_REPORT_INTERVAL, prometheus_path=None, json_path=None, name='pipeline'):
+        self.interval = interval
+        self.prometheus_path = prometheus_path
+        self.json_path = json_path
+        self.name = name
+        self._stop = threading.Event()
+        self._thread = None
+        self._last_counters = {}
+        self._last_time = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def start(self):
+        self._last_time = time.perf_counter()
+        if self.interval and self.interval > 0:
+            self._thread = threading.Thread(target=self._run, name='metrics-reporter', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.report(final=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.report()
+
+    def report(self, final=False):
+        """Imprime a linha de métricas e grava os arquivos configurados."""
+        now = time.perf_counter()
+        elapsed = max(now - self._last_time, 1e-9)
+        current = snapshot()
+        rates = {series: round((value - self._last_counters.get(series, 0)) / elapsed, 2)
+                 for series, value in current['counters'].items()
+                 if series.startswith(('pipeline_rows_total', 'neo4j_rows_written_total', 'sentiment_texts_total'))}
+        self._last_counters = current['counters']
+        self._last_time = now
+        line = {
+            'reporter': self.name,
+            'final': final,
+            'counters': {series: round(value, 4) for series, value in current['counters'].items()},
+            'rates_per_second': rates,
+            'latency': {series: {'count': h['count'], 'mean': round(h['mean'], 4) if h['mean'] is not None else None,
+                                 'p95': h['p95']}
+                        for series, h in current['histograms'].items()},
+        }
+        print(f"INFO [metrics]: {json.dumps(line, ensure_ascii=False)}")
+        try:
+            if self.prometheus_path:
+                write_prometheus_textfile(self.prometheus_path)
+            if self.json_path:
+                write_json_snapshot(self.json_path)
+        except OSError as e:
+            print(f"AVISO: Não foi possível gravar as métricas: {e}")
+
+
+def add_arguments(parser):
+    """Adiciona ao argparse as opções de métricas comuns aos scripts do pipeline."""
+    parser.add_argument('--metrics-interval', type=float, default=DEFAULT_REPORT_INTERVAL,
+                        help=f"Segundos entre as linhas de log de métricas (0 = só no final; padrão: {DEFAULT_REPORT_INTERVAL:g}).")
+    parser.add_argument('--metrics-prometheus', default=None,
+                        help="Arquivo .prom (formato texto do Prometheus) regravado a cada relatório.")
+    parser.add_argument('--metrics-json', default=None, help="Arquivo JSON com o snapshot das métricas, regravado a cada relatório.")
+
+
+def reporter_from_args(args, name='pipeline'):
+    """Cria o MetricsReporter a partir das opções de add_arguments()."""
+    return MetricsReporter(interval=args.metrics_interval, prometheus_path=args.metrics_prometheus,
+                           json_path=args.metrics_json, name=name)